@@ -0,0 +1,78 @@
+"""store refresh tokens as sha256 digests
+
+Revision ID: 1c9e4b7a2f60
+Revises: f1a7c3d95b28
+Create Date: 2026-10-18 17:25:41.206813
+
+"""
+
+import hashlib
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "1c9e4b7a2f60"
+down_revision: Union[str, Sequence[str], None] = "f1a7c3d95b28"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "refresh_tokens", sa.Column("token_hash", sa.String(length=64), nullable=True)
+    )
+
+    # Digest the live tokens so existing sessions keep working
+    refresh_tokens = sa.table(
+        "refresh_tokens",
+        sa.column("id", sa.Integer),
+        sa.column("token", sa.String),
+        sa.column("token_hash", sa.String),
+    )
+    conn = op.get_bind()
+    rows = conn.execute(sa.select(refresh_tokens.c.id, refresh_tokens.c.token)).all()
+    if rows:
+        conn.execute(
+            refresh_tokens.update()
+            .where(refresh_tokens.c.id == sa.bindparam("row_id"))
+            .values(token_hash=sa.bindparam("digest")),
+            [
+                {
+                    "row_id": row.id,
+                    "digest": hashlib.sha256(row.token.encode()).hexdigest(),
+                }
+                for row in rows
+            ],
+        )
+
+    with op.batch_alter_table("refresh_tokens") as batch_op:
+        batch_op.alter_column("token_hash", nullable=False)
+        batch_op.create_unique_constraint(
+            "uq_refresh_tokens_token_hash", ["token_hash"]
+        )
+        batch_op.drop_column("token")
+    op.create_index(
+        "ix_refresh_tokens_user_id", "refresh_tokens", ["user_id"], unique=False
+    )
+    op.create_index(
+        "ix_refresh_tokens_expires_at", "refresh_tokens", ["expires_at"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema.
+
+    Raw tokens cannot be recovered from their digests, so every session
+    has to log in again after a downgrade.
+    """
+    op.drop_index("ix_refresh_tokens_expires_at", table_name="refresh_tokens")
+    op.drop_index("ix_refresh_tokens_user_id", table_name="refresh_tokens")
+    op.execute("DELETE FROM refresh_tokens")
+    with op.batch_alter_table("refresh_tokens") as batch_op:
+        batch_op.add_column(sa.Column("token", sa.String(), nullable=False))
+        batch_op.create_unique_constraint("uq_refresh_tokens_token", ["token"])
+        batch_op.drop_constraint("uq_refresh_tokens_token_hash", type_="unique")
+        batch_op.drop_column("token_hash")
@@ -0,0 +1,42 @@
+"""add notifications.published for the dispatcher
+
+Revision ID: 4d2e8b6c1a93
+Revises: 1c9e4b7a2f60
+Create Date: 2026-10-18 19:40:12.118204
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "4d2e8b6c1a93"
+down_revision: Union[str, Sequence[str], None] = "1c9e4b7a2f60"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing rows were already pushed; only new rows start unpublished
+    op.add_column(
+        "notifications",
+        sa.Column("published", sa.Boolean(), server_default=sa.true(), nullable=False),
+    )
+    with op.batch_alter_table("notifications") as batch_op:
+        batch_op.alter_column("published", server_default=sa.false())
+    op.create_index(
+        "ix_notifications_published",
+        "notifications",
+        ["published", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_notifications_published", table_name="notifications")
+    with op.batch_alter_table("notifications") as batch_op:
+        batch_op.drop_column("published")
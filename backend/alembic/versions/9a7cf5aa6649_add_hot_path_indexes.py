@@ -0,0 +1,110 @@
+"""add composite indexes for hot lookup paths
+
+Revision ID: 9a7cf5aa6649
+Revises: 022013fe2108
+Create Date: 2026-10-18 09:12:41.204117
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "9a7cf5aa6649"
+down_revision: Union[str, Sequence[str], None] = "022013fe2108"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (table, columns) pairs that become unique; duplicates are removed first
+UNIQUE_PAIRS = [
+    ("project_members", ("project_id", "user_id")),
+    ("task_assignees", ("task_id", "user_id")),
+    ("task_tags", ("task_id", "tag_id")),
+    ("project_tags", ("project_id", "tag_id")),
+]
+
+
+def _delete_duplicates(table: str, columns: tuple[str, str]):
+    a, b = columns
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute(
+            f"DELETE FROM {table} x USING {table} y "
+            f"WHERE x.ctid > y.ctid AND x.{a} = y.{a} AND x.{b} = y.{b}"
+        )
+    else:
+        op.execute(
+            f"DELETE FROM {table} WHERE rowid NOT IN "
+            f"(SELECT MIN(rowid) FROM {table} GROUP BY {a}, {b})"
+        )
+
+
+def upgrade() -> None:
+    for table, columns in UNIQUE_PAIRS:
+        _delete_duplicates(table, columns)
+
+    # Membership checks: one row per (project, user)
+    op.create_index(
+        "uq_project_members_project_user",
+        "project_members",
+        ["project_id", "user_id"],
+        unique=True,
+    )
+    op.create_index("ix_project_members_user_id", "project_members", ["user_id"])
+
+    # Association tables: both directions
+    op.create_index(
+        "uq_task_assignees_task_user",
+        "task_assignees",
+        ["task_id", "user_id"],
+        unique=True,
+    )
+    op.create_index("ix_task_assignees_user_id", "task_assignees", ["user_id"])
+    op.create_index(
+        "uq_task_tags_task_tag", "task_tags", ["task_id", "tag_id"], unique=True
+    )
+    op.create_index("ix_task_tags_tag_id", "task_tags", ["tag_id"])
+    op.create_index(
+        "uq_project_tags_project_tag",
+        "project_tags",
+        ["project_id", "tag_id"],
+        unique=True,
+    )
+    op.create_index("ix_project_tags_tag_id", "project_tags", ["tag_id"])
+
+    # Message threads are read per record in id (= created_at) order
+    op.create_index(
+        "ix_messages_object_thread", "messages", ["object_type", "object_id", "id"]
+    )
+
+    # Notification feed (newest first) and unread filters
+    op.create_index("ix_notifications_user_feed", "notifications", ["user_id", "id"])
+    op.create_index(
+        "ix_notifications_user_read_created",
+        "notifications",
+        ["user_id", "is_read", "created_at"],
+    )
+
+    # Foreign keys filtered on every project page
+    op.create_index("ix_tasks_project_stage", "tasks", ["project_id", "stage_id"])
+    op.create_index("ix_stages_project_sequence", "stages", ["project_id", "sequence"])
+    op.create_index("ix_subtasks_task_id", "subtasks", ["task_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_subtasks_task_id", table_name="subtasks")
+    op.drop_index("ix_stages_project_sequence", table_name="stages")
+    op.drop_index("ix_tasks_project_stage", table_name="tasks")
+    op.drop_index("ix_notifications_user_read_created", table_name="notifications")
+    op.drop_index("ix_notifications_user_feed", table_name="notifications")
+    op.drop_index("ix_messages_object_thread", table_name="messages")
+    op.drop_index("ix_project_tags_tag_id", table_name="project_tags")
+    op.drop_index("uq_project_tags_project_tag", table_name="project_tags")
+    op.drop_index("ix_task_tags_tag_id", table_name="task_tags")
+    op.drop_index("uq_task_tags_task_tag", table_name="task_tags")
+    op.drop_index("ix_task_assignees_user_id", table_name="task_assignees")
+    op.drop_index("uq_task_assignees_task_user", table_name="task_assignees")
+    op.drop_index("ix_project_members_user_id", table_name="project_members")
+    op.drop_index("uq_project_members_project_user", table_name="project_members")
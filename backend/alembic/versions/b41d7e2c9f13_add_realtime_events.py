@@ -0,0 +1,51 @@
+"""add realtime_events table for cross-worker push
+
+Revision ID: b41d7e2c9f13
+Revises: 9a7cf5aa6649
+Create Date: 2026-10-18 11:05:19.482310
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "b41d7e2c9f13"
+down_revision: Union[str, Sequence[str], None] = "9a7cf5aa6649"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "realtime_events",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("channel", sa.String(), nullable=False),
+        sa.Column("payload", sa.Text(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=True,
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_realtime_events_id"), "realtime_events", ["id"], unique=False
+    )
+    op.create_index(
+        op.f("ix_realtime_events_created_at"),
+        "realtime_events",
+        ["created_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_realtime_events_created_at"), table_name="realtime_events")
+    op.drop_index(op.f("ix_realtime_events_id"), table_name="realtime_events")
+    op.drop_table("realtime_events")
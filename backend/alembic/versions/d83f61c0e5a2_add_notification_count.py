@@ -0,0 +1,32 @@
+"""add notifications.count for compacted rows
+
+Revision ID: d83f61c0e5a2
+Revises: c5e2a8d41b07
+Create Date: 2026-10-18 13:02:11.530441
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "d83f61c0e5a2"
+down_revision: Union[str, Sequence[str], None] = "c5e2a8d41b07"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "notifications",
+        sa.Column("count", sa.Integer(), server_default="1", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("notifications") as batch_op:
+        batch_op.drop_column("count")
@@ -0,0 +1,71 @@
+"""add full-text search_index (FTS5 on SQLite, tsvector + GIN on Postgres)
+
+Revision ID: e6b9f02d7c14
+Revises: d83f61c0e5a2
+Create Date: 2026-10-18 14:36:52.904117
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e6b9f02d7c14"
+down_revision: Union[str, Sequence[str], None] = "d83f61c0e5a2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Document key = entity id * 4 + type code (task 1, project 2, message 3)
+BACKFILL = """
+    INSERT INTO search_index ({key}, entity_type, entity_id, project_id, title, body)
+    SELECT id * 4 + 1, 'task', id, project_id, name, description FROM tasks
+    UNION ALL
+    SELECT id * 4 + 2, 'project', id, id, name, description FROM projects
+    UNION ALL
+    SELECT m.id * 4 + 3, 'message', m.id,
+           CASE WHEN m.object_type = 'project' THEN m.object_id
+                ELSE t.project_id END,
+           NULL, m.content
+    FROM messages m
+    LEFT JOIN tasks t ON m.object_type = 'task' AND t.id = m.object_id
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("""
+            CREATE TABLE search_index (
+                doc_key BIGINT PRIMARY KEY,
+                entity_type VARCHAR NOT NULL,
+                entity_id INTEGER NOT NULL,
+                project_id INTEGER,
+                title TEXT,
+                body TEXT,
+                document TSVECTOR GENERATED ALWAYS AS (
+                    setweight(to_tsvector('english', coalesce(title, '')), 'A')
+                    || setweight(to_tsvector('english', coalesce(body, '')), 'B')
+                ) STORED
+            )
+            """)
+        op.execute(
+            "CREATE INDEX ix_search_index_document ON search_index USING GIN (document)"
+        )
+        op.execute(
+            "CREATE INDEX ix_search_index_project_id ON search_index (project_id)"
+        )
+        op.execute(BACKFILL.format(key="doc_key"))
+    else:
+        op.execute(
+            "CREATE VIRTUAL TABLE search_index USING fts5("
+            "entity_type UNINDEXED, entity_id UNINDEXED, project_id UNINDEXED, "
+            "title, body, tokenize = 'porter unicode61')"
+        )
+        op.execute(BACKFILL.format(key="rowid"))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TABLE IF EXISTS search_index")
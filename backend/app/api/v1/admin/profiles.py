@@ -0,0 +1,43 @@
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import PlainTextResponse
+
+from app.core.config import settings
+from app.db.schemas.profile_schema import ProfileDetail, ProfileSummary
+from ....services.profiler import RequestProfile, profiler
+from ....services.role_helpers import get_admin_user
+
+router = APIRouter(
+    prefix="/admin/profiles",
+    tags=["Admin"],
+    dependencies=[Depends(get_admin_user)],
+)
+
+
+def _get_profile(profile_id: int) -> RequestProfile:
+    profile = profiler.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return profile
+
+
+# Most recent request profiles, newest first
+@router.get("/", response_model=list[ProfileSummary])
+def list_profiles():
+    return [profile.summary() for profile in profiler.list()]
+
+
+# Sampled time per function for one request
+@router.get("/{profile_id}", response_model=ProfileDetail)
+def get_profile(profile_id: int, limit: int = 50):
+    profile = _get_profile(profile_id)
+    return {
+        **profile.summary(),
+        "interval_ms": settings.PROFILE_INTERVAL_MS,
+        "functions": profile.functions(limit),
+    }
+
+
+# Collapsed stacks, for flamegraph.pl / speedscope
+@router.get("/{profile_id}/folded", response_class=PlainTextResponse)
+def get_profile_folded(profile_id: int):
+    return _get_profile(profile_id).folded()
@@ -1,16 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException
-from datetime import UTC, datetime, timedelta
+from datetime import timedelta
 from typing import Annotated
+from sqlalchemy.orm import joinedload
 from starlette import status
 
-from app.models.refresh_token import RefreshToken
 from app.models.roles import Role
 from app.services.uuid_generator import generate_invite_code
 from ....models.users import Users
 from ....core.security.security import (
-    bcrypt_context,
     create_access_token,
-    create_refresh_token,
+    get_password_hash_async,
+    is_signed_refresh_token,
 )
 from ....db.deps import db_dependency
 from ....db.schemas.auth.auth import (
@@ -21,6 +21,12 @@ from ....db.schemas.auth.auth import (
 )
 from fastapi.security import OAuth2PasswordRequestForm
 from ....services.auth_service import authenticate_user
+from ....services.refresh_token_service import (
+    check_signed_refresh_token,
+    issue_refresh_token,
+    revoke_refresh_token,
+    spend_refresh_token,
+)
 from ....core.config import settings
 
 router = APIRouter(prefix="/auth", tags=["auth"])
@@ -28,6 +34,9 @@ router = APIRouter(prefix="/auth", tags=["auth"])
 
 @router.post("/", status_code=status.HTTP_201_CREATED)
 async def create_user(db: db_dependency, create_user_request: CreateUserRequest):
+    # Hash before touching the database so no connection waits on bcrypt
+    hashed_password = await get_password_hash_async(create_user_request.password)
+
     # Get default role "user"
     default_role = db.query(Role).filter(Role.name == "user").first()
     if not default_role:
@@ -47,7 +56,7 @@ async def create_user(db: db_dependency, create_user_request: CreateUserRequest)
         last_name=create_user_request.last_name,
         role_id=default_role.id,  # assign FK, not string
         phone_number=create_user_request.phone_number,
-        hashed_password=bcrypt_context.hash(create_user_request.password),
+        hashed_password=hashed_password,
         is_active=True,
         invite_code=code,
     )
@@ -67,7 +76,7 @@ async def login_for_access_token(
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
     db: db_dependency,
 ):
-    user = authenticate_user(form_data.username, form_data.password, db)
+    user = await authenticate_user(form_data.username, form_data.password, db)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Could not validate user."
@@ -82,28 +91,51 @@ async def login_for_access_token(
         timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES),
     )
 
-    refresh_token = create_refresh_token(user.id, db)
+    refresh_token = issue_refresh_token(db, user, role_name)
 
     return {
         "access_token": access_token,
         "token_type": "bearer",
-        "refresh_token": refresh_token.token,
+        "refresh_token": refresh_token,
     }
 
 
 @router.post("/refresh", response_model=RefreshTokenResponse)
 async def refresh_access_token(request: RefreshTokenRequest, db: db_dependency):
-    db_token = (
-        db.query(RefreshToken)
-        .filter(
-            RefreshToken.token == request.refresh_token, RefreshToken.revoked == False
+    token = request.refresh_token
+    if settings.REFRESH_TOKEN_MODE == "signed" and is_signed_refresh_token(token):
+        # Stateless: the token carries the identity and is reused as is
+        claims = check_signed_refresh_token(db, token)
+        if claims is None:
+            raise HTTPException(
+                status_code=401, detail="Invalid or expired refresh token"
+            )
+        access_token = create_access_token(
+            claims["sub"],
+            claims["id"],
+            claims["role"],
+            timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES),
         )
-        .first()
-    )
-    if not db_token or db_token.expires_at < datetime.utcnow():
+        return {
+            "access_token": access_token,
+            "token_type": "bearer",
+            "refresh_token": token,
+        }
+
+    # Opaque tokens are single use: the reply carries the replacement
+    user_id = spend_refresh_token(db, token)
+    if user_id is None:
         raise HTTPException(status_code=401, detail="Invalid or expired refresh token")
 
-    user = db_token.user
+    user = (
+        db.query(Users)
+        .options(joinedload(Users.role))
+        .filter(Users.id == user_id)
+        .first()
+    )
+    if user is None:
+        db.commit()  # keep the token spent
+        raise HTTPException(status_code=401, detail="User not found")
     role_name = user.role.name if user.role else "user"
 
     access_token = create_access_token(
@@ -113,17 +145,16 @@ async def refresh_access_token(request: RefreshTokenRequest, db: db_dependency):
         timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES),
     )
 
-    return {"access_token": access_token, "token_type": "bearer"}
+    return {
+        "access_token": access_token,
+        "token_type": "bearer",
+        "refresh_token": issue_refresh_token(db, user, role_name),
+    }
 
 
 @router.post("/logout")
-async def logout(refresh_token: str, db: db_dependency):
-    db_token = (
-        db.query(RefreshToken).filter(RefreshToken.token == refresh_token).first()
-    )
-    if not db_token:
+async def logout(request: RefreshTokenRequest, db: db_dependency):
+    if not revoke_refresh_token(db, request.refresh_token):
         raise HTTPException(status_code=404, detail="Refresh token not found")
 
-    db_token.revoked = True
-    db.commit()
     return {"msg": "Logged out successfully"}
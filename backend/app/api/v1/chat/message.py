@@ -1,15 +1,29 @@
 # app/api/routes/message.py
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session, joinedload
-from ....db.session import get_db
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, WebSocket, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+from ....db.session import SessionLocal, get_db
 from ....models.message import Message
 from ....db.schemas.chat.message_schema import MessageCreate, MessageUpdate, MessageOut
+from ....db.schemas.pagination.pagination_schema import CursorPage
 from ....models.users import Users
-from ....services.auth_service import get_current_user
+from ....services.auth_service import get_current_user, get_websocket_user
+from ....services.message_service import get_thread_page, thread_project_id
+from ....services.role_helpers import get_project_access
+from ....services.realtime import broker, stream_channel, thread_channel
 
 router = APIRouter(prefix="/messages", tags=["Messages"])
 
 
+def publish_message(event_type: str, message: Message):
+    broker.publish(
+        thread_channel(message.object_type, message.object_id),
+        event_type,
+        MessageOut.model_validate(message, from_attributes=True),
+    )
+
+
 # Create a message (comment/chat/audit)
 @router.post("/", response_model=MessageOut, status_code=status.HTTP_201_CREATED)
 def create_message(
@@ -30,32 +44,30 @@ def create_message(
     db.add(new_message)
     db.commit()
     db.refresh(new_message)
+    publish_message("message.created", new_message)
     return new_message
 
 
 # Get messages for a given record (task/project/etc.)
+# Latest page by default; `before` pages back, `after_id` fetches new ones
 @router.get(
     "/{object_type}/{object_id}",
-    response_model=list[MessageOut],
+    response_model=CursorPage[MessageOut],
     status_code=status.HTTP_200_OK,
 )
 def get_messages(
     object_type: str,
     object_id: int,
+    before: Optional[str] = None,
+    after_id: Optional[int] = Query(None, ge=0),
+    limit: int = Query(50, ge=1, le=200),
     db: Session = Depends(get_db),
     current_user: Users = Depends(get_current_user),
 ):
     if not current_user:
         raise HTTPException(status_code=401, detail="Authentication failed")
 
-    messages = (
-        db.query(Message)
-        .options(joinedload(Message.author))
-        .filter(Message.object_type == object_type, Message.object_id == object_id)
-        .order_by(Message.created_at.asc())
-        .all()
-    )
-    return messages
+    return get_thread_page(db, object_type, object_id, limit, before, after_id)
 
 
 # Update a message (only author can update)
@@ -81,6 +93,7 @@ def update_message(
     message.content = message_update.content
     db.commit()
     db.refresh(message)
+    publish_message("message.updated", message)
     return message
 
 
@@ -103,6 +116,41 @@ def delete_message(
             status_code=403, detail="You are not allowed to delete this message"
         )
 
+    channel = thread_channel(message.object_type, message.object_id)
     db.delete(message)
     db.commit()
+    broker.publish(channel, "message.deleted", {"id": message_id})
     return None
+
+
+def can_follow_thread(user_id: int, object_type: str, object_id: int) -> bool:
+    """Whether the user may see a thread: owner or member of its project."""
+    with SessionLocal() as db:
+        project_id = thread_project_id(db, object_type, object_id)
+        if project_id is None:
+            return False
+        try:
+            access = get_project_access(db, project_id, user_id)
+        except HTTPException:
+            return False
+        return access.allows()
+
+
+# Live thread: pushes created/updated/deleted events for one record
+@router.websocket("/ws/{object_type}/{object_id}")
+async def message_stream(
+    websocket: WebSocket,
+    object_type: str,
+    object_id: int,
+    token: Optional[str] = None,
+):
+    current_user = await get_websocket_user(token)
+    # Same membership rule as the project and task REST routes
+    if not current_user or not await run_in_threadpool(
+        can_follow_thread, current_user.id, object_type, object_id
+    ):
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    await stream_channel(websocket, thread_channel(object_type, object_id))
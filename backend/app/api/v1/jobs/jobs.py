@@ -0,0 +1,23 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from app.db.schemas.job_schema import JobOut
+from ....db.session import get_db
+from ....models.background_job import BackgroundJob
+from ....models.users import Users
+from ....services.auth_service import get_current_user
+
+router = APIRouter(prefix="/jobs", tags=["Jobs"])
+
+
+# Status of a background job started by the current user
+@router.get("/{job_id}", response_model=JobOut)
+def get_job(
+    job_id: int,
+    db: Session = Depends(get_db),
+    current_user: Users = Depends(get_current_user),
+):
+    job = db.query(BackgroundJob).filter(BackgroundJob.id == job_id).first()
+    if not job or job.user_id != current_user.id:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
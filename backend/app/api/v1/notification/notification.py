@@ -1,43 +1,66 @@
-from math import ceil
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, WebSocket, status
 from sqlalchemy.orm import Session
 
-from app.db.schemas.notification_schema import NotificationOut
-from app.db.schemas.pagination.pagination_schema import PaginatedResponse
+from app.db.schemas.notification_schema import NotificationOut, UnreadCountOut
+from app.db.schemas.pagination.pagination_schema import CursorPage
 from ....models.notification import Notification
 from ....models.users import Users
 from ....db.session import get_db
-from ....services.auth_service import get_current_user
+from ....services.auth_service import get_current_user, get_websocket_user
+from ....services.notification_service import decrement_unread, get_unread_count
+from ....services.pagination import paginate_keyset
+from ....services.realtime import stream_channel, user_channel
 
 router = APIRouter(prefix="/notifications", tags=["notifications"])
 
 
-@router.get("/", response_model=PaginatedResponse[NotificationOut])
+@router.get("/", response_model=CursorPage[NotificationOut])
 def get_notifications(
-    page: int = 1,
-    limit: int = 20,
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    include_total: bool = False,
     db: Session = Depends(get_db),
     current_user: Users = Depends(get_current_user),
 ):
-    offset = (page - 1) * limit
-
     query = db.query(Notification).filter(Notification.user_id == current_user.id)
-    total = query.count()
+    total = query.count() if include_total else None
 
-    notifications = (
-        query.order_by(Notification.created_at.desc()).offset(offset).limit(limit).all()
+    # Newest first; ids follow created_at, so they double as the sort key
+    notifications, next_cursor = paginate_keyset(
+        query, Notification.id, limit, cursor=cursor, descending=True
     )
 
-    return PaginatedResponse[NotificationOut](
+    return CursorPage[NotificationOut](
         items=notifications,
+        next_cursor=next_cursor,
+        has_next=next_cursor is not None,
         total=total,
-        page=page,
-        limit=limit,
-        pages=ceil(total / limit),
-        has_next=page * limit < total,
     )
 
 
+# Unread badge: reads the maintained counter, not the notifications table
+# (declared before /{notification_id} so the path isn't parsed as an id)
+@router.get("/unread-count", response_model=UnreadCountOut)
+def unread_count(
+    db: Session = Depends(get_db),
+    current_user: Users = Depends(get_current_user),
+):
+    return {"unread": get_unread_count(db, current_user.id)}
+
+
+# Live feed of the current user's new notifications
+@router.websocket("/ws")
+async def notification_stream(websocket: WebSocket, token: Optional[str] = None):
+    current_user = await get_websocket_user(token)
+    if not current_user:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    await stream_channel(websocket, user_channel(current_user.id))
+
+
 # Get a specific notification (and mark as read)
 @router.get("/{notification_id}", response_model=NotificationOut)
 def get_notification(
@@ -55,7 +78,13 @@ def get_notification(
     if not notif:
         raise HTTPException(status_code=404, detail="Notification not found")
 
-    notif.is_read = True
+    # Conditional update so concurrent reads only decrement the counter once
+    marked = (
+        db.query(Notification)
+        .filter(Notification.id == notif.id, Notification.is_read == False)
+        .update({"is_read": True}, synchronize_session=False)
+    )
+    decrement_unread(db, current_user.id, marked)
     db.commit()
     db.refresh(notif)
     return notif
@@ -67,9 +96,14 @@ def mark_all_as_read(
     db: Session = Depends(get_db),
     current_user: Users = Depends(get_current_user),
 ):
-    db.query(Notification).filter(
-        Notification.user_id == current_user.id, Notification.is_read == False
-    ).update({"is_read": True})
+    marked = (
+        db.query(Notification)
+        .filter(Notification.user_id == current_user.id, Notification.is_read == False)
+        .update({"is_read": True}, synchronize_session=False)
+    )
+    # Subtract what was marked rather than zeroing, so notifications other
+    # requests commit in the meantime stay counted
+    decrement_unread(db, current_user.id, marked)
     db.commit()
     return {"msg": "All notifications marked as read"}
 
@@ -91,6 +125,14 @@ def delete_notification(
     if not notif:
         raise HTTPException(status_code=404, detail="Notification not found")
 
-    db.delete(notif)
+    deleted_unread = (
+        db.query(Notification)
+        .filter(Notification.id == notif.id, Notification.is_read == False)
+        .delete(synchronize_session=False)
+    )
+    if deleted_unread:
+        decrement_unread(db, current_user.id, deleted_unread)
+    else:
+        db.delete(notif)
     db.commit()
     return {"msg": "Notification deleted"}
@@ -1,17 +1,19 @@
 # app/api/routes/project.py
 from datetime import date
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session, joinedload
-from typing import List, Optional
+from typing import List, Literal, Optional
 from sqlalchemy.exc import IntegrityError
 
 from app.services.notification_service import NotificationService
 
 from ....db.session import get_db
-from ....models.project import Project, ProjectMember, Stage, Tag
+from ....models.project import Project, ProjectMember, Stage, Tag, project_tags
 from ....models.users import Users
 from ....models.tasks import Task
-from ....models.message import Message
 from ....db.schemas.projects.project_schema import (
     AddMemberRequest,
     ProjectCreate,
@@ -19,10 +21,32 @@ from ....db.schemas.projects.project_schema import (
     ProjectOut,
     ProjectMemberOut,
 )
-from ....db.schemas.projects.task_schema import TaskOut
+from ....db.schemas.projects.task_schema import TaskImportResult, TaskOut
+from ....db.schemas.projects.board_schema import BoardOut
+from ....db.schemas.job_schema import JobAccepted
 from ....db.schemas.projects.tag_schema import TagOut
 from ....db.schemas.chat.message_schema import MessageOut
+from ....db.schemas.pagination.pagination_schema import CursorPage
+from ....core.config import settings
+from ....core.responses import FastJSONResponse
 from ....services.auth_service import get_current_user
+from ....services.export_service import export_project
+from ....services.import_service import import_tasks
+from ....services.jobs import job_runner
+from ....services.message_service import get_thread_page
+from ....services.role_helpers import ProjectAccess, project_access
+from ....services.pagination import paginate_keyset
+from ....services.project_service import (
+    archive_projects,
+    delete_projects,
+    partition_project_ids,
+)
+from ....services.task_service import (
+    TASK_COLUMNS,
+    get_message_counts,
+    get_tag_ids,
+    task_row_dicts,
+)
 
 router = APIRouter(prefix="/projects", tags=["Projects"])
 
@@ -101,7 +125,7 @@ def create_project(
 #     return projects
 
 
-@router.get("/projects")
+@router.get("/projects", response_model=CursorPage[ProjectOut])
 def list_projects(
     manager_only: bool = Query(False),
     member_only: bool = Query(False),
@@ -110,8 +134,9 @@ def list_projects(
     start_date: Optional[date] = Query(None),
     end_date: Optional[date] = Query(None),
     tags: Optional[List[str]] = Query(None),
-    skip: int = Query(0, ge=0),
-    limit: int = Query(10, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    limit: int = Query(10, ge=1, le=100),
+    include_total: bool = Query(False),
     db: Session = Depends(get_db),
     current_user: Users = Depends(get_current_user),
 ):
@@ -141,11 +166,24 @@ def list_projects(
         query = query.filter(Project.start_date <= end_date)
 
     if tags:
-        query = query.outerjoin(Project.tags).filter(Tag.name.in_(tags)).distinct()
+        # Subquery keeps rows distinct without SELECT DISTINCT
+        tagged = (
+            select(project_tags.c.project_id)
+            .join(Tag, Tag.id == project_tags.c.tag_id)
+            .where(Tag.name.in_(tags))
+        )
+        query = query.filter(Project.id.in_(tagged))
 
-    projects = query.offset(skip).limit(limit).all()
+    total = query.count() if include_total else None
+    projects, next_cursor = paginate_keyset(query, Project.id, limit, cursor=cursor)
 
-    return projects
+    # Plain dict: response_model validation reads the ORM rows via attributes
+    return {
+        "items": projects,
+        "next_cursor": next_cursor,
+        "has_next": next_cursor is not None,
+        "total": total,
+    }
 
 
 @router.get("/projects/favourites", response_model=List[ProjectOut])
@@ -171,34 +209,11 @@ def bulk_delete_projects(
     Bulk delete projects.
     Only project managers of each project can delete.
     """
-    deleted_projects = []
-    unauthorized_projects = []
-    not_found_projects = []
-
-    for pid in project_ids:
-        project = db.query(Project).filter(Project.id == pid).first()
-
-        if not project:
-            not_found_projects.append(pid)
-            continue
-
-        # check membership & role
-        member = (
-            db.query(ProjectMember)
-            .filter(
-                ProjectMember.project_id == pid,
-                ProjectMember.user_id == current_user.id,
-            )
-            .first()
-        )
-
-        if not member or member.role != "manager":
-            unauthorized_projects.append(pid)
-            continue
-
-        db.delete(project)
-        deleted_projects.append(pid)
+    deleted_projects, unauthorized_projects, not_found_projects = partition_project_ids(
+        db, project_ids, current_user.id, roles=("manager",)
+    )
 
+    delete_projects(db, deleted_projects)
     db.commit()
 
     return {
@@ -217,29 +232,11 @@ def bulk_archive_projects(
     db: Session = Depends(get_db),
     current_user: Users = Depends(get_current_user),
 ):
-    archived_projects, unauthorized, not_found = [], [], []
-
-    for pid in project_ids:
-        project = db.query(Project).filter(Project.id == pid).first()
-        if not project:
-            not_found.append(pid)
-            continue
-
-        member = (
-            db.query(ProjectMember)
-            .filter(
-                ProjectMember.project_id == pid,
-                ProjectMember.user_id == current_user.id,
-            )
-            .first()
-        )
-        if not member or member.role != "manager":
-            unauthorized.append(pid)
-            continue
-
-        project.active = False
-        archived_projects.append(pid)
+    archived_projects, unauthorized, not_found = partition_project_ids(
+        db, project_ids, current_user.id, roles=("manager",)
+    )
 
+    archive_projects(db, archived_projects)
     db.commit()
     return {
         "archived": archived_projects,
@@ -249,59 +246,29 @@ def bulk_archive_projects(
 
 
 # Bulk Duplicate
-@router.post("/bulk/duplicate", status_code=status.HTTP_201_CREATED)
+@router.post("/bulk/duplicate", status_code=status.HTTP_202_ACCEPTED)
 def bulk_duplicate_projects(
     project_ids: List[int],
     db: Session = Depends(get_db),
     current_user: Users = Depends(get_current_user),
 ):
-    duplicated, unauthorized, not_found = [], [], []
-
-    for pid in project_ids:
-        project = db.query(Project).filter(Project.id == pid).first()
-        if not project:
-            not_found.append(pid)
-            continue
-
-        member = (
-            db.query(ProjectMember)
-            .filter(
-                ProjectMember.project_id == pid,
-                ProjectMember.user_id == current_user.id,
-            )
-            .first()
-        )
-        if not member or member.role != "manager":
-            unauthorized.append(pid)
-            continue
+    authorized, unauthorized, not_found = partition_project_ids(
+        db, project_ids, current_user.id, roles=("manager",)
+    )
 
-        new_project = Project(
-            name=f"{project.name} (Copy)",
-            description=project.description,
+    # Deep copies run in the background; poll GET /jobs/{job_id} for the ids
+    job = None
+    if authorized:
+        job = job_runner.submit(
+            "duplicate_projects",
+            current_user.id,
+            project_ids=authorized,
             owner_id=current_user.id,
-            allow_milestones=project.allow_milestones,
-            is_favourite=False,
-            allow_timesheets=project.allow_timesheets,
-            status="draft",
-            active=True,
-            start_date=project.start_date,
-            end_date=project.end_date,
         )
-        db.add(new_project)
-        db.flush()  # get new id before commit
-        duplicated.append(new_project.id)
-
-    db.commit()
-
-    # ensure duplicator is added as manager
-    project_member = ProjectMember(
-        project_id=new_project.id, user_id=current_user.id, role="manager"
-    )
-    db.add(project_member)
-    db.commit()
 
     return {
-        "duplicated": duplicated,
+        "job_id": job.id if job else None,
+        "queued": authorized,
         "unauthorized": unauthorized,
         "not_found": not_found,
     }
@@ -314,25 +281,11 @@ def bulk_duplicate_projects(
 def get_project(
     project_id: int,
     db: Session = Depends(get_db),
-    current_user: Users = Depends(get_current_user),
+    access: ProjectAccess = Depends(
+        project_access(detail="Not authorized to view this project")
+    ),
 ):
-    project = db.query(Project).filter(Project.id == project_id).first()
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
-
-    member = (
-        db.query(ProjectMember)
-        .filter(
-            ProjectMember.project_id == project_id,
-            ProjectMember.user_id == current_user.id,
-        )
-        .first()
-    )
-    if project.owner_id != current_user.id and not member:
-        raise HTTPException(
-            status_code=403, detail="Not authorized to view this project"
-        )
-    return project
+    return access.project
 
 
 # -----------------------------
@@ -342,24 +295,13 @@ def update_project(
     project_id: int,
     updated_data: ProjectUpdate,
     db: Session = Depends(get_db),
-    current_user: Users = Depends(get_current_user),
-):
-    project = db.query(Project).filter(Project.id == project_id).first()
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
-
-    member = (
-        db.query(ProjectMember)
-        .filter(
-            ProjectMember.project_id == project_id,
-            ProjectMember.user_id == current_user.id,
-        )
-        .first()
-    )
-    if project.owner_id != current_user.id and (not member or member.role != "manager"):
-        raise HTTPException(
-            status_code=403, detail="Not authorized to update this project"
+    access: ProjectAccess = Depends(
+        project_access(
+            roles=["manager"], detail="Not authorized to update this project"
         )
+    ),
+):
+    project = access.project
 
     update_data = updated_data.model_dump(exclude_unset=True)
     for key, value in update_data.items():
@@ -377,25 +319,15 @@ def update_project(
 def delete_project(
     project_id: int,
     db: Session = Depends(get_db),
-    current_user: Users = Depends(get_current_user),
-):
-    project = db.query(Project).filter(Project.id == project_id).first()
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
-
-    member = (
-        db.query(ProjectMember)
-        .filter(
-            ProjectMember.project_id == project_id,
-            ProjectMember.user_id == current_user.id,
-        )
-        .first()
-    )
-    if not member or member.role != "manager":
-        raise HTTPException(
-            status_code=403,
+    access: ProjectAccess = Depends(
+        project_access(
+            roles=["manager"],
+            allow_owner=False,
             detail="Not authorized to delete this project. Only project managers can delete.",
         )
+    ),
+):
+    project = access.project
 
     db.delete(project)
     db.commit()
@@ -409,25 +341,11 @@ def delete_project(
 def get_project_tags(
     project_id: int,
     db: Session = Depends(get_db),
-    current_user: Users = Depends(get_current_user),
+    access: ProjectAccess = Depends(
+        project_access(detail="Not authorized to view this project's tags")
+    ),
 ):
-    project = db.query(Project).filter(Project.id == project_id).first()
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
-
-    member = (
-        db.query(ProjectMember)
-        .filter(
-            ProjectMember.project_id == project_id,
-            ProjectMember.user_id == current_user.id,
-        )
-        .first()
-    )
-    if project.owner_id != current_user.id and not member:
-        raise HTTPException(
-            status_code=403, detail="Not authorized to view this project's tags"
-        )
-    return project.tags
+    return access.project.tags
 
 
 # Archive
@@ -437,25 +355,15 @@ def get_project_tags(
 def archive_project(
     project_id: int,
     db: Session = Depends(get_db),
-    current_user: Users = Depends(get_current_user),
-):
-    project = db.query(Project).filter(Project.id == project_id).first()
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
-
-    member = (
-        db.query(ProjectMember)
-        .filter(
-            ProjectMember.project_id == project_id,
-            ProjectMember.user_id == current_user.id,
-        )
-        .first()
-    )
-    if not member or member.role != "manager":
-        raise HTTPException(
-            status_code=403,
+    access: ProjectAccess = Depends(
+        project_access(
+            roles=["manager"],
+            allow_owner=False,
             detail="Not authorized to archive this project. Only project managers can archive.",
         )
+    ),
+):
+    project = access.project
 
     project.active = False
     db.commit()
@@ -466,64 +374,31 @@ def archive_project(
 # Duplicate
 
 
-@router.post("/{project_id}/duplicate", status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/{project_id}/duplicate",
+    response_model=JobAccepted,
+    status_code=status.HTTP_202_ACCEPTED,
+)
 def duplicate_project(
     project_id: int,
-    db: Session = Depends(get_db),
     current_user: Users = Depends(get_current_user),
-):
-    project = db.query(Project).filter(Project.id == project_id).first()
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
-
-    member = (
-        db.query(ProjectMember)
-        .filter(
-            ProjectMember.project_id == project_id,
-            ProjectMember.user_id == current_user.id,
-        )
-        .first()
-    )
-    if not member or member.role != "manager":
-        raise HTTPException(
-            status_code=403,
+    access: ProjectAccess = Depends(
+        project_access(
+            roles=["manager"],
+            allow_owner=False,
             detail="Not authorized to duplicate this project. Only project managers can duplicate.",
         )
-
-    # Generate a unique name for the duplicate
-    base_name = f"{project.name} (Copy)"
-    new_name = base_name
-    count = 1
-    while db.query(Project).filter(Project.name == new_name).first():
-        count += 1
-        new_name = f"{base_name} {count}"
-
-    # Create the duplicate project
-    new_project = Project(
-        name=new_name,
-        description=project.description,
+    ),
+):
+    # Stages, milestones, tasks, subtasks, tags, assignees and members are
+    # copied by a background job; its result carries the new project id
+    job = job_runner.submit(
+        "duplicate_projects",
+        current_user.id,
+        project_ids=[project_id],
         owner_id=current_user.id,
-        allow_milestones=project.allow_milestones,
-        is_favourite=False,
-        allow_timesheets=project.allow_timesheets,
-        status=None,
-        active=True,
-        start_date=project.start_date,
-        end_date=project.end_date,
-    )
-    db.add(new_project)
-    db.flush()  # generate new_project.id without committing
-
-    # Add duplicator as manager
-    project_member = ProjectMember(
-        project_id=new_project.id, user_id=current_user.id, role="manager"
     )
-    db.add(project_member)
-
-    db.commit()  # commit both project + member together
-    db.refresh(new_project)
-
-    return {"duplicated": new_project.id, "name": new_project.name}
+    return {"job_id": job.id, "status": job.status}
 
 
 # -----------------------------
@@ -533,61 +408,177 @@ def duplicate_project(
 def get_project_tasks(
     project_id: int,
     db: Session = Depends(get_db),
-    current_user: Users = Depends(get_current_user),
+    access: ProjectAccess = Depends(
+        project_access(detail="Not authorized to view this project's tasks")
+    ),
 ):
-    project = db.query(Project).filter(Project.id == project_id).first()
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
+    rows = db.query(*TASK_COLUMNS).filter(Task.project_id == project_id).all()
+    return FastJSONResponse(task_row_dicts(db, rows))
 
-    member = (
-        db.query(ProjectMember)
-        .filter(
-            ProjectMember.project_id == project_id,
-            ProjectMember.user_id == current_user.id,
-        )
-        .first()
+
+# -----------------------------
+# Kanban board: stages with their tasks in one call
+# -----------------------------
+@router.get("/{project_id}/board", response_model=BoardOut)
+def get_project_board(
+    project_id: int,
+    per_stage_limit: Optional[int] = Query(
+        None, ge=1, le=500, description="Max tasks returned per stage"
+    ),
+    include_archived: bool = Query(False),
+    db: Session = Depends(get_db),
+    access: ProjectAccess = Depends(
+        project_access(detail="Not authorized to view this project's tasks")
+    ),
+):
+    stages = (
+        db.query(Stage)
+        .filter(Stage.project_id == project_id)
+        .order_by(Stage.sequence, Stage.id)
+        .all()
     )
-    if project.owner_id != current_user.id and not member:
-        raise HTTPException(
-            status_code=403, detail="Not authorized to view this project's tasks"
-        )
 
-    tasks = db.query(Task).filter(Task.project_id == project_id).all()
-    return [TaskOut.from_orm_with_assignees(task) for task in tasks]
+    task_filter = [Task.project_id == project_id]
+    if not include_archived:
+        task_filter.append(Task.active == True)
+
+    task_counts = dict(
+        db.query(Task.stage_id, func.count(Task.id))
+        .filter(*task_filter)
+        .group_by(Task.stage_id)
+        .all()
+    )
+
+    tasks_query = db.query(*TASK_COLUMNS).filter(*task_filter)
+    if per_stage_limit:
+        # Rank tasks inside each stage so large columns are cut in SQL
+        ranked = (
+            select(
+                Task.id.label("task_id"),
+                func.row_number()
+                .over(partition_by=Task.stage_id, order_by=Task.id)
+                .label("position"),
+            )
+            .where(*task_filter)
+            .subquery()
+        )
+        tasks_query = tasks_query.join(ranked, ranked.c.task_id == Task.id).filter(
+            ranked.c.position <= per_stage_limit
+        )
+    rows = tasks_query.order_by(Task.stage_id, Task.id).all()
+
+    tasks = task_row_dicts(db, rows)
+    task_ids = [task["id"] for task in tasks]
+    tag_ids = get_tag_ids(db, task_ids)
+    message_counts = get_message_counts(db, task_ids)
+
+    tasks_by_stage = {}
+    for task in tasks:
+        task["tag_ids"] = tag_ids[task["id"]]
+        task["message_count"] = message_counts[task["id"]]
+        tasks_by_stage.setdefault(task["stage_id"], []).append(task)
+
+    # Whatever no stage column claims goes to "unstaged", so the counts and
+    # the tasks listed always cover the same rows
+    stage_ids = {stage.id for stage in stages}
+    unstaged = {"task_count": 0, "tasks": []}
+    for stage_id, count in task_counts.items():
+        if stage_id not in stage_ids:
+            unstaged["task_count"] += count
+            unstaged["tasks"].extend(tasks_by_stage.get(stage_id, []))
+    unstaged["tasks"].sort(key=lambda task: task["id"])
+    if per_stage_limit:
+        del unstaged["tasks"][per_stage_limit:]
+
+    # Row dicts go straight to the encoder; BoardOut documents the shape
+    return FastJSONResponse(
+        {
+            "project_id": project_id,
+            "stages": [
+                {
+                    "id": stage.id,
+                    "name": stage.name,
+                    "sequence": stage.sequence or 0,
+                    "is_default": bool(stage.is_default),
+                    "task_count": task_counts.get(stage.id, 0),
+                    "tasks": tasks_by_stage.get(stage.id, []),
+                }
+                for stage in stages
+            ],
+            "unstaged": unstaged,
+        }
+    )
 
 
 # -----------------------------
-# Project messages/comments
+# Export (streamed, so memory stays flat for any project size) and import
 # -----------------------------
-@router.get("/{project_id}/messages", response_model=List[MessageOut])
-def get_project_messages(
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+@router.get("/{project_id}/export")
+def export_project_data(
     project_id: int,
+    format: Literal["ndjson", "csv"] = Query("ndjson"),
+    include_messages: bool = Query(False),
+    include_subtasks: bool = Query(False),
+    access: ProjectAccess = Depends(
+        project_access(detail="Not authorized to export this project")
+    ),
+):
+    return StreamingResponse(
+        export_project(project_id, format, include_messages, include_subtasks),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="project-{project_id}.{format}"'
+            )
+        },
+    )
+
+
+@router.post("/{project_id}/import", response_model=TaskImportResult)
+async def import_project_tasks(
+    project_id: int,
+    request: Request,
+    format: Literal["ndjson", "csv"] = Query("ndjson"),
     db: Session = Depends(get_db),
-    current_user: Users = Depends(get_current_user),
+    access: ProjectAccess = Depends(
+        project_access(detail="Not authorized to import into this project")
+    ),
 ):
-    project = db.query(Project).filter(Project.id == project_id).first()
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
+    """Bulk-create tasks from an NDJSON or CSV body (e.g. an export file)."""
+    body = bytearray()
+    async for chunk in request.stream():
+        body.extend(chunk)
+        if len(body) > settings.TASK_IMPORT_MAX_BYTES:
+            raise HTTPException(status_code=413, detail="Import file is too large")
+    try:
+        text = body.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="Import file must be UTF-8")
 
-    member = (
-        db.query(ProjectMember)
-        .filter(
-            ProjectMember.project_id == project_id,
-            ProjectMember.user_id == current_user.id,
-        )
-        .first()
+    # Parsing and inserts are blocking; keep them off the event loop
+    return await run_in_threadpool(
+        import_tasks, db, project_id, access.user_id, text, format
     )
-    if project.owner_id != current_user.id and not member:
-        raise HTTPException(
-            status_code=403, detail="Not authorized to view this project's messages"
-        )
 
-    return (
-        db.query(Message)
-        .filter(Message.object_type == "project", Message.object_id == project_id)
-        .order_by(Message.created_at.asc())
-        .all()
-    )
+
+# -----------------------------
+# Project messages/comments
+# -----------------------------
+@router.get("/{project_id}/messages", response_model=CursorPage[MessageOut])
+def get_project_messages(
+    project_id: int,
+    before: Optional[str] = None,
+    after_id: Optional[int] = Query(None, ge=0),
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_db),
+    access: ProjectAccess = Depends(
+        project_access(detail="Not authorized to view this project's messages")
+    ),
+):
+    return get_thread_page(db, "project", project_id, limit, before, after_id)
 
 
 # -----------------------------
@@ -598,24 +589,13 @@ def add_project_member(
     project_id: int,
     request: AddMemberRequest,
     db: Session = Depends(get_db),
-    current_user: Users = Depends(get_current_user),
-):
-    project = db.query(Project).filter(Project.id == project_id).first()
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
-
-    member = (
-        db.query(ProjectMember)
-        .filter(
-            ProjectMember.project_id == project_id,
-            ProjectMember.user_id == current_user.id,
-        )
-        .first()
-    )
-    if project.owner_id != current_user.id and (not member or member.role != "manager"):
-        raise HTTPException(
-            status_code=403, detail="Not authorized to add members to this project"
+    access: ProjectAccess = Depends(
+        project_access(
+            roles=["manager"], detail="Not authorized to add members to this project"
         )
+    ),
+):
+    project = access.project
 
     # Look up user by invite code
     invited_user = (
@@ -641,14 +621,8 @@ def add_project_member(
         project_id=project_id, user_id=invited_user.id, role="member"
     )
     db.add(new_member)
-    try:
-        db.commit()
-    except IntegrityError:
-        db.rollback()
-        raise HTTPException(status_code=400, detail="Could not add member")
-
-    db.refresh(new_member)
 
+    # Written in this transaction; pushed by the dispatcher after commit
     notification_service = NotificationService(db)
     notification_service.notify(
         user_id=invited_user.id,
@@ -657,6 +631,26 @@ def add_project_member(
         entity_type="Project",
         entity_id=project.id,
     )
+    other_members = db.scalars(
+        select(ProjectMember.user_id).where(
+            ProjectMember.project_id == project_id,
+            ProjectMember.user_id != access.user_id,
+        )
+    ).all()
+    notification_service.notify_many(
+        other_members,
+        notif_type="project",
+        message=f"{invited_user.username} joined project '{project.name}'",
+        entity_type="Project",
+        entity_id=project.id,
+    )
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Could not add member")
+
+    db.refresh(new_member)
     return new_member
 
 
@@ -667,25 +661,10 @@ def add_project_member(
 def list_project_members(
     project_id: int,
     db: Session = Depends(get_db),
-    current_user: Users = Depends(get_current_user),
+    access: ProjectAccess = Depends(
+        project_access(detail="Not authorized to view members of this project")
+    ),
 ):
-    project = db.query(Project).filter(Project.id == project_id).first()
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
-
-    member = (
-        db.query(ProjectMember)
-        .filter(
-            ProjectMember.project_id == project_id,
-            ProjectMember.user_id == current_user.id,
-        )
-        .first()
-    )
-    if project.owner_id != current_user.id and not member:
-        raise HTTPException(
-            status_code=403, detail="Not authorized to view members of this project"
-        )
-
     members = (
         db.query(ProjectMember)
         .options(joinedload(ProjectMember.user))
@@ -701,25 +680,13 @@ def remove_project_member(
     project_id: int,
     user_id: int,
     db: Session = Depends(get_db),
-    current_user: Users = Depends(get_current_user),
-):
-    project = db.query(Project).filter(Project.id == project_id).first()
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
-
-    member = (
-        db.query(ProjectMember)
-        .filter(
-            ProjectMember.project_id == project_id,
-            ProjectMember.user_id == current_user.id,
-        )
-        .first()
-    )
-    if project.owner_id != current_user.id and (not member or member.role != "manager"):
-        raise HTTPException(
-            status_code=403, detail="Not authorized to remove members from this project"
+    access: ProjectAccess = Depends(
+        project_access(
+            roles=["manager"],
+            detail="Not authorized to remove members from this project",
         )
-
+    ),
+):
     member_to_remove = (
         db.query(ProjectMember)
         .filter(
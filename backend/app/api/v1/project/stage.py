@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from app.db.session import get_db
 from app.models.project import Stage, Project
+from app.models.tasks import Task
 from app.db.schemas.stage import StageCreate, StageUpdate, StageOut
 from app.models.users import Users
 from app.services.auth_service import get_current_user
@@ -95,8 +96,11 @@ def delete_stage(
     if not default_stage:
         raise HTTPException(status_code=400, detail="Default stage not found")
 
-    for task in stage.tasks:
-        task.stage_id = default_stage.id
+    # One UPDATE; moving tasks through stage.tasks loaded them all, and the
+    # delete-orphan cascade on that collection then deleted them too
+    db.query(Task).filter(Task.stage_id == stage.id).update(
+        {Task.stage_id: default_stage.id}, synchronize_session=False
+    )
 
     db.delete(stage)
     db.commit()
@@ -1,21 +1,34 @@
 # app/api/routes/task.py
 from datetime import date
 from fastapi import APIRouter, Depends, HTTPException, Path, Query, status
-from sqlalchemy import asc, desc, func
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from typing import Dict, List, Optional
 
 from app.db.schemas.chat.message_schema import MessageOut
+from app.db.schemas.pagination.pagination_schema import CursorPage
 from app.db.schemas.projects.sub_task import SubTaskCreate, SubTaskOut, SubTaskUpdate
 from app.db.schemas.projects.tag_schema import TagOut
 from app.db.schemas.user_profile_schema import UserProfileResponse
 from app.services.notification_service import NotificationService
 from ....db.session import get_db
-from ....models.tasks import SubTask, Task, TaskStatusEnum
+from ....models.tasks import SubTask, Task, TaskStatusEnum, task_tags
 from ....db.schemas.projects.task_schema import TaskCreate, TaskUpdate, TaskOut
 from ....models.users import Users
+from ....core.responses import FastJSONResponse
 from ....services.auth_service import get_current_user
-from ....models.message import Message
+from ....services.message_service import get_thread_page
+from ....services.pagination import paginate_keyset
+from ....services.role_helpers import get_project_access
+from ....services.task_service import (
+    TASK_COLUMNS,
+    archive_tasks,
+    delete_tasks,
+    duplicate_tasks,
+    get_message_counts,
+    partition_task_ids,
+    task_row_dicts,
+)
 from ....models.project import Project, ProjectMember, Stage, Tag
 
 router = APIRouter(prefix="/tasks", tags=["Tasks"])
@@ -23,24 +36,12 @@ router = APIRouter(prefix="/tasks", tags=["Tasks"])
 
 # --- Helper: check project membership ---
 def require_project_membership(db: Session, project_id: int, user_id: int):
-    project = db.query(Project).filter(Project.id == project_id).first()
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
-
-    if project.owner_id == user_id:
-        return project  # owner always allowed
-
-    membership = (
-        db.query(ProjectMember)
-        .filter(
-            ProjectMember.project_id == project_id, ProjectMember.user_id == user_id
-        )
-        .first()
-    )
-    if not membership:
+    # owner or any member; the lookup is memoized for the rest of the request
+    access = get_project_access(db, project_id, user_id)
+    if not access.allows():
         raise HTTPException(status_code=403, detail="Not authorized for this project")
 
-    return project
+    return access
 
 
 # Create a task
@@ -51,7 +52,7 @@ def create_task(
     current_user: Users = Depends(get_current_user),
 ):
     # Ensure current_user is a member of the project
-    project = require_project_membership(db, task.project_id, current_user.id)
+    require_project_membership(db, task.project_id, current_user.id)
 
     stage_id = task.stage_id
     if stage_id:
@@ -110,7 +111,7 @@ def create_task(
 
 
 # -----------------------------
-@router.get("/", response_model=List[TaskOut])
+@router.get("/", response_model=CursorPage[TaskOut])
 def get_tasks(
     project_id: Optional[int] = Query(None),
     archived: Optional[bool] = Query(None),
@@ -123,25 +124,27 @@ def get_tasks(
     order_by: Optional[str] = Query(
         None, description="Sort field, prefix with '-' for descending"
     ),
-    skip: int = Query(0, ge=0),
-    limit: int = Query(10, le=100),
+    cursor: Optional[str] = Query(
+        None, description="next_cursor from the previous page (same order_by)"
+    ),
+    limit: int = Query(10, ge=1, le=100),
+    include_total: bool = Query(False),
     db: Session = Depends(get_db),
     current_user: Users = Depends(get_current_user),
 ):
-    query = db.query(Task)
+    query = db.query(*TASK_COLUMNS)
 
     # Scope
     if project_id:
         require_project_membership(db, project_id, current_user.id)
         query = query.filter(Task.project_id == project_id)
     else:
-        query = (
-            query.join(Project)
-            .outerjoin(ProjectMember, ProjectMember.project_id == Task.project_id)
-            .filter(
-                (Project.owner_id == current_user.id)
-                | (ProjectMember.user_id == current_user.id)
-            )
+        # Subquery instead of a member join so each task appears once
+        member_projects = select(ProjectMember.project_id).where(
+            ProjectMember.user_id == current_user.id
+        )
+        query = query.join(Project).filter(
+            (Project.owner_id == current_user.id) | Task.project_id.in_(member_projects)
         )
 
     # Archived
@@ -177,32 +180,51 @@ def get_tasks(
     if due_after:
         query = query.filter(Task.due_date >= due_after)
 
-    # Tags
+    # Tags (subquery keeps rows distinct without SELECT DISTINCT)
     if tags:
-        query = query.join(Task.tags).filter(Tag.name.in_(tags)).distinct()
+        tagged = (
+            select(task_tags.c.task_id)
+            .join(Tag, Tag.id == task_tags.c.tag_id)
+            .where(Tag.name.in_(tags))
+        )
+        query = query.filter(Task.id.in_(tagged))
 
     # Sorting
-    if order_by:
+    # created_at follows insertion order, so the primary key stands in for it
+    sort_map = {
+        "due_date": Task.due_date,
+        "priority": Task.priority,
+        "created_at": None,
+        "updated_at": Task.updated_at,
+        "name": Task.name,
+    }
+    sort_column, sort_key, desc_order = None, "id", False
+    if order_by and order_by.lstrip("-") in sort_map:
         desc_order = order_by.startswith("-")
-        field_name = order_by.lstrip("-")
-
-        sort_map = {
-            "due_date": Task.due_date,
-            "priority": Task.priority,
-            "created_at": Task.created_at,
-            "updated_at": Task.updated_at,
-            "name": Task.name,
-        }
+        sort_column = sort_map[order_by.lstrip("-")]
+        sort_key = order_by
 
-        if field_name in sort_map:
-            query = query.order_by(
-                desc(sort_map[field_name]) if desc_order else asc(sort_map[field_name])
-            )
+    total = query.count() if include_total else None
 
     # Pagination
-    tasks = query.offset(skip).limit(limit).all()
+    rows, next_cursor = paginate_keyset(
+        query,
+        Task.id,
+        limit,
+        cursor=cursor,
+        sort_column=sort_column,
+        sort_key=sort_key,
+        descending=desc_order,
+    )
 
-    return [TaskOut.from_orm_with_assignees(task) for task in tasks]
+    return FastJSONResponse(
+        {
+            "items": task_row_dicts(db, rows),
+            "next_cursor": next_cursor,
+            "has_next": next_cursor is not None,
+            "total": total,
+        }
+    )
 
 
 # Bulk delete
@@ -215,37 +237,14 @@ def bulk_delete_tasks(
     current_user: Users = Depends(get_current_user),
 ):
     """
-    Bulk delete projects.
-    Only project managers of each project can delete.
+    Bulk delete tasks.
+    Only project managers of each task's project can delete.
     """
-    deleted_task = []
-    unauthorized_task = []
-    not_found_task = []
-
-    for tid in task_ids:
-        task = db.query(Task).filter(Task.id == tid).first()
-
-        if not task:
-            not_found_task.append(tid)
-            continue
-
-        # check membership & role
-        member = (
-            db.query(ProjectMember)
-            .filter(
-                ProjectMember.project_id == task.project_id,
-                ProjectMember.user_id == current_user.id,
-            )
-            .first()
-        )
-
-        if not member or member.role != "manager":
-            unauthorized_task.append(tid)
-            continue
-
-        db.delete(task)
-        deleted_task.append(tid)
+    deleted_task, unauthorized_task, not_found_task = partition_task_ids(
+        db, task_ids, current_user.id, roles=("manager",)
+    )
 
+    delete_tasks(db, deleted_task)
     db.commit()
 
     return {
@@ -264,29 +263,11 @@ def bulk_archive_tasks(
     db: Session = Depends(get_db),
     current_user: Users = Depends(get_current_user),
 ):
-    archived_tasks, unauthorized, not_found = [], [], []
-
-    for tid in task_ids:
-        task = db.query(Task).filter(Task.id == tid).first()
-        if not task:
-            not_found.append(tid)
-            continue
-
-        member = (
-            db.query(ProjectMember)
-            .filter(
-                ProjectMember.project_id == task.project_id,
-                ProjectMember.user_id == current_user.id,
-            )
-            .first()
-        )
-        if not member or member.role != "manager":
-            unauthorized.append(tid)
-            continue
-
-        task.active = False
-        archived_tasks.append(tid)
+    archived_tasks, unauthorized, not_found = partition_task_ids(
+        db, task_ids, current_user.id, roles=("manager",)
+    )
 
+    archive_tasks(db, archived_tasks)
     db.commit()
     return {
         "archived": archived_tasks,
@@ -304,20 +285,8 @@ def message_counts(
     """
     Returns a dict of {task_id: message_count} for the given list of task_ids
     """
-    # Query messages grouped by object_id where object_type is "task"
-    counts = (
-        db.query(Message.object_id, func.count(Message.id))
-        .filter(Message.object_type == "task", Message.object_id.in_(task_ids))
-        .group_by(Message.object_id)
-        .all()
-    )
-
-    # Convert to dict and ensure all task_ids are present
-    counts_dict = {tid: 0 for tid in task_ids}  # default 0
-    for object_id, count in counts:
-        counts_dict[object_id] = count
-
-    return counts_dict
+    # Grouped count over messages; task_ids without messages map to 0
+    return get_message_counts(db, task_ids)
 
 
 # Bulk Duplicate
@@ -327,46 +296,12 @@ def bulk_duplicate_tasks(
     db: Session = Depends(get_db),
     current_user: Users = Depends(get_current_user),
 ):
-    duplicated, unauthorized, not_found = [], [], []
-
-    for tid in task_ids:
-        task = db.query(Task).filter(Task.id == tid).first()
-        if not task:
-            not_found.append(tid)
-            continue
-
-        member = (
-            db.query(ProjectMember)
-            .filter(
-                ProjectMember.project_id == task.project_id,
-                ProjectMember.user_id == current_user.id,
-            )
-            .first()
-        )
-        if not member or member.role != "manager":
-            unauthorized.append(tid)
-            continue
-
-        # Create the new task
-        new_task = Task(
-            name=f"{task.name} (Copy)",
-            description=task.description,
-            project_id=task.project_id,
-            milestone_id=task.milestone_id,
-            stage_id=task.stage_id,
-            priority=task.priority,
-            due_date=task.due_date,
-            creator_id=current_user.id,
-        )
-        db.add(new_task)
-        db.flush()  # so new_task.id is available
-
-        # Duplicate assignees
-        for assignee in task.assignees:
-            new_task.assignees.append(assignee)
-
-        duplicated.append(new_task.id)
+    authorized, unauthorized, not_found = partition_task_ids(
+        db, task_ids, current_user.id, roles=("manager",)
+    )
 
+    # Copies keep their assignees
+    duplicated = duplicate_tasks(db, authorized, creator_id=current_user.id)
     db.commit()
 
     return {
@@ -425,25 +360,13 @@ def update_task(
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
 
-    project = require_project_membership(db, task.project_id, current_user.id)
-
-    membership = (
-        db.query(ProjectMember)
-        .filter(
-            ProjectMember.project_id == project.id,
-            ProjectMember.user_id == current_user.id,
-        )
-        .first()
-    )
+    access = require_project_membership(db, task.project_id, current_user.id)
 
-    # Check authorization
     # Check authorization
     is_creator = task.creator_id == current_user.id
 
     # Managers or project owners can edit
-    is_manager = (
-        membership and membership.role == "manager"
-    ) or project.owner_id == current_user.id
+    is_manager = access.is_manager or access.is_owner
 
     # Assignees can edit
     is_assignee = any(assignee.id == current_user.id for assignee in task.assignees)
@@ -491,15 +414,8 @@ def archive_task(
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
 
-    member = (
-        db.query(ProjectMember)
-        .filter(
-            ProjectMember.project_id == task.project_id,
-            ProjectMember.user_id == current_user.id,
-        )
-        .first()
-    )
-    if not member or member.role != "manager":
+    access = get_project_access(db, task.project_id, current_user.id)
+    if not access.is_manager:
         raise HTTPException(
             status_code=403,
             detail="Not authorized to archive this project. Only project managers can archive.",
@@ -524,15 +440,8 @@ def duplicate_task(
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
 
-    member = (
-        db.query(ProjectMember)
-        .filter(
-            ProjectMember.project_id == task.project_id,
-            ProjectMember.user_id == current_user.id,
-        )
-        .first()
-    )
-    if not member or member.role != "manager":
+    access = get_project_access(db, task.project_id, current_user.id)
+    if not access.is_manager:
         raise HTTPException(
             status_code=403,
             detail="Not authorized to duplicate this project. Only project managers can duplicate.",
@@ -568,27 +477,14 @@ def get_task_tags(
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
 
-    project = db.query(Project).filter(Project.id == task.project_id).first()
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
-
     # Check project membership
-    membership = (
-        db.query(ProjectMember)
-        .filter(
-            ProjectMember.project_id == project.id,
-            ProjectMember.user_id == current_user.id,
-        )
-        .first()
-    )
+    access = get_project_access(db, task.project_id, current_user.id)
 
     # Authorization checks
     is_creator = task.creator_id == current_user.id
     is_assignee = any(assignee.id == current_user.id for assignee in task.assignees)
-    is_manager = (
-        membership and membership.role == "member"
-    ) or project.owner_id == current_user.id
-    is_member = membership is not None
+    is_manager = access.is_manager or access.is_owner
+    is_member = access.is_member
 
     if not (is_creator or is_assignee or is_manager or is_member):
         raise HTTPException(
@@ -611,19 +507,8 @@ def delete_task(
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
 
-    project = require_project_membership(db, task.project_id, current_user.id)
-
-    membership = (
-        db.query(ProjectMember)
-        .filter(
-            ProjectMember.project_id == project.id,
-            ProjectMember.user_id == current_user.id,
-        )
-        .first()
-    )
-    if task.creator_id != current_user.id and (
-        not membership or membership.role != "manager"
-    ):
+    access = require_project_membership(db, task.project_id, current_user.id)
+    if task.creator_id != current_user.id and not access.is_manager:
         raise HTTPException(
             status_code=403, detail="Not authorized to delete this task"
         )
@@ -741,9 +626,12 @@ def delete_subtask(
 # -----------------------------
 # Get messages/comments for a task
 # -----------------------------
-@router.get("/{task_id}/messages", response_model=List[MessageOut])
+@router.get("/{task_id}/messages", response_model=CursorPage[MessageOut])
 def get_task_messages(
     task_id: int,
+    before: Optional[str] = None,
+    after_id: Optional[int] = Query(None, ge=0),
+    limit: int = Query(50, ge=1, le=200),
     db: Session = Depends(get_db),
     current_user: Users = Depends(get_current_user),
 ):
@@ -753,12 +641,7 @@ def get_task_messages(
 
     require_project_membership(db, task.project_id, current_user.id)
 
-    return (
-        db.query(Message)
-        .filter(Message.object_type == "task", Message.object_id == task_id)
-        .order_by(Message.created_at.asc())
-        .all()
-    )
+    return get_thread_page(db, "task", task_id, limit, before, after_id)
 
 
 # -----------------------------
@@ -800,8 +683,6 @@ def assign_task(
     # Assign the user if not already assigned
     if user not in task.assignees:
         task.assignees.append(user)
-        db.commit()
-        db.refresh(task)
 
         notification_service = NotificationService(db)
         notification_service.notify(
@@ -811,6 +692,8 @@ def assign_task(
             entity_type="Task",
             entity_id=task.id,
         )
+        db.commit()
+        db.refresh(task)
 
     return {"message": f"User {user_id} assigned to task {task_id}"}
 
@@ -0,0 +1,36 @@
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.db.schemas.search_schema import SearchEntityType, SearchResults
+from ....db.session import get_db
+from ....models.users import Users
+from ....services.auth_service import get_current_user
+from ....services.search_service import search
+
+router = APIRouter(prefix="/search", tags=["Search"])
+
+
+# Ranked full-text search over the caller's projects
+@router.get("/", response_model=SearchResults)
+def search_all(
+    q: str = Query(..., min_length=1, max_length=200),
+    types: Optional[List[SearchEntityType]] = Query(None),
+    project_id: Optional[int] = None,
+    limit: int = Query(20, ge=1, le=50),
+    offset: int = Query(0, ge=0, le=500),
+    db: Session = Depends(get_db),
+    current_user: Users = Depends(get_current_user),
+):
+    # One extra hit tells us whether another page exists
+    hits = search(
+        db,
+        q,
+        current_user.id,
+        types=types,
+        project_id=project_id,
+        limit=limit + 1,
+        offset=offset,
+    )
+    return {"items": hits[:limit], "has_next": len(hits) > limit}
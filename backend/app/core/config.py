@@ -13,9 +13,76 @@ class Settings(BaseSettings):
 
     # Refresh token (30 days is common)
     REFRESH_TOKEN_EXPIRE_DAYS: int = 30
+    REFRESH_TOKEN_MAX_PER_USER: int = 10  # oldest active tokens revoked beyond
+    REFRESH_TOKEN_SWEEP_INTERVAL_SECONDS: int = 3600  # 0 disables the sweeper
+    REFRESH_TOKEN_SWEEP_BATCH_SIZE: int = 1000  # rows deleted per transaction
+
+    # "opaque": random tokens looked up (and rotated) in refresh_tokens.
+    # "signed": self-describing JWTs; /auth/refresh only reads the database
+    # when the in-memory revocation filter reports a possible hit.
+    REFRESH_TOKEN_MODE: str = "opaque"
+    REVOCATION_FILTER_CAPACITY: int = 100_000
+    REVOCATION_FILTER_ERROR_RATE: float = 0.01
+    REVOCATION_SYNC_SECONDS: float = 5  # pick up other workers' logouts
+
+    # bcrypt pool for async routes; calls beyond MAX_PENDING get a 503
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 64
+
+    # Authenticated principal cache (per process)
+    PRINCIPAL_CACHE_SIZE: int = 1024
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+
+    # Realtime push: "memory" (single worker) or "database" (shared by workers)
+    REALTIME_BACKEND: str = "memory"
+    REALTIME_POLL_INTERVAL_SECONDS: float = 0.5
+    REALTIME_EVENT_TTL_SECONDS: int = 300
+    REALTIME_QUEUE_SIZE: int = 100  # per subscriber, oldest events dropped first
+    REALTIME_PING_SECONDS: int = 25
+
+    # Rows the notification dispatcher publishes per transaction
+    NOTIFICATION_BATCH_SIZE: int = 500
+    # Commits wake the dispatcher; polling picks up other workers' leftovers
+    NOTIFICATION_DISPATCH_POLL_SECONDS: float = 5
+
+    # Notification retention job; 0 disables the job or the matching rule
+    NOTIFICATION_RETENTION_INTERVAL_SECONDS: int = 3600
+    NOTIFICATION_RETENTION_READ_DAYS: int = 30  # prune read rows older than this
+    NOTIFICATION_RETENTION_MAX_PER_USER: int = 500  # newest N per user, read rows only
+    NOTIFICATION_RETENTION_MAX_UNREAD_PER_USER: int = 5000  # hard ceiling on unread
+    NOTIFICATION_COMPACTION_ENABLED: bool = True  # merge repeats of one entity
+    NOTIFICATION_RETENTION_BATCH_SIZE: int = 1000  # rows/groups per transaction
+
+    # Threads per worker running background jobs (e.g. project duplication)
+    JOB_WORKERS: int = 2
+
+    # Largest request body accepted by the task import endpoint
+    TASK_IMPORT_MAX_BYTES: int = 20 * 1024 * 1024
 
     DATABASE_URL: str
 
+    # Connection pool (ignored for in-memory SQLite)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800  # seconds, keeps connections below server idle limits
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_DISABLED: bool = False  # use NullPool (connect per checkout)
+    DB_ECHO: bool = False
+
+    # Adds X-DB-* / Server-Timing headers with per-request SQL stats
+    DEBUG: bool = False
+    # Warn when one statement shape runs more than this per request (0: off)
+    SQL_N_PLUS_ONE_THRESHOLD: int = 10
+
+    # Per-request profiler: admins send PROFILE_HEADER, or a random fraction
+    # of requests is sampled. Results are kept in memory, see /admin/profiles
+    PROFILE_HEADER: str = "X-Profile"
+    PROFILE_SAMPLE_RATE: float = 0.0
+    PROFILE_INTERVAL_MS: float = 5  # stack sampling period
+    PROFILE_BUFFER_SIZE: int = 50  # finished profiles kept
+    PROFILE_MAX_CONCURRENT: int = 2
+
     class Config:
         env_file = ".env"
 
@@ -0,0 +1,45 @@
+import enum
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # in requirements.txt; the stdlib encoder is a fallback
+    orjson = None
+
+
+def _default(value):
+    if isinstance(value, (datetime, date, time)):
+        text = value.isoformat()
+        return text[:-6] + "Z" if text.endswith("+00:00") else text
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        # UTC_Z matches how pydantic renders aware UTC datetimes
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z)
+    return json.dumps(
+        content, default=_default, ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """Render already JSON-shaped content (dicts, lists, scalars, datetimes,
+    enums) straight to bytes.
+
+    Returning this from an endpoint skips response_model validation and
+    jsonable_encoder, so it is meant for large list endpoints that build
+    their payload from row tuples. Uses orjson when it is installed.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
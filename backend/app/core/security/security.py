@@ -1,10 +1,15 @@
+import asyncio
+import hashlib
 import secrets
-from jose import jwt
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import HTTPException
+from jose import JWTError, jwt
 from datetime import datetime, timedelta, timezone, UTC
 from passlib.context import CryptContext
+from sqlalchemy import select, update
 from ..config import settings
 
-
 bcrypt_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
@@ -16,6 +21,52 @@ def verify_password(plain_password, hashed_password):
     return bcrypt_context.verify(plain_password, hashed_password)
 
 
+# -----------------------------
+# Async variants: bcrypt costs ~250 ms of CPU per call, so async routes
+# run it on a small dedicated pool instead of the event loop
+# -----------------------------
+_password_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt"
+)
+_pending_lock = threading.Lock()
+_pending = 0
+
+
+def _release(_future):
+    global _pending
+    with _pending_lock:
+        _pending -= 1
+
+
+async def _run_password_task(func, *args):
+    """Run func on the bcrypt pool; 503 once too many calls are queued.
+
+    Shedding early keeps a login burst from building a queue that takes
+    longer to drain than clients are willing to wait.
+    """
+    global _pending
+    with _pending_lock:
+        if _pending >= settings.PASSWORD_HASH_MAX_PENDING:
+            raise HTTPException(
+                status_code=503,
+                detail="Too many sign-in attempts in progress, retry shortly",
+                headers={"Retry-After": "1"},
+            )
+        _pending += 1
+    future = _password_executor.submit(func, *args)
+    # Counted until the hash finishes, even if the client goes away first
+    future.add_done_callback(_release)
+    return await asyncio.wrap_future(future)
+
+
+async def get_password_hash_async(password: str):
+    return await _run_password_task(get_password_hash, password)
+
+
+async def verify_password_async(plain_password, hashed_password):
+    return await _run_password_task(verify_password, plain_password, hashed_password)
+
+
 def create_access_token(
     username: str, user_id: int, role: str, expires_delta: timedelta
 ):
@@ -27,17 +78,85 @@ def create_access_token(
     )
 
 
-def create_refresh_token(user_id: int, db, expires_days: int = 30):
+# -----------------------------
+# Signed refresh tokens (REFRESH_TOKEN_MODE=signed)
+# -----------------------------
+def create_signed_refresh_token(username: str, user_id: int, role: str) -> str:
+    """Self-describing refresh token: enough to mint access tokens without a
+    database read. Revocation goes through services/token_revocation.py."""
+    expire = datetime.now(UTC) + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+    to_encode = {
+        "typ": "refresh",
+        "jti": secrets.token_urlsafe(16),
+        "sub": username,
+        "id": user_id,
+        "role": role,
+        "exp": expire,
+    }
+    return jwt.encode(
+        to_encode, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM
+    )
+
+
+def is_signed_refresh_token(token: str) -> bool:
+    # Opaque tokens are url-safe base64, which never contains a dot
+    return "." in token
+
+
+def decode_signed_refresh_token(token: str, verify_exp: bool = True) -> dict | None:
+    try:
+        claims = jwt.decode(
+            token,
+            settings.JWT_SECRET_KEY,
+            algorithms=[settings.JWT_ALGORITHM],
+            options={"verify_exp": verify_exp},
+        )
+    except JWTError:
+        return None
+    return claims if claims.get("typ") == "refresh" else None
+
+
+def hash_refresh_token(token: str) -> str:
+    # Tokens are 512 random bits, so a plain digest is enough (no salt/KDF)
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def create_refresh_token(user_id: int, db, expires_days: int = 30) -> str:
+    """Issue a refresh token and return the raw value; only its digest is stored.
+
+    Also revokes the user's oldest active tokens beyond
+    REFRESH_TOKEN_MAX_PER_USER. Commits the session.
+    """
     # Generate random string for refresh token
     token = secrets.token_urlsafe(64)
     expires_at = datetime.now(UTC) + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
 
     from app.models.refresh_token import RefreshToken
 
-    db_token = RefreshToken(
-        user_id=user_id, token=token, expires_at=expires_at, revoked=False
+    db.add(
+        RefreshToken(
+            user_id=user_id,
+            token_hash=hash_refresh_token(token),
+            expires_at=expires_at,
+            revoked=False,
+        )
+    )
+    db.flush()
+
+    # Newest id that falls outside the cap; the sweeper deletes revoked rows
+    active = (RefreshToken.user_id == user_id, RefreshToken.revoked == False)
+    boundary = db.scalar(
+        select(RefreshToken.id)
+        .where(*active)
+        .order_by(RefreshToken.id.desc())
+        .offset(settings.REFRESH_TOKEN_MAX_PER_USER)
+        .limit(1)
     )
-    db.add(db_token)
+    if boundary is not None:
+        db.execute(
+            update(RefreshToken)
+            .where(*active, RefreshToken.id <= boundary)
+            .values(revoked=True)
+        )
     db.commit()
-    db.refresh(db_token)
-    return db_token
+    return token
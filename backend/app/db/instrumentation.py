@@ -0,0 +1,120 @@
+import logging
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+
+from sqlalchemy import event
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Bind placeholders of every paramstyle, and IN (...) lists of them
+_PLACEHOLDER = r"(?:\?|%s|%\(\w+\)s|\$\d+|:\w+)"
+_PLACEHOLDER_LIST = re.compile(rf"\(\s*{_PLACEHOLDER}(?:\s*,\s*{_PLACEHOLDER})+\s*\)")
+_NUMBER = re.compile(r"\b\d+\b")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def fingerprint(statement: str) -> str:
+    """Statement shape: same SQL with literals and IN-list lengths erased."""
+    statement = _WHITESPACE.sub(" ", statement).strip()
+    statement = _PLACEHOLDER_LIST.sub("(?)", statement)
+    return _NUMBER.sub("?", statement)
+
+
+class QueryStats:
+    """SQL executed on behalf of one request."""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.shapes: Counter[str] = Counter()
+
+    def record(self, statement: str, seconds: float):
+        self.count += 1
+        self.seconds += seconds
+        self.shapes[fingerprint(statement)] += 1
+
+    def most_repeated(self) -> tuple[str, int]:
+        if not self.shapes:
+            return "", 0
+        return self.shapes.most_common(1)[0]
+
+
+# Set per request by the middleware; threadpool endpoints inherit the
+# context, so they add to the same object. Background threads see None.
+current_stats: ContextVar[QueryStats | None] = ContextVar(
+    "current_query_stats", default=None
+)
+
+
+def instrument_engine(engine):
+    """Time every cursor execution into the current request's QueryStats."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if current_stats.get() is not None:
+            conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        stats = current_stats.get()
+        if stats is not None and conn.info.get("query_start"):
+            elapsed = time.perf_counter() - conn.info["query_start"].pop()
+            stats.record(statement, elapsed)
+
+
+class QueryStatsMiddleware:
+    """Collect per-request SQL stats; warn on likely N+1 patterns.
+
+    With DEBUG on, responses carry X-DB-Query-Count, X-DB-Time-Ms,
+    X-DB-Max-Repeats and a Server-Timing entry. A warning is logged when
+    one statement shape runs more than SQL_N_PLUS_ONE_THRESHOLD times.
+    Streamed bodies send headers first, so only queries up to then count.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        stats = QueryStats()
+        token = current_stats.set(stats)
+
+        async def send_with_stats(message):
+            if message["type"] == "http.response.start" and settings.DEBUG:
+                _, repeats = stats.most_repeated()
+                milliseconds = stats.seconds * 1000
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"x-db-query-count", str(stats.count).encode()),
+                    (b"x-db-time-ms", f"{milliseconds:.1f}".encode()),
+                    (b"x-db-max-repeats", str(repeats).encode()),
+                    (b"server-timing", f"db;dur={milliseconds:.1f}".encode()),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_stats)
+        finally:
+            current_stats.reset(token)
+            self._check_repeats(scope, stats)
+
+    def _check_repeats(self, scope, stats: QueryStats):
+        threshold = settings.SQL_N_PLUS_ONE_THRESHOLD
+        shape, repeats = stats.most_repeated()
+        if threshold and repeats > threshold:
+            logger.warning(
+                "possible N+1: %s %s ran one statement %d times (%d queries, "
+                "%.1f ms): %s",
+                scope["method"],
+                scope["path"],
+                repeats,
+                stats.count,
+                stats.seconds * 1000,
+                shape[:300],
+            )
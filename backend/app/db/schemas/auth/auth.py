@@ -23,3 +23,4 @@ class RefreshTokenRequest(BaseModel):
 class RefreshTokenResponse(BaseModel):
     access_token: str
     token_type: str
+    refresh_token: str  # rotated: the one sent in is no longer valid
@@ -0,0 +1,25 @@
+from datetime import datetime
+from typing import Any, Literal, Optional
+
+from pydantic import BaseModel
+
+JobStatus = Literal["pending", "running", "succeeded", "failed"]
+
+
+class JobOut(BaseModel):
+    id: int
+    kind: str
+    status: JobStatus
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class JobAccepted(BaseModel):
+    job_id: int
+    status: JobStatus
@@ -7,8 +7,13 @@ class NotificationOut(BaseModel):
     type: str
     message: str
     is_read: bool
+    count: int = 1
     created_at: datetime
 
     class Config:
         orm_mode = True
         from_attributes = True
+
+
+class UnreadCountOut(BaseModel):
+    unread: int
@@ -1,4 +1,4 @@
-from typing import Generic, List, TypeVar
+from typing import Generic, List, Optional, TypeVar
 from pydantic import BaseModel
 from math import ceil
 
@@ -12,3 +12,10 @@ class PaginatedResponse(BaseModel, Generic[T]):
     limit: int
     pages: int
     has_next: bool
+
+
+class CursorPage(BaseModel, Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str] = None  # pass back as ?cursor= for the next page
+    has_next: bool
+    total: Optional[int] = None  # only filled when include_total=true
@@ -0,0 +1,27 @@
+from datetime import datetime
+from typing import Literal, Optional
+
+from pydantic import BaseModel
+
+
+class ProfileSummary(BaseModel):
+    id: int
+    method: str
+    path: str
+    route: Optional[str] = None
+    status: Optional[int] = None
+    trigger: Literal["header", "sampled"]
+    started_at: datetime
+    duration_ms: float
+    samples: int
+
+
+class ProfileFunction(BaseModel):
+    function: str
+    total: int  # samples with the function anywhere on the stack
+    self: int  # samples with the function on top
+
+
+class ProfileDetail(ProfileSummary):
+    interval_ms: float
+    functions: list[ProfileFunction]
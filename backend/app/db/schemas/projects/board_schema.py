@@ -0,0 +1,31 @@
+from typing import List
+from pydantic import BaseModel, Field
+
+from .task_schema import TaskOut
+
+
+class BoardTaskOut(TaskOut):
+    tag_ids: List[int] = Field(default_factory=list)
+    message_count: int = 0
+
+
+class BoardStageOut(BaseModel):
+    id: int
+    name: str
+    sequence: int = 0
+    is_default: bool = False
+    task_count: int = 0  # all tasks in the stage, even past per_stage_limit
+    tasks: List[BoardTaskOut] = Field(default_factory=list)
+
+
+class BoardUnstagedOut(BaseModel):
+    """Tasks without a stage of this project (stage_id is null or stale)."""
+
+    task_count: int = 0
+    tasks: List[BoardTaskOut] = Field(default_factory=list)
+
+
+class BoardOut(BaseModel):
+    project_id: int
+    stages: List[BoardStageOut]
+    unstaged: BoardUnstagedOut
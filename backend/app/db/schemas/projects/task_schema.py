@@ -1,6 +1,9 @@
+import re
 from typing import List, Optional
 from datetime import datetime
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+from app.models.tasks import TaskStatusEnum
 
 
 class TaskBase(BaseModel):
@@ -45,7 +48,10 @@ class TaskOut(TaskBase):
         from_attributes = True
 
     @classmethod
-    def from_orm_with_assignees(cls, task):
+    def from_orm_with_assignees(cls, task, assignee_ids: List[int] | None = None):
+        # List endpoints pass preloaded ids to avoid a lazy load per task
+        if assignee_ids is None:
+            assignee_ids = [u.id for u in task.assignees]
         return cls(
             id=task.id,
             name=task.name,
@@ -60,7 +66,7 @@ class TaskOut(TaskBase):
             creator_id=task.creator_id,
             created_at=task.created_at,
             updated_at=task.updated_at,
-            assignee_ids=[u.id for u in task.assignees],
+            assignee_ids=assignee_ids,
         )
 
 
@@ -77,5 +83,52 @@ from .project_schema import ProjectOut
 from .stage_schema import StageOut
 from .milestone_schema import MilestoneOut
 
-
 TaskWithRelations.model_rebuild()
+
+
+class TaskImportRow(BaseModel):
+    """One imported task; export columns it does not know are ignored.
+
+    CSV cells arrive as strings, so list fields also accept
+    "3 7" / "3,7" (assignee ids) and "bug,ui" (tag names).
+    """
+
+    model_config = ConfigDict(extra="ignore")
+
+    name: str = Field(..., min_length=1)
+    description: Optional[str] = None
+    due_date: Optional[datetime] = None
+    status: TaskStatusEnum = TaskStatusEnum.in_progress
+    active: bool = True
+    priority: int | None = Field(3, ge=1, le=5)
+    stage_id: Optional[int] = None
+    stage: Optional[str] = None  # stage name, resolved within the project
+    milestone_id: Optional[int] = None
+    assignee_ids: List[int] = Field(default_factory=list)
+    tags: List[str] = Field(default_factory=list)
+
+    @field_validator("assignee_ids", mode="before")
+    @classmethod
+    def split_ids(cls, value):
+        if isinstance(value, str):
+            return [item for item in re.split(r"[,\s]+", value) if item]
+        return value
+
+    @field_validator("tags", mode="before")
+    @classmethod
+    def split_tags(cls, value):
+        if isinstance(value, str):
+            return [item.strip() for item in value.split(",") if item.strip()]
+        return value
+
+
+class TaskImportError(BaseModel):
+    line: int
+    error: str
+
+
+class TaskImportResult(BaseModel):
+    created: int
+    task_ids: List[int]
+    skipped: int  # non-task records, e.g. members in a full project export
+    errors: List[TaskImportError]
@@ -0,0 +1,19 @@
+from typing import List, Literal, Optional
+
+from pydantic import BaseModel
+
+SearchEntityType = Literal["task", "project", "message"]
+
+
+class SearchHit(BaseModel):
+    entity_type: SearchEntityType
+    entity_id: int
+    project_id: int
+    title: Optional[str] = None
+    snippet: str
+    score: float
+
+
+class SearchResults(BaseModel):
+    items: List[SearchHit]
+    has_next: bool
@@ -1,15 +1,71 @@
 # app/db/session.py
-from sqlalchemy import NullPool, create_engine
+import time
+
+from sqlalchemy import NullPool, QueuePool, StaticPool, create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from app.core.config import settings
+from app.core.metrics import registry
+from app.db.instrumentation import instrument_engine
+
+POOL_CHECKOUT_WAIT = registry.histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time to get a connection from the pool, including waiting for one.",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30),
+)
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout took."""
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            POOL_CHECKOUT_WAIT.observe(time.perf_counter() - start)
+
+
+def create_db_engine(database_url: str = settings.DATABASE_URL):
+    """Build the engine with a pool suited to the database dialect.
+
+    SQLite in-memory databases share one connection (StaticPool), file based
+    SQLite and server databases (Postgres, MySQL) get a QueuePool sized from
+    Settings. Setting DB_POOL_DISABLED falls back to NullPool.
+    """
+    url = make_url(database_url)
+    engine_kwargs = {"echo": settings.DB_ECHO}
+
+    if url.get_backend_name() == "sqlite":
+        engine_kwargs["connect_args"] = {"check_same_thread": False}
+        if url.database in (None, "", ":memory:"):
+            engine_kwargs["poolclass"] = StaticPool
+            return create_engine(url, **engine_kwargs)
+
+    if settings.DB_POOL_DISABLED:
+        engine_kwargs["poolclass"] = NullPool
+        return create_engine(url, **engine_kwargs)
+
+    engine_kwargs.update(
+        poolclass=TimedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
+    return create_engine(url, **engine_kwargs)
+
 
 # Create engine
-# Production DB
-# engine = create_engine(settings.DATABASE_URL, echo=True)
-# --BREAK--
-engine = create_engine(
-    settings.DATABASE_URL, connect_args={"check_same_thread": False}, poolclass=NullPool
+engine = create_db_engine()
+# Per-request query count / time / repeated statements (see main.py)
+instrument_engine(engine)
+registry.callback_gauge(
+    "db_pool_checked_out",
+    "Connections currently checked out of the pool.",
+    lambda: engine.pool.checkedout() if isinstance(engine.pool, QueuePool) else 0,
 )
 
 # Create session factory
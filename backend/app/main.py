@@ -1,20 +1,75 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+from app.api.v1.admin import profiles
 from app.api.v1.auth import auth
 from app.api.v1.chat import message
+from app.api.v1.jobs import jobs
 from app.api.v1.project import project, task, tag, stage
 from app.api.v1.notification import notification
+from app.api.v1.search import search
 from app.api.v1.user import user_profile
-from app.db.session import Base, engine
+from app.core.metrics import CONTENT_TYPE, MetricsMiddleware, registry
+from app.db.instrumentation import QueryStatsMiddleware
+from app.db.session import Base, SessionLocal, engine
+from app.core.config import settings
+from app.services.jobs import job_runner
+from app.services.notification_retention import run_retention
+from app.services.notification_service import notification_dispatcher
+from app.services.profiler import ProfilerMiddleware
+from app.services.realtime import broker
+from app.services.refresh_token_service import sweep_refresh_tokens
+from app.services.scheduler import scheduler
+from app.services.search_service import ensure_search_index, rebuild_search_index
+from app.services.token_revocation import revocation_list
 from fastapi.middleware.cors import CORSMiddleware
 
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    job_runner.fail_interrupted()
+    scheduler.add(
+        "notification-retention",
+        settings.NOTIFICATION_RETENTION_INTERVAL_SECONDS,
+        run_retention,
+    )
+    scheduler.add(
+        "refresh-token-sweep",
+        settings.REFRESH_TOKEN_SWEEP_INTERVAL_SECONDS,
+        sweep_refresh_tokens,
+    )
+    if settings.REFRESH_TOKEN_MODE == "signed":
+        revocation_list.rebuild()
+        scheduler.add(
+            "revocation-sync", settings.REVOCATION_SYNC_SECONDS, revocation_list.sync
+        )
+    scheduler.start()
+    # Also publishes rows a previous process committed but never pushed
+    notification_dispatcher.start()
+    yield
+    scheduler.stop()
+    job_runner.stop()
+    # Publish committed notifications before the process exits
+    notification_dispatcher.stop()
+    broker.close()
+
+
+app = FastAPI(lifespan=lifespan)
 Base.metadata.create_all(bind=engine)
+# Not a mapped table (FTS5 / tsvector DDL differs per dialect)
+if ensure_search_index(engine):
+    with SessionLocal() as db:
+        rebuild_search_index(db)
+        db.commit()
 
 origins = [
     "http://localhost:3000",  # your Next.js frontend
 ]
 
+app.add_middleware(ProfilerMiddleware)
+app.add_middleware(QueryStatsMiddleware)
+app.add_middleware(MetricsMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,  # or ["*"] for testing
@@ -29,6 +84,11 @@ def health_check():
     return {"status": "Healthy"}
 
 
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return PlainTextResponse(registry.render(), media_type=CONTENT_TYPE)
+
+
 app.include_router(auth.router)
 app.include_router(user_profile.router)
 app.include_router(message.router)
@@ -37,3 +97,6 @@ app.include_router(project.router)
 app.include_router(task.router)
 app.include_router(tag.router)
 app.include_router(notification.router)
+app.include_router(search.router)
+app.include_router(jobs.router)
+app.include_router(profiles.router)
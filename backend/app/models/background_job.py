@@ -0,0 +1,25 @@
+from sqlalchemy import JSON, Column, DateTime, ForeignKey, Index, Integer, String, Text
+from sqlalchemy.sql import func
+
+from ..db.session import Base
+
+
+class BackgroundJob(Base):
+    """A long-running operation handed off to the job runner, polled by id."""
+
+    __tablename__ = "background_jobs"
+    __table_args__ = (Index("ix_background_jobs_user_id", "user_id"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String, nullable=False)  # handler name, e.g. "duplicate_projects"
+    status = Column(String, nullable=False, default="pending")
+    # pending -> running -> succeeded | failed
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"))
+    params = Column(JSON, nullable=True)
+    result = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
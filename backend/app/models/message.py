@@ -1,5 +1,5 @@
 # app/models/message.py
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -8,6 +8,10 @@ from ..db.session import Base
 
 class Message(Base):
     __tablename__ = "messages"
+    # Threads are read per record in id (= created_at) order
+    __table_args__ = (
+        Index("ix_messages_object_thread", "object_type", "object_id", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
 
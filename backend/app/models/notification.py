@@ -1,10 +1,25 @@
 from ..db.session import Base
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime, func
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+    Boolean,
+    ForeignKey,
+    DateTime,
+    Index,
+    false,
+    func,
+)
 from sqlalchemy.orm import relationship
 
 
 class Notification(Base):
     __tablename__ = "notifications"
+    __table_args__ = (
+        Index("ix_notifications_user_feed", "user_id", "id"),
+        Index("ix_notifications_user_read_created", "user_id", "is_read", "created_at"),
+        Index("ix_notifications_published", "published", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(
@@ -17,4 +32,19 @@ class Notification(Base):
     message = Column(String, nullable=False)
 
     is_read = Column(Boolean, default=False)
+    # Number of notifications merged into this row by compaction
+    count = Column(Integer, nullable=False, default=1, server_default="1")
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Pushed to the recipient's realtime channel by the dispatcher
+    published = Column(Boolean, nullable=False, default=False, server_default=false())
+
+
+class NotificationCounter(Base):
+    """Per-user unread total, maintained alongside `notifications` writes."""
+
+    __tablename__ = "notification_counters"
+
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    unread = Column(Integer, nullable=False, default=0, server_default="0")
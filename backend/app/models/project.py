@@ -9,6 +9,7 @@ from sqlalchemy import (
     ForeignKey,
     Table,
     Enum,
+    Index,
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -22,6 +23,8 @@ project_tags = Table(
     Base.metadata,
     Column("project_id", Integer, ForeignKey("projects.id", ondelete="CASCADE")),
     Column("tag_id", Integer, ForeignKey("tags.id", ondelete="CASCADE")),
+    Index("uq_project_tags_project_tag", "project_id", "tag_id", unique=True),
+    Index("ix_project_tags_tag_id", "tag_id"),
 )
 
 
@@ -108,6 +111,7 @@ class Milestone(Base):
 
 class Stage(Base):
     __tablename__ = "stages"
+    __table_args__ = (Index("ix_stages_project_sequence", "project_id", "sequence"),)
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
@@ -121,6 +125,10 @@ class Stage(Base):
 
 class ProjectMember(Base):
     __tablename__ = "project_members"
+    __table_args__ = (
+        Index("uq_project_members_project_user", "project_id", "user_id", unique=True),
+        Index("ix_project_members_user_id", "user_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"))
@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, func
+from app.db.session import Base
+
+
+class RealtimeEvent(Base):
+    """Short-lived fan-out log shared by workers (REALTIME_BACKEND=database)."""
+
+    __tablename__ = "realtime_events"
+
+    id = Column(Integer, primary_key=True, index=True)
+    channel = Column(String, nullable=False)
+    payload = Column(Text, nullable=False)  # JSON-encoded event
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
@@ -8,6 +8,7 @@ from sqlalchemy import (
     ForeignKey,
     Table,
     Enum,
+    Index,
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -22,6 +23,8 @@ task_tags = Table(
     Base.metadata,
     Column("task_id", Integer, ForeignKey("tasks.id", ondelete="CASCADE")),
     Column("tag_id", Integer, ForeignKey("tags.id", ondelete="CASCADE")),
+    Index("uq_task_tags_task_tag", "task_id", "tag_id", unique=True),
+    Index("ix_task_tags_tag_id", "tag_id"),
 )
 
 
@@ -31,6 +34,8 @@ task_assignees = Table(
     Base.metadata,
     Column("task_id", Integer, ForeignKey("tasks.id", ondelete="CASCADE")),
     Column("user_id", Integer, ForeignKey("users.id", ondelete="CASCADE")),
+    Index("uq_task_assignees_task_user", "task_id", "user_id", unique=True),
+    Index("ix_task_assignees_user_id", "user_id"),
 )
 
 
@@ -45,6 +50,7 @@ class TaskStatusEnum(str, enum.Enum):
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (Index("ix_tasks_project_stage", "project_id", "stage_id"),)
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
@@ -109,6 +115,7 @@ class TaskAttachment(Base):
 
 class SubTask(Base):
     __tablename__ = "subtasks"
+    __table_args__ = (Index("ix_subtasks_task_id", "task_id"),)
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
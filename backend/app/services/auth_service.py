@@ -5,34 +5,54 @@ from typing import Annotated
 from starlette import status
 from sqlalchemy.orm import joinedload
 
+from app.db.deps import db_dependency
 from app.db.session import SessionLocal
 from ..models.users import Users
 from ..core.config import settings
-from ..core.security.security import verify_password
-
+from ..core.security.security import verify_password_async
+from .principal_cache import principal_cache
 
 oauth2_bearer = OAuth2PasswordBearer(tokenUrl="auth/token")
 
 
-def authenticate_user(username: str, password: str, db):
-    user = db.query(Users).filter(Users.username == username).first()
-    if not user:
+async def authenticate_user(username: str, password: str, db):
+    row = (
+        db.query(Users.id, Users.hashed_password)
+        .filter(Users.username == username)
+        .first()
+    )
+    # End the read first: no pooled connection is held while bcrypt runs
+    db.rollback()
+    if not row:
         return False
-    if not verify_password(password, user.hashed_password):
+    # bcrypt runs on its own pool so the event loop keeps serving requests
+    if not await verify_password_async(password, row.hashed_password):
         return False
-    return user
+    return (
+        db.query(Users)
+        .options(joinedload(Users.role))
+        .filter(Users.id == row.id)
+        .first()
+    )
+
 
+def user_from_token(token: str, db) -> Users:
+    """Resolve an access token to its user; raises 401 when invalid."""
+    # Cache hit skips both the JWT decode and the identity query
+    principal = principal_cache.get(token)
+    if principal is not None:
+        return principal
 
-async def get_current_user(token: Annotated[str, Depends(oauth2_bearer)]):
     try:
         payload = jwt.decode(
             token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM]
         )
         user_id: int = payload.get("id")
-        if user_id is None:
+        # Signed refresh tokens share the key; they are not access tokens
+        if user_id is None or payload.get("typ") == "refresh":
             raise HTTPException(status_code=401, detail="Could not validate user")
 
-        db = SessionLocal()
+        # Reuse the request-scoped session so auth doesn't hold a second connection
         user = (
             db.query(Users)
             .options(joinedload(Users.role))
@@ -41,6 +61,29 @@ async def get_current_user(token: Annotated[str, Depends(oauth2_bearer)]):
         )
         if not user:
             raise HTTPException(status_code=401, detail="User not found")
-        return user  # role is already loaded
+        # role is already loaded, so the cached copy carries it too
+        return principal_cache.set(token, user, payload.get("exp"))
     except JWTError:
         raise HTTPException(status_code=401, detail="Could not validate user")
+
+
+async def get_current_user(
+    token: Annotated[str, Depends(oauth2_bearer)], db: db_dependency
+):
+    return user_from_token(token, db)
+
+
+async def get_websocket_user(token: str | None = None):
+    """Resolve a websocket's user from its `?token=` query parameter.
+
+    Browsers cannot set headers on websocket handshakes, so the access token
+    travels in the query string. The session is only held for the lookup,
+    not for the lifetime of the connection. Returns None when invalid.
+    """
+    if not token:
+        return None
+    with SessionLocal() as db:
+        try:
+            return await get_current_user(token, db)
+        except HTTPException:
+            return None
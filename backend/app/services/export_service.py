@@ -0,0 +1,183 @@
+import csv
+import io
+from typing import Iterator
+
+from sqlalchemy import or_, select
+
+from app.core.responses import dumps
+from app.db.session import SessionLocal
+from app.models.message import Message
+from app.models.project import ProjectMember
+from app.models.tasks import SubTask, Task
+from app.models.users import Users
+from app.services.task_service import TASK_COLUMNS, get_assignee_ids
+
+# Rows fetched per round trip; also the size of each chunk written out
+EXPORT_BATCH_SIZE = 1000
+
+# One CSV header for every record type; unused cells stay empty
+CSV_FIELDS = [
+    "record_type",
+    "id",
+    "task_id",
+    "name",
+    "description",
+    "status",
+    "active",
+    "priority",
+    "stage_id",
+    "milestone_id",
+    "due_date",
+    "creator_id",
+    "assignee_ids",
+    "user_id",
+    "username",
+    "role",
+    "object_type",
+    "object_id",
+    "author_id",
+    "message_type",
+    "content",
+    "title",
+    "is_done",
+    "owner_id",
+    "created_at",
+    "updated_at",
+]
+
+
+def _task_records(db, project_id: int):
+    result = db.execute(
+        select(*TASK_COLUMNS)
+        .where(Task.project_id == project_id)
+        .order_by(Task.id)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+    for rows in result.partitions():
+        assignee_ids = get_assignee_ids(db, [row.id for row in rows])
+        batch = []
+        for row in rows:
+            record = {"record_type": "task", **row._asdict()}
+            record["status"] = row.status.value if row.status else None
+            record["assignee_ids"] = assignee_ids[row.id]
+            batch.append(record)
+        yield batch
+
+
+def _stream(db, statement, record_type: str):
+    result = db.execute(statement.execution_options(yield_per=EXPORT_BATCH_SIZE))
+    for rows in result.partitions():
+        yield [{"record_type": record_type, **row._asdict()} for row in rows]
+
+
+def _member_records(db, project_id: int):
+    return _stream(
+        db,
+        select(
+            ProjectMember.id,
+            ProjectMember.user_id,
+            Users.username,
+            ProjectMember.role,
+            ProjectMember.joined_at.label("created_at"),
+        )
+        .join(Users, Users.id == ProjectMember.user_id)
+        .where(ProjectMember.project_id == project_id)
+        .order_by(ProjectMember.id),
+        "member",
+    )
+
+
+def _message_records(db, project_id: int):
+    project_tasks = select(Task.id).where(Task.project_id == project_id)
+    return _stream(
+        db,
+        select(
+            Message.id,
+            Message.object_type,
+            Message.object_id,
+            Message.author_id,
+            Message.message_type,
+            Message.content,
+            Message.created_at,
+        )
+        .where(
+            or_(
+                (Message.object_type == "project") & (Message.object_id == project_id),
+                (Message.object_type == "task") & Message.object_id.in_(project_tasks),
+            )
+        )
+        .order_by(Message.id),
+        "message",
+    )
+
+
+def _subtask_records(db, project_id: int):
+    return _stream(
+        db,
+        select(
+            SubTask.id,
+            SubTask.task_id,
+            SubTask.title,
+            SubTask.is_done,
+            SubTask.owner_id,
+            SubTask.created_at,
+            SubTask.updated_at,
+        )
+        .join(Task, Task.id == SubTask.task_id)
+        .where(Task.project_id == project_id)
+        .order_by(SubTask.id),
+        "subtask",
+    )
+
+
+def _record_batches(project_id: int, include_messages: bool, include_subtasks: bool):
+    # Own session: the request's session is closed before the body streams
+    with SessionLocal() as db:
+        yield from _task_records(db, project_id)
+        yield from _member_records(db, project_id)
+        if include_subtasks:
+            yield from _subtask_records(db, project_id)
+        if include_messages:
+            yield from _message_records(db, project_id)
+
+
+def _csv_cell(value):
+    if isinstance(value, list):
+        return " ".join(str(item) for item in value)
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return value
+
+
+def export_project(
+    project_id: int,
+    format: str,
+    include_messages: bool = False,
+    include_subtasks: bool = False,
+) -> Iterator[bytes]:
+    """Yield the export body chunk by chunk (one chunk per fetched batch).
+
+    Rows are streamed from the database with yield_per, so memory use is
+    bounded by EXPORT_BATCH_SIZE whatever the project size. Every record
+    carries a `record_type` (task, member, subtask or message).
+    """
+    batches = _record_batches(project_id, include_messages, include_subtasks)
+
+    if format == "ndjson":
+        for batch in batches:
+            yield b"".join(dumps(record) + b"\n" for record in batch)
+        return
+
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=CSV_FIELDS, extrasaction="ignore")
+    writer.writeheader()
+    yield buffer.getvalue().encode("utf-8")
+    buffer.seek(0)
+    buffer.truncate()
+    for batch in batches:
+        writer.writerows(
+            {key: _csv_cell(value) for key, value in record.items()} for record in batch
+        )
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
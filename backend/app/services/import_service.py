@@ -0,0 +1,225 @@
+import csv
+import io
+import json
+from itertools import islice
+from typing import Iterator
+
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.db.schemas.projects.task_schema import TaskImportRow
+from app.models.project import Milestone, ProjectMember, Stage, Tag
+from app.models.tasks import Task, task_assignees, task_tags
+from app.services.search_service import index_documents
+
+# Rows validated and inserted per transaction
+IMPORT_BATCH_SIZE = 500
+
+
+# -----------------------------
+# Parsing: (line, record) pairs, or (line, error message)
+# -----------------------------
+def _ndjson_records(text: str) -> Iterator[tuple[int, dict | str]]:
+    for line_no, line in enumerate(text.splitlines(), start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as exc:
+            yield line_no, f"Invalid JSON: {exc}"
+            continue
+        if not isinstance(record, dict):
+            yield line_no, "Each line must be a JSON object"
+            continue
+        yield line_no, record
+
+
+def _csv_records(text: str) -> Iterator[tuple[int, dict | str]]:
+    reader = csv.DictReader(io.StringIO(text))
+    for record in reader:
+        # Empty cells mean "not given", so model defaults apply
+        yield reader.line_num, {
+            key: value for key, value in record.items() if key and value != ""
+        }
+
+
+def _validation_message(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+        for error in exc.errors()
+    )
+
+
+# -----------------------------
+# Per-import and per-batch lookups
+# -----------------------------
+class ImportContext:
+    """Project-scoped lookups, loaded once per import."""
+
+    def __init__(self, db: Session, project_id: int):
+        stages = db.execute(
+            select(Stage.id, Stage.name, Stage.is_default).where(
+                Stage.project_id == project_id
+            )
+        ).all()
+        self.stage_ids = {stage.id for stage in stages}
+        self.stage_names = {stage.name: stage.id for stage in stages}
+        self.default_stage_id = next(
+            (stage.id for stage in stages if stage.is_default), None
+        )
+        self.milestone_ids = set(
+            db.scalars(select(Milestone.id).where(Milestone.project_id == project_id))
+        )
+        self.member_ids = set(
+            db.scalars(
+                select(ProjectMember.user_id).where(
+                    ProjectMember.project_id == project_id
+                )
+            )
+        )
+
+
+def _tag_ids_by_name(db: Session, rows: list[TaskImportRow]) -> dict[str, int]:
+    names = {name for row in rows for name in row.tags}
+    if not names:
+        return {}
+    return dict(db.execute(select(Tag.name, Tag.id).where(Tag.name.in_(names))).all())
+
+
+def _resolve(row: TaskImportRow, context: ImportContext, tag_ids: dict[str, int]):
+    """Return (stage_id, tag ids) for a row, or raise ValueError."""
+    if row.stage_id is not None:
+        if row.stage_id not in context.stage_ids:
+            raise ValueError(f"Stage {row.stage_id} does not belong to this project")
+        stage_id = row.stage_id
+    elif row.stage is not None:
+        if row.stage not in context.stage_names:
+            raise ValueError(f"Unknown stage '{row.stage}'")
+        stage_id = context.stage_names[row.stage]
+    elif context.default_stage_id is not None:
+        stage_id = context.default_stage_id
+    else:
+        raise ValueError("No default stage found for this project")
+
+    if row.milestone_id is not None and row.milestone_id not in context.milestone_ids:
+        raise ValueError(
+            f"Milestone {row.milestone_id} does not belong to this project"
+        )
+    outsiders = [
+        user_id for user_id in row.assignee_ids if user_id not in context.member_ids
+    ]
+    if outsiders:
+        raise ValueError(f"Assignees are not project members: {outsiders}")
+    unknown = [name for name in row.tags if name not in tag_ids]
+    if unknown:
+        raise ValueError(f"Unknown tags: {unknown}")
+
+    return stage_id, list(dict.fromkeys(tag_ids[name] for name in row.tags))
+
+
+# -----------------------------
+# Import
+# -----------------------------
+def _insert_batch(
+    db: Session, project_id: int, creator_id: int, valid: list
+) -> list[int]:
+    task_rows = [
+        {
+            "name": row.name,
+            "description": row.description,
+            "due_date": row.due_date,
+            "status": row.status,
+            "active": row.active,
+            "priority": row.priority,
+            "project_id": project_id,
+            "stage_id": stage_id,
+            "milestone_id": row.milestone_id,
+            "creator_id": creator_id,
+        }
+        for _, row, stage_id, _ in valid
+    ]
+    # sort_by_parameter_order keeps new ids aligned with `valid`; Postgres
+    # batches this, SQLite falls back to in-process per-row executes
+    task_ids = db.scalars(
+        insert(Task).returning(Task.id, sort_by_parameter_order=True), task_rows
+    ).all()
+
+    assignee_rows = [
+        {"task_id": task_id, "user_id": user_id}
+        for task_id, (_, row, _, _) in zip(task_ids, valid)
+        for user_id in dict.fromkeys(row.assignee_ids)
+    ]
+    if assignee_rows:
+        db.execute(insert(task_assignees), assignee_rows)
+    tag_rows = [
+        {"task_id": task_id, "tag_id": tag_id}
+        for task_id, (_, _, _, row_tag_ids) in zip(task_ids, valid)
+        for tag_id in row_tag_ids
+    ]
+    if tag_rows:
+        db.execute(insert(task_tags), tag_rows)
+
+    # Core inserts bypass the flush hook that maintains the search index
+    index_documents(db, "task", task_ids)
+    return task_ids
+
+
+def import_tasks(
+    db: Session, project_id: int, creator_id: int, text: str, format: str
+) -> dict:
+    """Create tasks in a project from NDJSON or CSV text.
+
+    Accepts the task records of a project export (other record types are
+    skipped). Stages, milestones and members are loaded once; tags once
+    per batch. Each batch of IMPORT_BATCH_SIZE valid rows is inserted with
+    executemany and committed on its own. Invalid rows are reported by
+    input line and never stop the rest of the import.
+    """
+    records = _ndjson_records(text) if format == "ndjson" else _csv_records(text)
+    context = ImportContext(db, project_id)
+    result = {"created": 0, "task_ids": [], "skipped": 0, "errors": []}
+
+    while batch := list(islice(records, IMPORT_BATCH_SIZE)):
+        parsed = []
+        for line, record in batch:
+            if isinstance(record, str):
+                result["errors"].append({"line": line, "error": record})
+            elif record.get("record_type", "task") != "task":
+                result["skipped"] += 1
+            else:
+                try:
+                    parsed.append((line, TaskImportRow.model_validate(record)))
+                except ValidationError as exc:
+                    result["errors"].append(
+                        {"line": line, "error": _validation_message(exc)}
+                    )
+
+        tag_ids = _tag_ids_by_name(db, [row for _, row in parsed])
+        valid = []
+        for line, row in parsed:
+            try:
+                stage_id, row_tag_ids = _resolve(row, context, tag_ids)
+            except ValueError as exc:
+                result["errors"].append({"line": line, "error": str(exc)})
+                continue
+            valid.append((line, row, stage_id, row_tag_ids))
+        if not valid:
+            continue
+
+        try:
+            task_ids = _insert_batch(db, project_id, creator_id, valid)
+            db.commit()
+        except SQLAlchemyError:
+            db.rollback()
+            result["errors"].extend(
+                {"line": line, "error": "Database error; row not imported"}
+                for line, *_ in valid
+            )
+            continue
+        result["created"] += len(task_ids)
+        result["task_ids"].extend(task_ids)
+
+    result["errors"].sort(key=lambda error: error["line"])
+    return result
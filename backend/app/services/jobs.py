@@ -0,0 +1,146 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Callable
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.background_job import BackgroundJob
+
+logger = logging.getLogger(__name__)
+
+# kind -> handler(db, **params) returning a JSON-serializable result
+JOB_HANDLERS: dict[str, Callable[..., Any]] = {}
+
+
+def job_handler(kind: str):
+    """Register a function as the handler for jobs of `kind`.
+
+    The handler gets its own session and owns its transactions: commit as
+    often as the work allows, anything left uncommitted is rolled back.
+    """
+
+    def register(func):
+        JOB_HANDLERS[kind] = func
+        return func
+
+    return register
+
+
+class JobRunner:
+    """Runs background jobs on a small thread pool, tracked in background_jobs.
+
+    A job runs in the process that accepted it; clients poll GET /jobs/{id}.
+    Jobs still queued when the process stops are marked failed.
+    """
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._executor: ThreadPoolExecutor | None = None
+        self._queued: set[int] = set()
+        self._lock = threading.Lock()
+
+    def submit(self, kind: str, user_id: int | None, **params) -> BackgroundJob:
+        if kind not in JOB_HANDLERS:
+            raise ValueError(f"Unknown job kind: {kind}")
+        with SessionLocal() as db:
+            job = BackgroundJob(kind=kind, user_id=user_id, params=params)
+            db.add(job)
+            db.commit()
+            db.refresh(job)
+            db.expunge(job)
+
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="job"
+                )
+            self._queued.add(job.id)
+            self._executor.submit(self._run, job.id)
+        return job
+
+    def _set(self, db: Session, job_id: int, **values):
+        db.execute(
+            update(BackgroundJob).where(BackgroundJob.id == job_id).values(**values)
+        )
+        db.commit()
+
+    def _run(self, job_id: int):
+        with self._lock:
+            self._queued.discard(job_id)
+        with SessionLocal() as db:
+            job = db.get(BackgroundJob, job_id)
+            kind, params = job.kind, job.params or {}
+            self._set(
+                db, job_id, status="running", started_at=datetime.now(timezone.utc)
+            )
+            try:
+                result = JOB_HANDLERS[kind](db, **params)
+            except Exception as exc:
+                db.rollback()
+                logger.exception("background job %s (%s) failed", job_id, kind)
+                self._set(
+                    db,
+                    job_id,
+                    status="failed",
+                    error=str(exc) or type(exc).__name__,
+                    finished_at=datetime.now(timezone.utc),
+                )
+                return
+            self._set(
+                db,
+                job_id,
+                status="succeeded",
+                result=result,
+                finished_at=datetime.now(timezone.utc),
+            )
+
+    def fail_interrupted(self) -> int:
+        """Fail jobs left pending or running by a previous process.
+
+        Called at startup, before this process accepts jobs. Jobs only run
+        in the process that accepted them, so none of these will finish.
+        """
+        with SessionLocal() as db:
+            failed = db.execute(
+                update(BackgroundJob)
+                .where(BackgroundJob.status.in_(["pending", "running"]))
+                .values(
+                    status="failed",
+                    error="Interrupted: the server restarted before the job finished",
+                    finished_at=datetime.now(timezone.utc),
+                )
+            ).rowcount
+            db.commit()
+        if failed:
+            logger.warning("marked %d interrupted background jobs as failed", failed)
+        return failed
+
+    def stop(self):
+        """Wait for running jobs; fail the ones that never started."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is None:
+            return
+        executor.shutdown(wait=True, cancel_futures=True)
+        with self._lock:
+            abandoned, self._queued = list(self._queued), set()
+        if abandoned:
+            with SessionLocal() as db:
+                db.execute(
+                    update(BackgroundJob)
+                    .where(BackgroundJob.id.in_(abandoned))
+                    .values(
+                        status="failed",
+                        error="Server shut down before the job started",
+                        finished_at=datetime.now(timezone.utc),
+                    )
+                )
+                db.commit()
+
+
+job_runner = JobRunner(max_workers=settings.JOB_WORKERS)
@@ -0,0 +1,36 @@
+from typing import Optional
+
+from sqlalchemy.orm import Session, joinedload
+
+from app.models.message import Message
+from app.models.tasks import Task
+from app.services.pagination import paginate_thread
+
+
+def get_thread_page(
+    db: Session,
+    object_type: str,
+    object_id: int,
+    limit: int,
+    before: Optional[str] = None,
+    after_id: Optional[int] = None,
+):
+    """CursorPage payload for one record's thread, see paginate_thread."""
+    query = (
+        db.query(Message)
+        .options(joinedload(Message.author))
+        .filter(Message.object_type == object_type, Message.object_id == object_id)
+    )
+    messages, next_cursor, has_next = paginate_thread(
+        query, Message.id, limit, before=before, after_id=after_id
+    )
+    return {"items": messages, "next_cursor": next_cursor, "has_next": has_next}
+
+
+def thread_project_id(db: Session, object_type: str, object_id: int) -> int | None:
+    """Project a thread belongs to; None for unknown records or types."""
+    if object_type == "project":
+        return object_id
+    if object_type == "task":
+        return db.query(Task.project_id).filter(Task.id == object_id).scalar()
+    return None
@@ -0,0 +1,235 @@
+import logging
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import bindparam, delete, func, select, update
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.notification import Notification
+from app.services.notification_service import (
+    decrement_unread,
+    recompute_unread_counts,
+)
+
+logger = logging.getLogger(__name__)
+
+# Rows that count as "the same notification" for compaction
+COMPACTION_KEY = (
+    Notification.user_id,
+    Notification.type,
+    Notification.entity_type,
+    Notification.entity_id,
+    Notification.is_read,
+)
+
+
+def _delete_ids(ids: list[int]):
+    with SessionLocal() as db:
+        db.execute(delete(Notification).where(Notification.id.in_(ids)))
+        db.commit()
+
+
+def prune_read(older_than_days: int, batch_size: int) -> int:
+    """Delete read notifications older than the cutoff, one batch per commit."""
+    cutoff = datetime.now(timezone.utc) - timedelta(days=older_than_days)
+    removed = 0
+    while True:
+        with SessionLocal() as db:
+            ids = db.scalars(
+                select(Notification.id)
+                .where(Notification.is_read == True, Notification.created_at < cutoff)
+                .limit(batch_size)
+            ).all()
+        if not ids:
+            return removed
+        _delete_ids(ids)
+        removed += len(ids)
+        if len(ids) < batch_size:
+            return removed
+
+
+def cap_per_user(max_rows: int, batch_size: int) -> int:
+    """Delete read notifications outside each user's newest `max_rows`.
+
+    Unread rows are left to the larger cap_unread_per_user ceiling, so
+    nobody loses an item they have not seen to this rule (and unread
+    counters are unaffected). Returns the rows removed.
+    """
+    with SessionLocal() as db:
+        user_ids = db.scalars(
+            select(Notification.user_id)
+            .group_by(Notification.user_id)
+            .having(func.count(Notification.id) > max_rows)
+        ).all()
+
+    removed = 0
+    for user_id in user_ids:
+        with SessionLocal() as db:
+            # Newest id that falls outside the cap; ids follow created_at
+            boundary = db.scalar(
+                select(Notification.id)
+                .where(Notification.user_id == user_id)
+                .order_by(Notification.id.desc())
+                .offset(max_rows)
+                .limit(1)
+            )
+        while boundary is not None:
+            with SessionLocal() as db:
+                ids = db.scalars(
+                    select(Notification.id)
+                    .where(
+                        Notification.user_id == user_id,
+                        Notification.is_read == True,
+                        Notification.id <= boundary,
+                    )
+                    .order_by(Notification.id)
+                    .limit(batch_size)
+                ).all()
+            if not ids:
+                break
+            _delete_ids(ids)
+            removed += len(ids)
+    return removed
+
+
+def cap_unread_per_user(max_unread: int, batch_size: int) -> int:
+    """Delete unread notifications outside each user's newest `max_unread`.
+
+    The hard ceiling for users who never read theirs, set well above the
+    read cap. Only rows still unread at delete time go, and the user's
+    unread counter drops by that many in the same transaction. Returns the
+    rows removed.
+    """
+    with SessionLocal() as db:
+        user_ids = db.scalars(
+            select(Notification.user_id)
+            .where(Notification.is_read == False)
+            .group_by(Notification.user_id)
+            .having(func.count(Notification.id) > max_unread)
+        ).all()
+
+    removed = 0
+    for user_id in user_ids:
+        with SessionLocal() as db:
+            boundary = db.scalar(
+                select(Notification.id)
+                .where(Notification.user_id == user_id, Notification.is_read == False)
+                .order_by(Notification.id.desc())
+                .offset(max_unread)
+                .limit(1)
+            )
+        while boundary is not None:
+            with SessionLocal() as db:
+                ids = db.scalars(
+                    select(Notification.id)
+                    .where(
+                        Notification.user_id == user_id,
+                        Notification.is_read == False,
+                        Notification.id <= boundary,
+                    )
+                    .order_by(Notification.id)
+                    .limit(batch_size)
+                ).all()
+                if not ids:
+                    break
+                # Rows marked read since the select are left to the read rules
+                deleted = db.execute(
+                    delete(Notification).where(
+                        Notification.id.in_(ids), Notification.is_read == False
+                    )
+                ).rowcount
+                decrement_unread(db, user_id, deleted)
+                db.commit()
+            removed += deleted
+    return removed
+
+
+def compact(batch_size: int) -> int:
+    """Merge repeated notifications about one entity into the newest row.
+
+    The surviving row keeps its message and timestamp and carries the sum
+    of the merged `count`s. Rows are grouped by user, type, entity and read
+    state, so unread repeats never hide inside a read row. Unread counters
+    of the affected users are rebuilt in the same transaction as each batch.
+    """
+    removed = 0
+    while True:
+        with SessionLocal() as db:
+            groups = db.execute(
+                select(
+                    *COMPACTION_KEY,
+                    func.max(Notification.id).label("keep_id"),
+                    func.sum(Notification.count).label("total"),
+                    func.count(Notification.id).label("rows"),
+                )
+                .where(
+                    Notification.entity_type.is_not(None),
+                    Notification.entity_id.is_not(None),
+                )
+                .group_by(*COMPACTION_KEY)
+                .having(func.count(Notification.id) > 1)
+                .limit(batch_size)
+            ).all()
+            if not groups:
+                return removed
+
+            # Core statements: executemany over the table, not ORM bulk mode
+            notifications = Notification.__table__
+            db.execute(
+                update(notifications)
+                .where(notifications.c.id == bindparam("keep_id"))
+                .values(count=bindparam("total")),
+                [{"keep_id": g.keep_id, "total": g.total} for g in groups],
+            )
+            db.execute(
+                delete(notifications).where(
+                    notifications.c.user_id == bindparam("g_user_id"),
+                    notifications.c.type == bindparam("g_type"),
+                    notifications.c.entity_type == bindparam("g_entity_type"),
+                    notifications.c.entity_id == bindparam("g_entity_id"),
+                    notifications.c.is_read == bindparam("g_is_read"),
+                    notifications.c.id < bindparam("keep_id"),
+                ),
+                [
+                    {
+                        "g_user_id": g.user_id,
+                        "g_type": g.type,
+                        "g_entity_type": g.entity_type,
+                        "g_entity_id": g.entity_id,
+                        "g_is_read": g.is_read,
+                        "keep_id": g.keep_id,
+                    }
+                    for g in groups
+                ],
+            )
+            unread_users = {g.user_id for g in groups if not g.is_read}
+            if unread_users:
+                recompute_unread_counts(db, unread_users)
+            db.commit()
+        removed += sum(g.rows - 1 for g in groups)
+        if len(groups) < batch_size:
+            return removed
+
+
+def run_retention():
+    """Apply the configured policy; every step commits in small batches."""
+    batch_size = settings.NOTIFICATION_RETENTION_BATCH_SIZE
+    stats = {}
+
+    if settings.NOTIFICATION_RETENTION_READ_DAYS > 0:
+        stats["pruned_read"] = prune_read(
+            settings.NOTIFICATION_RETENTION_READ_DAYS, batch_size
+        )
+    if settings.NOTIFICATION_COMPACTION_ENABLED:
+        stats["compacted"] = compact(batch_size)
+    if settings.NOTIFICATION_RETENTION_MAX_PER_USER > 0:
+        stats["capped"] = cap_per_user(
+            settings.NOTIFICATION_RETENTION_MAX_PER_USER, batch_size
+        )
+    if settings.NOTIFICATION_RETENTION_MAX_UNREAD_PER_USER > 0:
+        stats["capped_unread"] = cap_unread_per_user(
+            settings.NOTIFICATION_RETENTION_MAX_UNREAD_PER_USER, batch_size
+        )
+
+    logger.info("notification retention: %s", stats)
+    return stats
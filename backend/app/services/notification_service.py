@@ -1,8 +1,155 @@
+import logging
+import threading
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Iterable
+
+from sqlalchemy import case, event, func, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
-from app.models.notification import Notification
+
+from app.core.config import settings
+from app.core.metrics import registry
+from app.db.schemas.notification_schema import NotificationOut
+from app.db.session import SessionLocal
+from app.models.notification import Notification, NotificationCounter
+from app.services.realtime import broker, user_channel
+
+logger = logging.getLogger(__name__)
+
+DISPATCH_LAG = registry.histogram(
+    "notification_dispatch_lag_seconds",
+    "Time from a notification's insert until it is published.",
+)
+
+# Set on a session that wrote notifications; its commit wakes the dispatcher
+DISPATCH_KEY = "notifications_pending"
+
+
+# -----------------------------
+# Unread counters
+# -----------------------------
+def get_unread_count(db: Session, user_id: int) -> int:
+    unread = db.scalar(
+        select(NotificationCounter.unread).where(NotificationCounter.user_id == user_id)
+    )
+    return unread or 0
+
+
+def increment_unread(db: Session, user_ids: Iterable[int]):
+    """Add one unread per occurrence of each user id (upsert per user)."""
+    rows = [
+        {"user_id": user_id, "unread": count}
+        for user_id, count in Counter(user_ids).items()
+    ]
+    if not rows:
+        return
+    dialect = db.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        dialect_insert = (postgresql if dialect == "postgresql" else sqlite).insert
+        stmt = dialect_insert(NotificationCounter)
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[NotificationCounter.user_id],
+                set_={"unread": NotificationCounter.unread + stmt.excluded.unread},
+            ),
+            rows,
+        )
+        return
+    for row in rows:
+        updated = db.execute(
+            update(NotificationCounter)
+            .where(NotificationCounter.user_id == row["user_id"])
+            .values(unread=NotificationCounter.unread + row["unread"])
+        ).rowcount
+        if not updated:
+            db.execute(insert(NotificationCounter).values(**row))
+
+
+def decrement_unread(db: Session, user_id: int, count: int = 1):
+    if count <= 0:
+        return
+    db.execute(
+        update(NotificationCounter)
+        .where(NotificationCounter.user_id == user_id)
+        .values(
+            unread=case(
+                (
+                    NotificationCounter.unread > count,
+                    NotificationCounter.unread - count,
+                ),
+                else_=0,
+            )
+        )
+    )
+
+
+def _ensure_counters(db: Session, user_ids: list[int]):
+    """Create missing counter rows (unread 0) so they exist to be locked."""
+    dialect = db.get_bind().dialect.name
+    rows = [{"user_id": user_id, "unread": 0} for user_id in user_ids]
+    if dialect in ("postgresql", "sqlite"):
+        dialect_insert = (postgresql if dialect == "postgresql" else sqlite).insert
+        db.execute(
+            dialect_insert(NotificationCounter).on_conflict_do_nothing(
+                index_elements=[NotificationCounter.user_id]
+            ),
+            rows,
+        )
+        return
+    existing = set(
+        db.scalars(
+            select(NotificationCounter.user_id).where(
+                NotificationCounter.user_id.in_(user_ids)
+            )
+        )
+    )
+    missing = [row for row in rows if row["user_id"] not in existing]
+    if missing:
+        db.execute(insert(NotificationCounter), missing)
+
+
+def recompute_unread_counts(db: Session, user_ids: Iterable[int] | None = None):
+    """Rebuild counters from `notifications` (all users, or only `user_ids`).
+
+    The counter rows are locked before counting, so a concurrent notify
+    (which upserts the same rows) has either committed and is counted, or
+    waits and adds its increment on top of the rebuilt value.
+    """
+    if user_ids is None:
+        user_ids = db.scalars(
+            select(Notification.user_id).union(select(NotificationCounter.user_id))
+        )
+    user_ids = sorted(set(user_ids))
+    if not user_ids:
+        return
+    _ensure_counters(db, user_ids)
+    in_users = NotificationCounter.user_id.in_(user_ids)
+    db.execute(
+        select(NotificationCounter.user_id)
+        .where(in_users)
+        .order_by(NotificationCounter.user_id)
+        .with_for_update()
+    )
+    unread = (
+        select(func.count(Notification.id))
+        .where(
+            Notification.user_id == NotificationCounter.user_id,
+            Notification.is_read == False,
+        )
+        .scalar_subquery()
+    )
+    db.execute(update(NotificationCounter).where(in_users).values(unread=unread))
 
 
 class NotificationService:
+    """Write notifications in the caller's transaction.
+
+    Rows and unread counters commit (or roll back) together with the
+    caller's own changes. Committed rows start unpublished; the background
+    dispatcher then pushes them to connected clients.
+    """
+
     def __init__(self, db: Session):
         self.db = db
 
@@ -14,14 +161,143 @@ class NotificationService:
         entity_type: str = None,
         entity_id: int = None,
     ):
-        notif = Notification(
-            user_id=user_id,
-            type=notif_type,
-            message=message,
-            entity_type=entity_type,
-            entity_id=entity_id,
+        self.notify_many([user_id], notif_type, message, entity_type, entity_id)
+
+    def notify_many(
+        self,
+        user_ids: Iterable[int],
+        notif_type: str,
+        message: str,
+        entity_type: str = None,
+        entity_id: int = None,
+    ):
+        """One multi-row INSERT for all recipients (duplicates ignored)."""
+        user_ids = list(dict.fromkeys(user_ids))
+        if not user_ids:
+            return
+        self.db.execute(
+            insert(Notification),
+            [
+                {
+                    "user_id": user_id,
+                    "type": notif_type,
+                    "message": message,
+                    "entity_type": entity_type,
+                    "entity_id": entity_id,
+                    "is_read": False,
+                }
+                for user_id in user_ids
+            ],
         )
-        self.db.add(notif)
-        self.db.commit()
-        self.db.refresh(notif)
-        return notif
+        increment_unread(self.db, user_ids)
+        self.db.info[DISPATCH_KEY] = True
+
+
+class NotificationDispatcher:
+    """Background publisher for committed notifications.
+
+    Each round locks up to `batch_size` unpublished rows in id order,
+    publishes them to their recipients' realtime channels and marks them
+    published in the same transaction. A crash before that commit leaves
+    the rows unpublished, so they go out on a later round (at least once).
+    Commits in this process wake the thread; it also polls, which picks up
+    rows left by a restart or committed by another worker.
+    """
+
+    def __init__(self, batch_size: int, poll_interval: float):
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self._stopping.clear()
+                self._thread = threading.Thread(
+                    target=self._run, name="notification-dispatcher", daemon=True
+                )
+                self._thread.start()
+
+    def wake(self):
+        self.start()
+        self._wake.set()
+
+    def stop(self, timeout: float = 5):
+        """Publish everything committed so far, then stop the thread."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._stopping.set()
+            self._wake.set()
+            thread.join(timeout)
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+            try:
+                while self.dispatch_batch() == self.batch_size:
+                    pass
+            except Exception:
+                logger.exception("notification dispatch failed; retrying next round")
+            if self._stopping.is_set():
+                return
+
+    def dispatch_batch(self) -> int:
+        """Publish one batch of unpublished notifications; returns its size."""
+        with SessionLocal() as db:
+            rows = db.execute(
+                select(*Notification.__table__.c)
+                .where(Notification.published == False)
+                .order_by(Notification.id)
+                .limit(self.batch_size)
+                # Concurrent workers take disjoint batches (ignored on SQLite)
+                .with_for_update(skip_locked=True)
+            ).all()
+            if not rows:
+                return 0
+            for row in rows:
+                broker.publish(
+                    user_channel(row.user_id),
+                    "notification.created",
+                    NotificationOut.model_validate(row._mapping),
+                )
+            # Marked after publishing: the database broker writes its own rows,
+            # which SQLite would block while this session held the write lock
+            db.execute(
+                update(Notification)
+                .where(Notification.id.in_([row.id for row in rows]))
+                .values(published=True)
+            )
+            db.commit()
+
+        now = datetime.now(timezone.utc)
+        for row in rows:
+            created_at = row.created_at
+            if created_at is not None:
+                if created_at.tzinfo is None:  # SQLite stores naive UTC
+                    created_at = created_at.replace(tzinfo=timezone.utc)
+                DISPATCH_LAG.observe(max((now - created_at).total_seconds(), 0))
+        return len(rows)
+
+
+notification_dispatcher = NotificationDispatcher(
+    settings.NOTIFICATION_BATCH_SIZE, settings.NOTIFICATION_DISPATCH_POLL_SECONDS
+)
+
+
+# -----------------------------
+# Dispatcher wake-up
+# -----------------------------
+@event.listens_for(SessionLocal, "after_commit")
+def _wake_dispatcher(session):
+    if session.info.pop(DISPATCH_KEY, False):
+        notification_dispatcher.wake()
+
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _clear_dispatch_flag(session):
+    session.info.pop(DISPATCH_KEY, None)
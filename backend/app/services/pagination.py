@@ -0,0 +1,135 @@
+import base64
+import json
+from datetime import date, datetime
+
+from fastapi import HTTPException
+from sqlalchemy import and_, or_
+
+
+def encode_cursor(sort_key: str, value, row_id: int) -> str:
+    """Pack the last row's sort value and id into an opaque url-safe token."""
+    payload = {"k": sort_key, "id": row_id}
+    if isinstance(value, (datetime, date)):
+        payload.update(v=value.isoformat(), t="dt")
+    else:
+        payload["v"] = getattr(value, "value", value)  # enums -> raw value
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str, sort_key: str) -> tuple:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded))
+        value = payload["v"]
+        if payload.get("t") == "dt":
+            value = datetime.fromisoformat(value)
+        row_id = int(payload["id"])
+        key = payload["k"]
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    # A cursor is only meaningful for the ordering that produced it
+    if key != sort_key:
+        raise HTTPException(status_code=400, detail="Cursor does not match order_by")
+    return value, row_id
+
+
+def _nullable(column) -> bool:
+    return getattr(getattr(column, "expression", column), "nullable", True)
+
+
+def _seek(sort_column, id_column, value, row_id, descending: bool):
+    """Filter for rows strictly after (value, row_id) in the page ordering.
+
+    NULL sort values are ordered last in both directions.
+    """
+    id_past = id_column < row_id if descending else id_column > row_id
+    if sort_column is None:
+        return id_past
+    if value is None:
+        return and_(sort_column.is_(None), id_past)
+    value_past = sort_column < value if descending else sort_column > value
+    conditions = [value_past, and_(sort_column == value, id_past)]
+    if _nullable(sort_column):
+        conditions.append(sort_column.is_(None))
+    return or_(*conditions)
+
+
+def paginate_keyset(
+    query,
+    id_column,
+    limit: int,
+    cursor: str | None = None,
+    sort_column=None,
+    sort_key: str = "id",
+    descending: bool = False,
+):
+    """Run `query` as one keyset page ordered by (sort_column, id_column).
+
+    Returns (rows, next_cursor); next_cursor is None on the last page.
+    Any existing ORDER BY on `query` is replaced.
+    """
+    if cursor:
+        value, row_id = decode_cursor(cursor, sort_key)
+        query = query.filter(_seek(sort_column, id_column, value, row_id, descending))
+
+    ordering = []
+    if sort_column is not None:
+        if _nullable(sort_column):
+            ordering.append(sort_column.is_(None))
+        ordering.append(sort_column.desc() if descending else sort_column.asc())
+    ordering.append(id_column.desc() if descending else id_column.asc())
+
+    # One extra row tells us whether another page exists without a COUNT
+    rows = query.order_by(None).order_by(*ordering).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    value = getattr(last, sort_column.key) if sort_column is not None else None
+    return rows, encode_cursor(sort_key, value, getattr(last, id_column.key))
+
+
+def paginate_thread(
+    query,
+    id_column,
+    limit: int,
+    before: str | None = None,
+    after_id: int | None = None,
+):
+    """Window over a message thread, always returned oldest first.
+
+    - default: the latest `limit` rows (the tail of the thread)
+    - before:  the `limit` rows preceding a cursor from an earlier page
+    - after_id: up to `limit` rows newer than a row the client already has
+
+    Returns (rows, next_cursor, has_next). next_cursor pages further back
+    in time; in after_id mode it is None and has_next means newer rows are
+    still waiting (poll again with the last id).
+    """
+    if before and after_id is not None:
+        raise HTTPException(status_code=400, detail="Use either before or after_id")
+
+    if after_id is not None:
+        rows = (
+            query.filter(id_column > after_id)
+            .order_by(None)
+            .order_by(id_column.asc())
+            .limit(limit + 1)
+            .all()
+        )
+        return rows[:limit], None, len(rows) > limit
+
+    if before:
+        _, row_id = decode_cursor(before, "thread")
+        query = query.filter(id_column < row_id)
+
+    # Read newest-first so the index range scan stops after limit + 1 rows
+    rows = query.order_by(None).order_by(id_column.desc()).limit(limit + 1).all()
+    has_older = len(rows) > limit
+    rows = rows[:limit][::-1]
+    if not has_older:
+        return rows, None, False
+    return rows, encode_cursor("thread", None, getattr(rows[0], id_column.key)), True
@@ -0,0 +1,122 @@
+import threading
+import time
+from collections import OrderedDict
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.roles import Role
+from app.models.users import Users
+
+
+def _detached_copy(instance):
+    """Copy the loaded column values into a new detached instance.
+
+    The copy is not bound to any session, so it stays readable after the
+    request that loaded it has committed or closed its session.
+    """
+    mapper = inspect(type(instance))
+    return mapper.class_(
+        **{attr.key: getattr(instance, attr.key) for attr in mapper.column_attrs}
+    )
+
+
+def snapshot_user(user: Users) -> Users:
+    principal = _detached_copy(user)
+    if user.role is not None:
+        role = _detached_copy(user.role)
+        principal.role = role
+        make_transient_to_detached(role)
+    make_transient_to_detached(principal)
+    return principal
+
+
+class PrincipalCache:
+    """Bounded LRU of authenticated users keyed by access token.
+
+    Entries expire after `ttl_seconds` or at the token's `exp`, whichever
+    comes first. Any committed change to a user (or to any role) evicts the
+    affected entries, see the session hooks below.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: int):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[int, float, Users]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token: str) -> Users | None:
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                return None
+            _, expires_at, principal = entry
+            if expires_at <= time.time():
+                del self._entries[token]
+                return None
+            self._entries.move_to_end(token)
+            return principal
+
+    def set(self, token: str, user: Users, token_exp: float | None = None) -> Users:
+        principal = snapshot_user(user)
+        expires_at = time.time() + self.ttl_seconds
+        if token_exp is not None:
+            expires_at = min(expires_at, token_exp)
+
+        with self._lock:
+            self._entries[token] = (principal.id, expires_at, principal)
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return principal
+
+    def invalidate_user(self, user_id: int):
+        with self._lock:
+            stale = [
+                token
+                for token, (cached_id, _, _) in self._entries.items()
+                if cached_id == user_id
+            ]
+            for token in stale:
+                del self._entries[token]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+principal_cache = PrincipalCache(
+    max_size=settings.PRINCIPAL_CACHE_SIZE,
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+
+# --- Invalidation: evict principals once a change to them is committed ---
+@event.listens_for(SessionLocal, "after_flush")
+def _collect_changed_principals(session, flush_context):
+    changed = session.info.setdefault("changed_principals", set())
+    for obj in list(session.dirty) + list(session.deleted):
+        if isinstance(obj, Users):
+            changed.add(obj.id)
+        elif isinstance(obj, Role):
+            # A renamed or removed role affects every cached user holding it
+            changed.add(None)
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _evict_changed_principals(session):
+    changed = session.info.pop("changed_principals", None)
+    if not changed:
+        return
+    if None in changed:
+        principal_cache.clear()
+        return
+    for user_id in changed:
+        principal_cache.invalidate_user(user_id)
+
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _discard_changed_principals(session):
+    session.info.pop("changed_principals", None)
@@ -0,0 +1,313 @@
+import asyncio
+import itertools
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextvars import ContextVar
+from datetime import datetime, timezone
+
+from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.db.session import SessionLocal, engine
+from app.services.auth_service import user_from_token
+from app.services.principal_cache import principal_cache
+from app.services.role_helpers import is_admin_user
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STDLIB_DIR = os.path.dirname(os.__file__)
+MAX_STACK_DEPTH = 128
+
+
+def _frame_label(code) -> str:
+    """Function name with a short path (app, site-packages or stdlib relative)."""
+    filename = code.co_filename
+    if filename.startswith(APP_DIR):
+        filename = "app" + filename[len(APP_DIR) :]
+    elif "site-packages" in filename:
+        filename = filename.split("site-packages" + os.sep, 1)[-1]
+    elif filename.startswith(STDLIB_DIR):
+        filename = filename[len(STDLIB_DIR) + 1 :]
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+
+def _stack(frame) -> tuple[tuple[str, ...], bool]:
+    """(labels root first, whether any frame is application code)."""
+    labels = []
+    in_app = False
+    while frame is not None and len(labels) < MAX_STACK_DEPTH:
+        code = frame.f_code
+        in_app = in_app or code.co_filename.startswith(APP_DIR)
+        labels.append(_frame_label(code))
+        frame = frame.f_back
+    labels.reverse()
+    return tuple(labels), in_app
+
+
+def _request_call(frame):
+    """Outermost application frame: the call a worker is making for a request."""
+    call = None
+    while frame is not None:
+        if frame.f_code.co_filename.startswith(APP_DIR):
+            call = frame
+        frame = frame.f_back
+    return call
+
+
+def _is_running(frame, call) -> bool:
+    while frame is not None:
+        if frame is call:
+            return True
+        frame = frame.f_back
+    return False
+
+
+class RequestProfile:
+    """Wall-clock stack samples taken while one request was being handled.
+
+    The event loop thread is sampled only while this request's task is the
+    one running. Threadpool workers join once they run SQL for the request
+    (sync endpoints and dependencies) and are sampled until the call they
+    made for it returns, so a worker that moves on to another request is
+    not attributed to this one.
+    """
+
+    def __init__(self, profile_id: int, method: str, path: str, trigger: str):
+        self.id = profile_id
+        self.method = method
+        self.path = path
+        self.route: str | None = None
+        self.status: int | None = None
+        self.trigger = trigger
+        self.started_at = datetime.now(timezone.utc)
+        self.duration_ms = 0.0
+        self.samples = 0
+        self.stacks: Counter[tuple[str, ...]] = Counter()
+        # thread id -> frame of the call the worker is running for us
+        self.worker_threads: dict[int, object] = {}
+        self._workers_lock = threading.Lock()
+        self.loop = asyncio.get_running_loop()
+        self.task = asyncio.current_task()
+        self.loop_thread = threading.get_ident()
+
+    def sample(self, frames: dict):
+        taken = False
+        frame = frames.get(self.loop_thread)
+        if frame is not None and asyncio.current_task(self.loop) is self.task:
+            self.stacks[_stack(frame)[0]] += 1
+            taken = True
+        for thread_id, call in list(self.worker_threads.items()):
+            frame = frames.get(thread_id)
+            if frame is None or not _is_running(frame, call):
+                self._leave(thread_id, call)
+                continue
+            self.stacks[_stack(frame)[0]] += 1
+            taken = True
+        if taken:
+            self.samples += 1
+
+    def join(self, thread_id: int, call):
+        with self._workers_lock:
+            self.worker_threads[thread_id] = call
+
+    def _leave(self, thread_id: int, call):
+        # Keep the entry if the worker joined again with a newer call
+        with self._workers_lock:
+            if self.worker_threads.get(thread_id) is call:
+                del self.worker_threads[thread_id]
+
+    def summary(self) -> dict:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "route": self.route,
+            "status": self.status,
+            "trigger": self.trigger,
+            "started_at": self.started_at,
+            "duration_ms": round(self.duration_ms, 1),
+            "samples": self.samples,
+        }
+
+    def functions(self, limit: int = 50) -> list[dict]:
+        """Functions by samples spent in them (self) and under them (total)."""
+        own: Counter[str] = Counter()
+        total: Counter[str] = Counter()
+        for stack, count in self.stacks.items():
+            own[stack[-1]] += count
+            for label in set(stack):
+                total[label] += count
+        return [
+            {"function": label, "total": count, "self": own[label]}
+            for label, count in total.most_common(limit)
+        ]
+
+    def folded(self) -> str:
+        """Collapsed stacks ("a;b;c count"), as read by flame graph tools."""
+        return "".join(
+            f"{';'.join(stack)} {count}\n" for stack, count in self.stacks.most_common()
+        )
+
+
+# Set for the duration of a profiled request; threadpool calls inherit it
+current_profile: ContextVar[RequestProfile | None] = ContextVar(
+    "current_profile", default=None
+)
+
+
+class Profiler:
+    """Samples active RequestProfiles from one thread; keeps the last N."""
+
+    def __init__(self, interval: float, buffer_size: int, max_active: int):
+        self.interval = interval
+        self.max_active = max_active
+        self._ids = itertools.count(1)
+        self._active: set[RequestProfile] = set()
+        self._finished: deque[RequestProfile] = deque(maxlen=buffer_size)
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._thread = None
+
+    def start(self, method: str, path: str, trigger: str) -> RequestProfile | None:
+        """Begin profiling the current request; None when at capacity."""
+        with self._lock:
+            if len(self._active) >= self.max_active:
+                return None
+            profile = RequestProfile(next(self._ids), method, path, trigger)
+            self._active.add(profile)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="request-profiler", daemon=True
+                )
+                self._thread.start()
+            self._wake.notify()
+        return profile
+
+    def finish(self, profile: RequestProfile):
+        with self._lock:
+            self._active.discard(profile)
+            self._finished.append(profile)
+
+    def _run(self):
+        while True:
+            # Sampling under the lock: a finished profile gets no late samples
+            with self._lock:
+                while not self._active:
+                    self._wake.wait()
+                frames = sys._current_frames()
+                for profile in self._active:
+                    profile.sample(frames)
+                del frames
+            time.sleep(self.interval)
+
+    def list(self) -> list[RequestProfile]:
+        with self._lock:
+            return list(reversed(self._finished))
+
+    def get(self, profile_id: int) -> RequestProfile | None:
+        with self._lock:
+            return next((p for p in self._finished if p.id == profile_id), None)
+
+
+profiler = Profiler(
+    interval=settings.PROFILE_INTERVAL_MS / 1000,
+    buffer_size=settings.PROFILE_BUFFER_SIZE,
+    max_active=settings.PROFILE_MAX_CONCURRENT,
+)
+
+
+# A thread running SQL for a profiled request joins its sampled set
+@event.listens_for(engine, "before_cursor_execute")
+def _join_profile(conn, cursor, statement, parameters, context, executemany):
+    profile = current_profile.get()
+    if profile is None or profile.loop_thread == threading.get_ident():
+        return
+    call = _request_call(sys._getframe(1))
+    if call is not None:
+        profile.join(threading.get_ident(), call)
+
+
+# -----------------------------
+# Middleware
+# -----------------------------
+def _load_user(token: str):
+    with SessionLocal() as db:
+        try:
+            return user_from_token(token, db)
+        except HTTPException:
+            return None
+
+
+async def _is_admin_token(authorization: str) -> bool:
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return False
+    user = principal_cache.get(token)
+    if user is None:
+        # Cache miss: the lookup queries the database, so keep it off the loop
+        user = await run_in_threadpool(_load_user, token)
+    return user is not None and is_admin_user(user)
+
+
+class ProfilerMiddleware:
+    """Profile requests sent by an admin with the profile header, plus a
+    random PROFILE_SAMPLE_RATE fraction of all requests.
+
+    Results go to a ring buffer served by /admin/profiles; header-triggered
+    responses carry X-Profile-Id. Requests arriving while
+    PROFILE_MAX_CONCURRENT profiles are running are not profiled.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.header = settings.PROFILE_HEADER.lower().encode()
+
+    async def _trigger(self, scope) -> str | None:
+        requested = authorization = None
+        for name, value in scope["headers"]:
+            if name == self.header:
+                requested = value
+            elif name == b"authorization":
+                authorization = value
+        if requested and authorization:
+            if await _is_admin_token(authorization.decode("latin-1")):
+                return "header"
+        rate = settings.PROFILE_SAMPLE_RATE
+        if rate and random.random() < rate:
+            return "sampled"
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        trigger = await self._trigger(scope)
+        profile = trigger and profiler.start(scope["method"], scope["path"], trigger)
+        if not profile:
+            return await self.app(scope, receive, send)
+
+        start = time.perf_counter()
+        token = current_profile.set(profile)
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                profile.status = message["status"]
+                if trigger == "header":
+                    message["headers"] = [
+                        *message.get("headers", []),
+                        (b"x-profile-id", str(profile.id).encode()),
+                    ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            current_profile.reset(token)
+            profile.duration_ms = (time.perf_counter() - start) * 1000
+            profile.route = getattr(scope.get("route"), "path", None)
+            profiler.finish(profile)
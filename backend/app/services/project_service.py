@@ -0,0 +1,329 @@
+from sqlalchemy import and_, delete, insert, literal, or_, select
+from sqlalchemy.orm import Session
+
+from app.models.project import Milestone, Project, ProjectMember, Stage, project_tags
+from app.models.tasks import SubTask, Task, task_assignees, task_tags
+from app.services.jobs import job_handler
+from app.services.search_service import index_documents, remove_documents
+from app.services.task_service import (
+    ID_CHUNK_SIZE,
+    chunked,
+    delete_task_rows,
+    get_assignee_ids,
+    get_tag_ids,
+)
+
+
+def partition_project_ids(
+    db: Session, project_ids: list[int], user_id: int, roles: tuple[str, ...]
+) -> tuple[list[int], list[int], list[int]]:
+    """Split project ids into (authorized, unauthorized, not_found).
+
+    A project is authorized when the user holds one of `roles` on it.
+    Runs one joined query per chunk instead of two lookups per id.
+    """
+    project_ids = list(dict.fromkeys(project_ids))
+    roles_by_project: dict[int, str | None] = {}
+    for chunk in chunked(project_ids):
+        rows = (
+            db.query(Project.id, ProjectMember.role)
+            .outerjoin(
+                ProjectMember,
+                and_(
+                    ProjectMember.project_id == Project.id,
+                    ProjectMember.user_id == user_id,
+                ),
+            )
+            .filter(Project.id.in_(chunk))
+            .all()
+        )
+        for project_id, role in rows:
+            if roles_by_project.get(project_id) not in roles:
+                roles_by_project[project_id] = role
+
+    authorized, unauthorized, not_found = [], [], []
+    for project_id in project_ids:
+        if project_id not in roles_by_project:
+            not_found.append(project_id)
+        elif roles_by_project[project_id] in roles:
+            authorized.append(project_id)
+        else:
+            unauthorized.append(project_id)
+    return authorized, unauthorized, not_found
+
+
+def delete_projects(db: Session, project_ids: list[int]):
+    """Delete projects with their tasks, stages, milestones, members and tags."""
+    for chunk in chunked(project_ids):
+        remove_documents(db, "project", chunk)
+        delete_task_rows(db, select(Task.id).where(Task.project_id.in_(chunk)))
+        db.execute(delete(Stage).where(Stage.project_id.in_(chunk)))
+        db.execute(delete(Milestone).where(Milestone.project_id.in_(chunk)))
+        db.execute(delete(ProjectMember).where(ProjectMember.project_id.in_(chunk)))
+        db.execute(delete(project_tags).where(project_tags.c.project_id.in_(chunk)))
+        db.execute(
+            delete(Project)
+            .where(Project.id.in_(chunk))
+            .execution_options(synchronize_session=False)
+        )
+
+
+def archive_projects(db: Session, project_ids: list[int]):
+    for chunk in chunked(project_ids):
+        db.query(Project).filter(Project.id.in_(chunk)).update(
+            {Project.active: False}, synchronize_session=False
+        )
+
+
+def unique_copy_names(db: Session, names: list[str]) -> list[str]:
+    """Return "<name> (Copy)", "<name> (Copy) 2", ... not used by any project."""
+    bases = [f"{name} (Copy)" for name in names]
+    taken = set()
+    for chunk in chunked(list(set(bases))):
+        taken.update(
+            name
+            for (name,) in db.query(Project.name).filter(
+                or_(*(Project.name.startswith(base, autoescape=True) for base in chunk))
+            )
+        )
+
+    copy_names = []
+    for base in bases:
+        new_name = base
+        count = 1
+        while new_name in taken:
+            count += 1
+            new_name = f"{base} {count}"
+        taken.add(new_name)
+        copy_names.append(new_name)
+    return copy_names
+
+
+def duplicate_projects(db: Session, project_ids: list[int], owner_id: int) -> list[int]:
+    """Copy project rows and make `owner_id` manager of each copy.
+
+    Uses one batched INSERT per chunk for the projects and one for the
+    memberships. Returns the new ids in the same order as `project_ids`.
+    """
+    new_ids = []
+    for chunk in chunked(project_ids):
+        sources = {
+            project.id: project
+            for project in db.query(Project).filter(Project.id.in_(chunk)).all()
+        }
+        names = unique_copy_names(db, [sources[pid].name for pid in chunk])
+        rows = [
+            {
+                "name": name,
+                "description": sources[pid].description,
+                "owner_id": owner_id,
+                "allow_milestones": sources[pid].allow_milestones,
+                "is_favourite": False,
+                "allow_timesheets": sources[pid].allow_timesheets,
+                "status": None,
+                "active": True,
+                "start_date": sources[pid].start_date,
+                "end_date": sources[pid].end_date,
+            }
+            for pid, name in zip(chunk, names)
+        ]
+        chunk_new_ids = db.scalars(
+            insert(Project).returning(Project.id, sort_by_parameter_order=True), rows
+        ).all()
+        # Core inserts bypass the flush hook that maintains the search index
+        index_documents(db, "project", chunk_new_ids)
+        db.execute(
+            insert(ProjectMember),
+            [
+                {"project_id": new_id, "user_id": owner_id, "role": "manager"}
+                for new_id in chunk_new_ids
+            ],
+        )
+        new_ids.extend(chunk_new_ids)
+    return new_ids
+
+
+# -----------------------------
+# Deep duplication (runs as a background job)
+# -----------------------------
+def _copy_rows(db: Session, model, rows: list[dict]) -> list[int]:
+    """Batched INSERT .. RETURNING; new ids come back in `rows` order."""
+    if not rows:
+        return []
+    return db.scalars(
+        insert(model).returning(model.id, sort_by_parameter_order=True), rows
+    ).all()
+
+
+def _copy_tasks(db: Session, source_id: int, target_id: int, owner_id: int, maps):
+    stage_map, milestone_map = maps
+    copied = {"tasks": 0, "subtasks": 0}
+    last_id = 0
+    while True:
+        # Keyset batches over the source project; copies never match the filter
+        sources = db.execute(
+            select(
+                Task.id,
+                Task.name,
+                Task.description,
+                Task.status,
+                Task.active,
+                Task.priority,
+                Task.stage_id,
+                Task.milestone_id,
+                Task.start_date,
+                Task.due_date,
+            )
+            .where(Task.project_id == source_id, Task.id > last_id)
+            .order_by(Task.id)
+            .limit(ID_CHUNK_SIZE)
+        ).all()
+        if not sources:
+            return copied
+        last_id = sources[-1].id
+
+        old_ids = [task.id for task in sources]
+        new_ids = _copy_rows(
+            db,
+            Task,
+            [
+                {
+                    "name": task.name,
+                    "description": task.description,
+                    "status": task.status,
+                    "active": task.active,
+                    "priority": task.priority,
+                    "project_id": target_id,
+                    "stage_id": stage_map.get(task.stage_id),
+                    "milestone_id": milestone_map.get(task.milestone_id),
+                    "start_date": task.start_date,
+                    "due_date": task.due_date,
+                    "creator_id": owner_id,
+                }
+                for task in sources
+            ],
+        )
+        task_map = dict(zip(old_ids, new_ids))
+
+        for table, column, links in (
+            (task_assignees, "user_id", get_assignee_ids(db, old_ids)),
+            (task_tags, "tag_id", get_tag_ids(db, old_ids)),
+        ):
+            rows = [
+                {"task_id": task_map[task_id], column: value}
+                for task_id, values in links.items()
+                for value in values
+            ]
+            if rows:
+                db.execute(insert(table), rows)
+
+        subtasks = db.execute(
+            select(SubTask.task_id, SubTask.title, SubTask.is_done)
+            .where(SubTask.task_id.in_(old_ids))
+            .order_by(SubTask.id)
+        ).all()
+        if subtasks:
+            db.execute(
+                insert(SubTask),
+                [
+                    {
+                        "task_id": task_map[subtask.task_id],
+                        "title": subtask.title,
+                        "is_done": subtask.is_done,
+                        "owner_id": owner_id,
+                    }
+                    for subtask in subtasks
+                ],
+            )
+
+        # Core inserts bypass the flush hook that maintains the search index
+        index_documents(db, "task", new_ids)
+        copied["tasks"] += len(new_ids)
+        copied["subtasks"] += len(subtasks)
+
+
+def copy_project_contents(
+    db: Session, source_id: int, target_id: int, owner_id: int
+) -> dict[str, int]:
+    """Copy members, tags, stages, milestones, tasks (with assignees, tags
+    and subtasks) from one project into another.
+
+    Stage, milestone and task ids are remapped to the copies. `owner_id`
+    keeps the membership it already has on the target and becomes the
+    creator of the copied tasks. Returns the number of rows copied per kind.
+    """
+    db.execute(
+        insert(ProjectMember).from_select(
+            ["project_id", "user_id", "role"],
+            select(literal(target_id), ProjectMember.user_id, ProjectMember.role).where(
+                ProjectMember.project_id == source_id,
+                ProjectMember.user_id != owner_id,
+            ),
+        )
+    )
+    db.execute(
+        insert(project_tags).from_select(
+            ["project_id", "tag_id"],
+            select(literal(target_id), project_tags.c.tag_id).where(
+                project_tags.c.project_id == source_id
+            ),
+        )
+    )
+
+    stages = db.execute(
+        select(Stage.id, Stage.name, Stage.sequence, Stage.is_default)
+        .where(Stage.project_id == source_id)
+        .order_by(Stage.id)
+    ).all()
+    stage_ids = _copy_rows(
+        db,
+        Stage,
+        [
+            {
+                "name": stage.name,
+                "sequence": stage.sequence,
+                "is_default": stage.is_default,
+                "project_id": target_id,
+            }
+            for stage in stages
+        ],
+    )
+    milestones = db.execute(
+        select(Milestone.id, Milestone.name, Milestone.due_date)
+        .where(Milestone.project_id == source_id)
+        .order_by(Milestone.id)
+    ).all()
+    milestone_ids = _copy_rows(
+        db,
+        Milestone,
+        [
+            {
+                "name": milestone.name,
+                "due_date": milestone.due_date,
+                "project_id": target_id,
+            }
+            for milestone in milestones
+        ],
+    )
+
+    maps = (
+        dict(zip((stage.id for stage in stages), stage_ids)),
+        dict(zip((milestone.id for milestone in milestones), milestone_ids)),
+    )
+    copied = _copy_tasks(db, source_id, target_id, owner_id, maps)
+    return {"stages": len(stage_ids), "milestones": len(milestone_ids), **copied}
+
+
+@job_handler("duplicate_projects")
+def deep_duplicate_projects(db: Session, project_ids: list[int], owner_id: int):
+    """Job: deep-copy each project, committing one project at a time."""
+    projects = []
+    for project_id in project_ids:
+        if db.get(Project, project_id) is None:
+            continue  # deleted since the job was queued
+        (new_id,) = duplicate_projects(db, [project_id], owner_id)
+        copied = copy_project_contents(db, project_id, new_id, owner_id)
+        name = db.scalar(select(Project.name).where(Project.id == new_id))
+        db.commit()
+        projects.append({"source_id": project_id, "id": new_id, "name": name, **copied})
+    return {"duplicated": [project["id"] for project in projects], "projects": projects}
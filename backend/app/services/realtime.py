@@ -0,0 +1,238 @@
+import asyncio
+import json
+import logging
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+
+from fastapi import WebSocket, WebSocketDisconnect
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import delete, func, insert, select
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.realtime_event import RealtimeEvent
+
+logger = logging.getLogger(__name__)
+
+
+def thread_channel(object_type: str, object_id: int) -> str:
+    return f"thread:{object_type}:{object_id}"
+
+
+def user_channel(user_id: int) -> str:
+    return f"user:{user_id}"
+
+
+class Subscription:
+    """Bounded per-connection queue fed from any thread.
+
+    Delivery hops onto the subscriber's event loop; when the client falls
+    behind, the oldest undelivered events are dropped instead of growing
+    without limit.
+    """
+
+    def __init__(self, channel: str, loop: asyncio.AbstractEventLoop, maxsize: int):
+        self.channel = channel
+        self.loop = loop
+        self.queue: asyncio.Queue[str] = asyncio.Queue(maxsize)
+        self.dropped = 0
+
+    def push(self, payload: str):
+        self.loop.call_soon_threadsafe(self._put, payload)
+
+    def _put(self, payload: str):
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(payload)
+
+
+# -----------------------------
+# Backends
+# -----------------------------
+class InMemoryBackend:
+    """Fan-out within this process only (single uvicorn worker)."""
+
+    def __init__(self):
+        # Nobody can be subscribed before start(), so drop until then
+        self._deliver = lambda channel, payload: None
+
+    def start(self, deliver):
+        self._deliver = deliver
+
+    def publish(self, channel: str, payload: str):
+        self._deliver(channel, payload)
+
+    def stop(self):
+        pass
+
+
+class DatabaseBackend:
+    """Fan-out across workers through the shared `realtime_events` table.
+
+    publish() appends a row; every worker tails the table from a daemon
+    thread and delivers new rows to its local subscribers. Rows older than
+    REALTIME_EVENT_TTL_SECONDS are pruned while polling.
+    """
+
+    def __init__(self, poll_interval: float, ttl_seconds: int):
+        self.poll_interval = poll_interval
+        self.ttl_seconds = ttl_seconds
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self, deliver):
+        self._deliver = deliver
+        with SessionLocal() as db:
+            self._last_id = db.scalar(select(func.max(RealtimeEvent.id))) or 0
+        self._thread = threading.Thread(
+            target=self._run, name="realtime-poller", daemon=True
+        )
+        self._thread.start()
+
+    def publish(self, channel: str, payload: str):
+        with SessionLocal() as db:
+            db.execute(insert(RealtimeEvent).values(channel=channel, payload=payload))
+            db.commit()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.poll_interval * 2)
+
+    def _run(self):
+        polls = 0
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self._poll()
+                polls += 1
+                if polls % 100 == 0:
+                    self._prune()
+            except Exception:
+                logger.exception("realtime poll failed")
+
+    def _poll(self):
+        with SessionLocal() as db:
+            rows = db.execute(
+                select(RealtimeEvent.id, RealtimeEvent.channel, RealtimeEvent.payload)
+                .where(RealtimeEvent.id > self._last_id)
+                .order_by(RealtimeEvent.id)
+                .limit(1000)
+            ).all()
+        for event_id, channel, payload in rows:
+            self._deliver(channel, payload)
+            self._last_id = event_id
+
+    def _prune(self):
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=self.ttl_seconds)
+        with SessionLocal() as db:
+            db.execute(delete(RealtimeEvent).where(RealtimeEvent.created_at < cutoff))
+            db.commit()
+
+
+def create_backend(name: str = settings.REALTIME_BACKEND):
+    if name == "memory":
+        return InMemoryBackend()
+    if name == "database":
+        return DatabaseBackend(
+            settings.REALTIME_POLL_INTERVAL_SECONDS, settings.REALTIME_EVENT_TTL_SECONDS
+        )
+    raise ValueError(f"Unknown REALTIME_BACKEND: {name}")
+
+
+# -----------------------------
+# Broker
+# -----------------------------
+class Broker:
+    """Channel -> subscriber fan-out on top of a pluggable backend.
+
+    Events are JSON-encoded once in publish(), so every subscriber (and
+    every worker, for the database backend) sends the same text frame.
+    The backend is started lazily on the first subscription.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self._subscriptions: dict[str, set[Subscription]] = defaultdict(set)
+        self._lock = threading.Lock()
+        self._started = False
+
+    def publish(self, channel: str, event_type: str, data):
+        payload = json.dumps({"type": event_type, "data": jsonable_encoder(data)})
+        try:
+            self.backend.publish(channel, payload)
+        except Exception:
+            # Push is best effort; the data is already committed
+            logger.exception("realtime publish failed for %s", channel)
+
+    def _deliver(self, channel: str, payload: str):
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(channel, ()))
+        for subscription in subscriptions:
+            subscription.push(payload)
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+        self.backend.start(self._deliver)
+
+    @contextmanager
+    def subscribe(self, channel: str):
+        self._ensure_started()
+        subscription = Subscription(
+            channel, asyncio.get_running_loop(), settings.REALTIME_QUEUE_SIZE
+        )
+        with self._lock:
+            self._subscriptions[channel].add(subscription)
+        try:
+            yield subscription
+        finally:
+            with self._lock:
+                subscribers = self._subscriptions[channel]
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscriptions[channel]
+
+    def close(self):
+        if self._started:
+            self.backend.stop()
+
+
+broker = Broker(create_backend())
+
+
+async def _wait_for_disconnect(websocket: WebSocket):
+    # Clients only listen; anything they send is ignored
+    try:
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+
+
+async def stream_channel(websocket: WebSocket, channel: str):
+    """Forward a channel to an accepted websocket until the client leaves."""
+    with broker.subscribe(channel) as subscription:
+        disconnected = asyncio.create_task(_wait_for_disconnect(websocket))
+        try:
+            while not disconnected.done():
+                next_event = asyncio.create_task(subscription.queue.get())
+                done, _ = await asyncio.wait(
+                    {next_event, disconnected},
+                    timeout=settings.REALTIME_PING_SECONDS,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if next_event in done:
+                    await websocket.send_text(next_event.result())
+                    continue
+                next_event.cancel()
+                if not done:
+                    await websocket.send_text('{"type": "ping"}')
+        except (WebSocketDisconnect, RuntimeError):
+            pass
+        finally:
+            disconnected.cancel()
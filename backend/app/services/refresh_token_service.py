@@ -0,0 +1,112 @@
+import logging
+from datetime import datetime, timezone
+
+from sqlalchemy import delete, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.security.security import (
+    create_refresh_token,
+    create_signed_refresh_token,
+    decode_signed_refresh_token,
+    hash_refresh_token,
+    is_signed_refresh_token,
+)
+from app.db.session import SessionLocal
+from app.models.refresh_token import RefreshToken
+from app.services.token_revocation import revocation_list
+
+logger = logging.getLogger(__name__)
+
+
+def issue_refresh_token(db: Session, user, role_name: str) -> str:
+    """New refresh token in the configured REFRESH_TOKEN_MODE; commits."""
+    if settings.REFRESH_TOKEN_MODE == "signed":
+        db.commit()
+        return create_signed_refresh_token(user.username, user.id, role_name)
+    return create_refresh_token(user.id, db)
+
+
+def spend_refresh_token(db: Session, token: str) -> int | None:
+    """Revoke an opaque refresh token and return its user id.
+
+    Uses a conditional UPDATE, so of two requests racing with the same
+    token only one gets a user id. Returns None if the token is unknown,
+    revoked or expired. The caller commits (issue_refresh_token does).
+    """
+    user_id = db.scalar(
+        update(RefreshToken)
+        .where(
+            RefreshToken.token_hash == hash_refresh_token(token),
+            RefreshToken.revoked == False,
+            RefreshToken.expires_at > datetime.now(timezone.utc),
+        )
+        .values(revoked=True)
+        .returning(RefreshToken.user_id)
+    )
+    if user_id is None:
+        db.rollback()
+    return user_id
+
+
+def check_signed_refresh_token(db: Session, token: str) -> dict | None:
+    """Claims of a valid, unrevoked signed token, or None.
+
+    Only touches the database when the revocation filter reports a hit.
+    """
+    claims = decode_signed_refresh_token(token)
+    if claims is None or revocation_list.is_revoked(db, claims["jti"]):
+        return None
+    return claims
+
+
+def revoke_refresh_token(db: Session, token: str) -> bool:
+    if is_signed_refresh_token(token):
+        # Logging out with an expired token is fine; it is already unusable
+        claims = decode_signed_refresh_token(token, verify_exp=False)
+        if claims is None:
+            return False
+        revocation_list.revoke(db, claims)
+        return True
+
+    result = db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.token_hash == hash_refresh_token(token))
+        .values(revoked=True)
+    )
+    db.commit()
+    return result.rowcount > 0
+
+
+def sweep_refresh_tokens(batch_size: int | None = None) -> int:
+    """Delete expired and revoked tokens, one batch per transaction.
+
+    In signed mode revoked rows are the revocation list, so they are kept
+    until the token they block would have expired anyway.
+    """
+    batch_size = batch_size or settings.REFRESH_TOKEN_SWEEP_BATCH_SIZE
+    now = datetime.now(timezone.utc)
+    signed = settings.REFRESH_TOKEN_MODE == "signed"
+    condition = (
+        RefreshToken.expires_at <= now
+        if signed
+        else or_(RefreshToken.revoked == True, RefreshToken.expires_at <= now)
+    )
+    removed = 0
+    while True:
+        with SessionLocal() as db:
+            ids = db.scalars(
+                select(RefreshToken.id).where(condition).limit(batch_size)
+            ).all()
+            if ids:
+                db.execute(delete(RefreshToken).where(RefreshToken.id.in_(ids)))
+                db.commit()
+        removed += len(ids)
+        if len(ids) < batch_size:
+            break
+    if removed:
+        logger.info("refresh token sweep removed %s rows", removed)
+    if signed:
+        # Expired entries can only leave the filter through a rebuild
+        revocation_list.rebuild()
+    return removed
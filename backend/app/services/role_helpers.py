@@ -1,13 +1,27 @@
+from sqlalchemy import and_, event
 from sqlalchemy.orm import Session
-from fastapi import HTTPException
-from app.models.project import ProjectMember
+from fastapi import Depends, HTTPException
+from app.db.deps import db_dependency
+from app.db.session import SessionLocal
+from app.models.project import Project, ProjectMember
 from app.models.users import Users
+from app.services.auth_service import get_current_user
 
 
 def is_admin(user: dict):
     return user.get("is_superuser", False)
 
 
+def is_admin_user(user: Users) -> bool:
+    return user.role is not None and user.role.name == "admin"
+
+
+async def get_admin_user(current_user: Users = Depends(get_current_user)) -> Users:
+    if not is_admin_user(current_user):
+        raise HTTPException(status_code=403, detail="Admin access required")
+    return current_user
+
+
 def get_project_role(db: Session, user_id: int, project_id: int) -> str | None:
     member = (
         db.query(ProjectMember)
@@ -27,3 +41,96 @@ def require_project_role(
     role = get_project_role(db, user.id, project_id)
     if not role or role not in allowed_roles:
         raise HTTPException(status_code=403, detail="Not authorized")
+
+
+# -----------------------------
+# Project access (one query, memoized per session)
+# -----------------------------
+class ProjectAccess:
+    """A user's standing on a project: the project row plus their member role."""
+
+    def __init__(self, project: Project, user_id: int, role: str | None):
+        self.project = project
+        self.user_id = user_id
+        self.role = role
+
+    @property
+    def is_owner(self) -> bool:
+        return self.project.owner_id == self.user_id
+
+    @property
+    def is_member(self) -> bool:
+        return self.role is not None
+
+    @property
+    def is_manager(self) -> bool:
+        return self.role == "manager"
+
+    def allows(self, roles: list[str] | None = None, allow_owner: bool = True) -> bool:
+        if allow_owner and self.is_owner:
+            return True
+        if roles is None:
+            return self.is_member
+        return self.role in roles
+
+
+def get_project_access(db: Session, project_id: int, user_id: int) -> ProjectAccess:
+    """Load the project and the user's membership in a single joined query.
+
+    The result is kept on the session for the rest of the request, so
+    repeated checks (dependency + handler, or helper + handler) are free.
+    Raises 404 if the project does not exist.
+    """
+    memo = db.info.setdefault("project_access", {})
+    key = (project_id, user_id)
+    if key in memo:
+        return memo[key]
+
+    row = (
+        db.query(Project, ProjectMember.role)
+        .outerjoin(
+            ProjectMember,
+            and_(
+                ProjectMember.project_id == Project.id,
+                ProjectMember.user_id == user_id,
+            ),
+        )
+        .filter(Project.id == project_id)
+        .first()
+    )
+    if row is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    access = ProjectAccess(row[0], user_id, row[1])
+    memo[key] = access
+    return access
+
+
+def project_access(
+    roles: list[str] | None = None,
+    allow_owner: bool = True,
+    detail: str = "Not authorized for this project",
+):
+    """Route dependency resolving `project_id` into a checked ProjectAccess.
+
+    roles=None accepts any member; the owner passes unless allow_owner=False.
+    """
+
+    def dependency(
+        project_id: int,
+        db: db_dependency,
+        current_user: Users = Depends(get_current_user),
+    ) -> ProjectAccess:
+        access = get_project_access(db, project_id, current_user.id)
+        if not access.allows(roles, allow_owner):
+            raise HTTPException(status_code=403, detail=detail)
+        return access
+
+    return dependency
+
+
+# Membership can change once the session commits, so drop the memo then
+@event.listens_for(SessionLocal, "after_commit")
+@event.listens_for(SessionLocal, "after_rollback")
+def _reset_project_access(session):
+    session.info.pop("project_access", None)
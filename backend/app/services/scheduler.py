@@ -0,0 +1,57 @@
+import logging
+import threading
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicJob:
+    def __init__(self, name: str, interval_seconds: float, func: Callable[[], None]):
+        self.name = name
+        self.interval_seconds = interval_seconds
+        self.func = func
+
+    def run(self):
+        try:
+            self.func()
+        except Exception:
+            logger.exception("periodic job %s failed", self.name)
+
+
+class Scheduler:
+    """Runs registered jobs on their interval, one daemon thread per job.
+
+    Each uvicorn worker runs its own scheduler, so jobs must be safe to run
+    concurrently (idempotent, short transactions).
+    """
+
+    def __init__(self):
+        self.jobs: list[PeriodicJob] = []
+        self._stop = threading.Event()
+        self._threads: list[threading.Thread] = []
+
+    def add(self, name: str, interval_seconds: float, func: Callable[[], None]):
+        if interval_seconds > 0:
+            self.jobs.append(PeriodicJob(name, interval_seconds, func))
+
+    def start(self):
+        self._stop.clear()
+        for job in self.jobs:
+            thread = threading.Thread(
+                target=self._loop, args=(job,), name=f"job-{job.name}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: float = 5):
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads.clear()
+
+    def _loop(self, job: PeriodicJob):
+        while not self._stop.wait(job.interval_seconds):
+            job.run()
+
+
+scheduler = Scheduler()
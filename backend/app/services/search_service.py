@@ -0,0 +1,309 @@
+import re
+
+from sqlalchemy import (
+    bindparam,
+    case,
+    column,
+    delete,
+    event,
+    inspect,
+    insert,
+    literal,
+    select,
+    table,
+    text,
+)
+from sqlalchemy.orm import Session
+
+from app.db.session import SessionLocal
+from app.models.message import Message
+from app.models.project import Project
+from app.models.tasks import Task
+
+# Each document's key is entity_id * 4 + type code, so the index can be
+# addressed by primary key (FTS5 rowid) without a lookup on entity columns.
+TYPE_CODES = {"task": 1, "project": 2, "message": 3}
+
+SQLITE_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5("
+    "entity_type UNINDEXED, entity_id UNINDEXED, project_id UNINDEXED, "
+    "title, body, tokenize = 'porter unicode61')",
+]
+
+POSTGRES_DDL = [
+    """
+    CREATE TABLE IF NOT EXISTS search_index (
+        doc_key BIGINT PRIMARY KEY,
+        entity_type VARCHAR NOT NULL,
+        entity_id INTEGER NOT NULL,
+        project_id INTEGER,
+        title TEXT,
+        body TEXT,
+        document TSVECTOR GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce(title, '')), 'A')
+            || setweight(to_tsvector('english', coalesce(body, '')), 'B')
+        ) STORED
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_search_index_document "
+    "ON search_index USING GIN (document)",
+    "CREATE INDEX IF NOT EXISTS ix_search_index_project_id "
+    "ON search_index (project_id)",
+]
+
+
+def _index_table(dialect_name: str):
+    key = "rowid" if dialect_name == "sqlite" else "doc_key"
+    return table(
+        "search_index",
+        column(key),
+        column("entity_type"),
+        column("entity_id"),
+        column("project_id"),
+        column("title"),
+        column("body"),
+    )
+
+
+def _key_column(search_index):
+    return list(search_index.c)[0]
+
+
+def ensure_search_index(engine) -> bool:
+    """Create the dialect's index table if missing; True when it was created."""
+    dialect = engine.dialect.name
+    if dialect not in ("sqlite", "postgresql"):
+        return False
+    with engine.begin() as conn:
+        if inspect(conn).has_table("search_index"):
+            return False
+        for ddl in SQLITE_DDL if dialect == "sqlite" else POSTGRES_DDL:
+            conn.execute(text(ddl))
+    return True
+
+
+# -----------------------------
+# Document sources (set-based, read back from the tables)
+# -----------------------------
+def _task_documents(ids):
+    return select(
+        Task.id * 4 + TYPE_CODES["task"],
+        literal("task"),
+        Task.id,
+        Task.project_id,
+        Task.name,
+        Task.description,
+    ).where(Task.id.in_(ids))
+
+
+def _project_documents(ids):
+    return select(
+        Project.id * 4 + TYPE_CODES["project"],
+        literal("project"),
+        Project.id,
+        Project.id,
+        Project.name,
+        Project.description,
+    ).where(Project.id.in_(ids))
+
+
+def _message_documents(ids):
+    # Messages are searchable through the project that owns their thread
+    task_project = (
+        select(Task.project_id).where(Task.id == Message.object_id).scalar_subquery()
+    )
+    project_id = case(
+        (Message.object_type == "project", Message.object_id),
+        (Message.object_type == "task", task_project),
+        else_=None,
+    )
+    return select(
+        Message.id * 4 + TYPE_CODES["message"],
+        literal("message"),
+        Message.id,
+        project_id,
+        literal(None),
+        Message.content,
+    ).where(Message.id.in_(ids))
+
+
+DOCUMENT_SOURCES = {
+    "task": _task_documents,
+    "project": _project_documents,
+    "message": _message_documents,
+}
+
+
+def _delete_keys(db, search_index, entity_type: str, ids):
+    if isinstance(ids, (list, tuple, set)):
+        keys = [entity_id * 4 + TYPE_CODES[entity_type] for entity_id in ids]
+    else:
+        keys = select(ids.subquery().c[0] * 4 + TYPE_CODES[entity_type])
+    db.execute(delete(search_index).where(_key_column(search_index).in_(keys)))
+
+
+def remove_documents(db, entity_type: str, ids):
+    """Drop index rows for `ids` (a list or a select of entity ids).
+
+    Removing a task or project also drops its thread's messages: they stay
+    in the table, but should no longer turn up in searches.
+    """
+    search_index = _index_table(db.get_bind().dialect.name)
+    _delete_keys(db, search_index, entity_type, ids)
+    if entity_type in ("task", "project"):
+        thread = select(Message.id).where(
+            Message.object_type == entity_type, Message.object_id.in_(ids)
+        )
+        _delete_keys(db, search_index, "message", thread)
+
+
+def index_documents(db, entity_type: str, ids):
+    """(Re)index rows for `ids` (a list or a select of entity ids)."""
+    if isinstance(ids, (list, tuple, set)) and not ids:
+        return
+    search_index = _index_table(db.get_bind().dialect.name)
+    _delete_keys(db, search_index, entity_type, ids)
+    db.execute(
+        insert(search_index).from_select(
+            list(search_index.c), DOCUMENT_SOURCES[entity_type](ids)
+        )
+    )
+
+
+def rebuild_search_index(db):
+    search_index = _index_table(db.get_bind().dialect.name)
+    db.execute(delete(search_index))
+    for entity_type, source in DOCUMENT_SOURCES.items():
+        model = {"task": Task, "project": Project, "message": Message}[entity_type]
+        db.execute(
+            insert(search_index).from_select(
+                list(search_index.c), source(select(model.id))
+            )
+        )
+
+
+# -----------------------------
+# Query
+# -----------------------------
+def _match_terms(query: str) -> list[str]:
+    # Words only: user input never reaches the FTS/tsquery parser as syntax
+    return re.findall(r"\w+", query.lower())[:16]
+
+
+MEMBER_PROJECTS = """
+    SELECT project_id FROM project_members WHERE user_id = :user_id
+    UNION SELECT id FROM projects WHERE owner_id = :user_id
+"""
+
+
+def search(
+    db: Session,
+    query: str,
+    user_id: int,
+    types: list[str] | None = None,
+    project_id: int | None = None,
+    limit: int = 20,
+    offset: int = 0,
+):
+    """Ranked hits across tasks, projects and messages in the user's projects.
+
+    Every term is prefix-matched and all terms must match. Returns up to
+    `limit` rows of (entity_type, entity_id, project_id, title, snippet,
+    score), best first.
+    """
+    terms = _match_terms(query)
+    if not terms:
+        return []
+
+    filters = [f"project_id IN ({MEMBER_PROJECTS})"]
+    params = {"user_id": user_id, "limit": limit, "offset": offset}
+    if types:
+        filters.append("entity_type IN :types")
+        params["types"] = list(types)
+    if project_id is not None:
+        filters.append("project_id = :project_id")
+        params["project_id"] = project_id
+
+    if db.get_bind().dialect.name == "sqlite":
+        params["match"] = " ".join(f'"{term}"*' for term in terms)
+        sql = f"""
+            SELECT entity_type, entity_id, project_id, title,
+                   snippet(search_index, -1, '<mark>', '</mark>', '…', 16)
+                       AS snippet,
+                   -bm25(search_index, 0, 0, 0, 4.0, 1.0) AS score
+            FROM search_index
+            WHERE search_index MATCH :match AND {" AND ".join(filters)}
+            ORDER BY bm25(search_index, 0, 0, 0, 4.0, 1.0)
+            LIMIT :limit OFFSET :offset
+        """
+    else:
+        params["match"] = " & ".join(f"{term}:*" for term in terms)
+        # Rank and cut first; headlines are only built for the returned page
+        sql = f"""
+            SELECT hit.entity_type, hit.entity_id, hit.project_id, hit.title,
+                   ts_headline('english', coalesce(hit.body, hit.title, ''),
+                               to_tsquery('english', :match),
+                               'StartSel=<mark>, StopSel=</mark>, MaxWords=24,
+                                MinWords=8, MaxFragments=1') AS snippet,
+                   hit.score
+            FROM (
+                SELECT entity_type, entity_id, project_id, title, body,
+                       ts_rank(document, to_tsquery('english', :match)) AS score
+                FROM search_index
+                WHERE document @@ to_tsquery('english', :match)
+                  AND {" AND ".join(filters)}
+                ORDER BY score DESC
+                LIMIT :limit OFFSET :offset
+            ) AS hit
+            ORDER BY hit.score DESC
+        """
+
+    statement = text(sql)
+    if types:
+        statement = statement.bindparams(bindparam("types", expanding=True))
+    return db.execute(statement, params).all()
+
+
+# -----------------------------
+# Keep the index in sync with ORM writes
+# -----------------------------
+INDEXED_MODELS = {Task: "task", Project: "project", Message: "message"}
+INDEXED_FIELDS = {
+    "task": ("name", "description", "project_id"),
+    "project": ("name", "description"),
+    "message": ("content", "object_type", "object_id"),
+}
+
+
+def _changed(instance, fields) -> bool:
+    state = inspect(instance)
+    return any(state.attrs[field].history.has_changes() for field in fields)
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def _sync_search_index(session, flush_context):
+    if session.get_bind().dialect.name not in ("sqlite", "postgresql"):
+        return
+    upserts = {entity_type: set() for entity_type in INDEXED_FIELDS}
+    removals = {entity_type: set() for entity_type in INDEXED_FIELDS}
+
+    for instance in session.new:
+        entity_type = INDEXED_MODELS.get(type(instance))
+        if entity_type:
+            upserts[entity_type].add(instance.id)
+    for instance in session.dirty:
+        entity_type = INDEXED_MODELS.get(type(instance))
+        if entity_type and _changed(instance, INDEXED_FIELDS[entity_type]):
+            upserts[entity_type].add(instance.id)
+    for instance in session.deleted:
+        entity_type = INDEXED_MODELS.get(type(instance))
+        if entity_type:
+            removals[entity_type].add(instance.id)
+
+    # Same connection and transaction as the flush: the index commits or
+    # rolls back together with the rows it describes
+    for entity_type, ids in removals.items():
+        if ids:
+            remove_documents(session, entity_type, list(ids))
+    for entity_type, ids in upserts.items():
+        index_documents(session, entity_type, list(ids))
@@ -0,0 +1,209 @@
+from sqlalchemy import and_, delete, func, insert
+from sqlalchemy.orm import Session
+
+from app.models.message import Message
+from app.models.project import ProjectMember
+from app.models.tasks import SubTask, Task, TaskAttachment, task_assignees, task_tags
+from app.services.search_service import index_documents, remove_documents
+
+# Keep IN (...) lists well below driver parameter limits
+ID_CHUNK_SIZE = 500
+
+
+def chunked(ids: list[int], size: int = ID_CHUNK_SIZE):
+    for start in range(0, len(ids), size):
+        yield ids[start : start + size]
+
+
+def get_assignee_ids(db: Session, task_ids: list[int]) -> dict[int, list[int]]:
+    """Map each task id to its assignee ids with one query per chunk of tasks."""
+    assignees = {task_id: [] for task_id in task_ids}
+    for chunk in chunked(list(assignees)):
+        rows = (
+            db.query(task_assignees.c.task_id, task_assignees.c.user_id)
+            .filter(task_assignees.c.task_id.in_(chunk))
+            .order_by(task_assignees.c.task_id, task_assignees.c.user_id)
+            .all()
+        )
+        for task_id, user_id in rows:
+            assignees[task_id].append(user_id)
+    return assignees
+
+
+def get_tag_ids(db: Session, task_ids: list[int]) -> dict[int, list[int]]:
+    """Map each task id to its tag ids with one query per chunk of tasks."""
+    tags = {task_id: [] for task_id in task_ids}
+    for chunk in chunked(list(tags)):
+        rows = (
+            db.query(task_tags.c.task_id, task_tags.c.tag_id)
+            .filter(task_tags.c.task_id.in_(chunk))
+            .order_by(task_tags.c.task_id, task_tags.c.tag_id)
+            .all()
+        )
+        for task_id, tag_id in rows:
+            tags[task_id].append(tag_id)
+    return tags
+
+
+def get_message_counts(db: Session, task_ids: list[int]) -> dict[int, int]:
+    """Map each task id to its number of messages (0 when it has none)."""
+    counts = {task_id: 0 for task_id in task_ids}
+    for chunk in chunked(list(counts)):
+        rows = (
+            db.query(Message.object_id, func.count(Message.id))
+            .filter(Message.object_type == "task", Message.object_id.in_(chunk))
+            .group_by(Message.object_id)
+            .all()
+        )
+        for object_id, count in rows:
+            counts[object_id] = count
+    return counts
+
+
+# TaskOut fields, selected as plain columns for the row-tuple fast path
+TASK_COLUMNS = (
+    Task.id,
+    Task.name,
+    Task.description,
+    Task.due_date,
+    Task.status,
+    Task.active,
+    Task.priority,
+    Task.project_id,
+    Task.stage_id,
+    Task.milestone_id,
+    Task.creator_id,
+    Task.created_at,
+    Task.updated_at,
+)
+
+
+def task_row_dicts(db: Session, rows) -> list[dict]:
+    """TaskOut-shaped dicts from TASK_COLUMNS rows, without building models.
+
+    Pair with FastJSONResponse; the output is not validated again.
+    """
+    assignee_ids = get_assignee_ids(db, [row.id for row in rows])
+    items = []
+    for row in rows:
+        item = row._asdict()
+        item["status"] = row.status.value if row.status else None
+        item["assignee_ids"] = assignee_ids[row.id]
+        items.append(item)
+    return items
+
+
+# -----------------------------
+# Set-based bulk operations
+# -----------------------------
+def partition_task_ids(
+    db: Session, task_ids: list[int], user_id: int, roles: tuple[str, ...]
+) -> tuple[list[int], list[int], list[int]]:
+    """Split task ids into (authorized, unauthorized, not_found).
+
+    A task is authorized when the user holds one of `roles` on its project.
+    Runs one joined query per chunk instead of two lookups per id.
+    """
+    task_ids = list(dict.fromkeys(task_ids))
+    roles_by_task: dict[int, str | None] = {}
+    for chunk in chunked(task_ids):
+        rows = (
+            db.query(Task.id, ProjectMember.role)
+            .outerjoin(
+                ProjectMember,
+                and_(
+                    ProjectMember.project_id == Task.project_id,
+                    ProjectMember.user_id == user_id,
+                ),
+            )
+            .filter(Task.id.in_(chunk))
+            .all()
+        )
+        for task_id, role in rows:
+            if roles_by_task.get(task_id) not in roles:
+                roles_by_task[task_id] = role
+
+    authorized, unauthorized, not_found = [], [], []
+    for task_id in task_ids:
+        if task_id not in roles_by_task:
+            not_found.append(task_id)
+        elif roles_by_task[task_id] in roles:
+            authorized.append(task_id)
+        else:
+            unauthorized.append(task_id)
+    return authorized, unauthorized, not_found
+
+
+def delete_task_rows(db: Session, task_ids):
+    """Delete tasks and their dependent rows.
+
+    `task_ids` may be a list or a SELECT of task ids. Children are removed
+    explicitly because bulk deletes skip ORM cascades and SQLite does not
+    enforce ON DELETE CASCADE unless foreign keys are switched on.
+    """
+    remove_documents(db, "task", task_ids)
+    db.execute(delete(task_assignees).where(task_assignees.c.task_id.in_(task_ids)))
+    db.execute(delete(task_tags).where(task_tags.c.task_id.in_(task_ids)))
+    db.execute(delete(TaskAttachment).where(TaskAttachment.task_id.in_(task_ids)))
+    db.execute(delete(SubTask).where(SubTask.task_id.in_(task_ids)))
+    db.execute(
+        delete(Task)
+        .where(Task.id.in_(task_ids))
+        .execution_options(synchronize_session=False)
+    )
+
+
+def delete_tasks(db: Session, task_ids: list[int]):
+    for chunk in chunked(task_ids):
+        delete_task_rows(db, chunk)
+
+
+def archive_tasks(db: Session, task_ids: list[int]):
+    for chunk in chunked(task_ids):
+        db.query(Task).filter(Task.id.in_(chunk)).update(
+            {Task.active: False}, synchronize_session=False
+        )
+
+
+def duplicate_tasks(db: Session, task_ids: list[int], creator_id: int) -> list[int]:
+    """Copy tasks (with their assignees) using batched INSERTs.
+
+    Returns the new ids in the same order as `task_ids`.
+    """
+    new_ids = []
+    for chunk in chunked(task_ids):
+        sources = {
+            task.id: task for task in db.query(Task).filter(Task.id.in_(chunk)).all()
+        }
+        rows = [
+            {
+                "name": f"{sources[task_id].name} (Copy)",
+                "description": sources[task_id].description,
+                "project_id": sources[task_id].project_id,
+                "milestone_id": sources[task_id].milestone_id,
+                "stage_id": sources[task_id].stage_id,
+                "priority": sources[task_id].priority,
+                "due_date": sources[task_id].due_date,
+                "creator_id": creator_id,
+            }
+            for task_id in chunk
+        ]
+        # sort_by_parameter_order keeps new ids aligned with `rows`; Postgres
+        # batches this, SQLite falls back to in-process per-row executes
+        chunk_new_ids = db.scalars(
+            insert(Task).returning(Task.id, sort_by_parameter_order=True), rows
+        ).all()
+        # Core inserts bypass the flush hook that maintains the search index
+        index_documents(db, "task", chunk_new_ids)
+
+        copied = dict(zip(chunk, chunk_new_ids))
+        assignee_rows = [
+            {"task_id": copied[task_id], "user_id": user_id}
+            for task_id, user_ids in get_assignee_ids(db, chunk).items()
+            for user_id in user_ids
+        ]
+        if assignee_rows:
+            db.execute(insert(task_assignees), assignee_rows)
+
+        new_ids.extend(chunk_new_ids)
+    return new_ids
@@ -0,0 +1,124 @@
+import hashlib
+import math
+import threading
+from datetime import datetime, timezone
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.security.security import hash_refresh_token
+from app.db.session import SessionLocal
+from app.models.refresh_token import RefreshToken
+
+# Rows re-read below the sync watermark, for inserts that commit out of id order
+SYNC_OVERLAP = 100
+
+
+class BloomFilter:
+    """Fixed-size set membership with false positives but no false negatives."""
+
+    def __init__(self, capacity: int, error_rate: float):
+        capacity = max(capacity, 1)
+        self.size = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str):
+        # Double hashing: k positions from two 64-bit halves of one digest
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:], "big") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, key: str):
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(key)
+        )
+
+
+class RevocationList:
+    """Per-process filter over revoked signed refresh tokens (by jti digest).
+
+    A miss is authoritative, so most refreshes never reach the database; a
+    hit is confirmed with one indexed lookup. Bloom filters cannot remove
+    entries, so the filter is rebuilt from the table at startup and after
+    every sweep, and synced with other workers' logouts by id watermark.
+    """
+
+    def __init__(self):
+        self._filter = BloomFilter(1, settings.REVOCATION_FILTER_ERROR_RATE)
+        self._last_id = 0
+        self._lock = threading.Lock()
+
+    def _revoked_rows(self, db: Session, after_id: int = 0):
+        return db.execute(
+            select(RefreshToken.id, RefreshToken.token_hash).where(
+                RefreshToken.revoked == True,
+                RefreshToken.expires_at > datetime.now(timezone.utc),
+                RefreshToken.id > after_id,
+            )
+        ).all()
+
+    def rebuild(self):
+        with SessionLocal() as db:
+            rows = self._revoked_rows(db)
+        bloom = BloomFilter(
+            max(settings.REVOCATION_FILTER_CAPACITY, 2 * len(rows)),
+            settings.REVOCATION_FILTER_ERROR_RATE,
+        )
+        for row in rows:
+            bloom.add(row.token_hash)
+        with self._lock:
+            self._filter = bloom
+            self._last_id = max((row.id for row in rows), default=self._last_id)
+
+    def sync(self):
+        with SessionLocal() as db:
+            rows = self._revoked_rows(db, self._last_id - SYNC_OVERLAP)
+        with self._lock:
+            for row in rows:
+                self._filter.add(row.token_hash)
+                self._last_id = max(self._last_id, row.id)
+
+    def is_revoked(self, db: Session, jti: str) -> bool:
+        token_hash = hash_refresh_token(jti)
+        if token_hash not in self._filter:
+            return False
+        # Possible hit (or a false positive): ask the table
+        return (
+            db.scalar(
+                select(RefreshToken.id).where(
+                    RefreshToken.token_hash == token_hash,
+                    RefreshToken.revoked == True,
+                )
+            )
+            is not None
+        )
+
+    def revoke(self, db: Session, claims: dict):
+        """Record a signed token as revoked until it would have expired."""
+        token_hash = hash_refresh_token(claims["jti"])
+        db.add(
+            RefreshToken(
+                user_id=claims["id"],
+                token_hash=token_hash,
+                expires_at=datetime.fromtimestamp(claims["exp"], timezone.utc),
+                revoked=True,
+            )
+        )
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()  # already revoked
+        with self._lock:
+            self._filter.add(token_hash)
+
+
+revocation_list = RevocationList()
@@ -0,0 +1,153 @@
+import os
+
+# Settings are read at import time: point the app at a private in-memory
+# database (create_db_engine gives it a StaticPool) before importing it
+os.environ["DATABASE_URL"] = "sqlite://"
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret")
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.db.seed import seed_roles
+from app.db.session import Base, SessionLocal, engine
+from app.main import app
+from app.models.project import Tag
+from app.models.tasks import Task
+from app.models.users import Users
+from app.services.notification_service import notification_dispatcher
+from app.services.principal_cache import principal_cache
+
+
+class ConnectionCounter:
+    """Connections checked out of `engine`'s pool: now, and at most."""
+
+    def __init__(self, engine):
+        self.open = 0
+        self.peak = 0
+        event.listen(engine, "checkout", self._checkout)
+        event.listen(engine, "checkin", self._checkin)
+        self._engine = engine
+
+    def _checkout(self, dbapi_connection, connection_record, connection_proxy):
+        self.open += 1
+        self.peak = max(self.peak, self.open)
+
+    def _checkin(self, dbapi_connection, connection_record):
+        self.open -= 1
+
+    def remove(self):
+        event.remove(self._engine, "checkout", self._checkout)
+        event.remove(self._engine, "checkin", self._checkin)
+
+
+# -----------------------------
+# Benchmarks (-m benchmark): results are listed after the test summary
+# -----------------------------
+BENCHMARK_RESULTS: list[str] = []
+
+
+@pytest.fixture
+def benchmark_report():
+    return BENCHMARK_RESULTS.append
+
+
+def pytest_terminal_summary(terminalreporter):
+    if BENCHMARK_RESULTS:
+        terminalreporter.section("benchmarks")
+        for line in BENCHMARK_RESULTS:
+            terminalreporter.write_line(line)
+
+
+@pytest.fixture(autouse=True)
+def database(monkeypatch):
+    """Empty tables (roles seeded) for every test.
+
+    The notification dispatcher stays off like the rest of the lifespan: its
+    thread would share the single in-memory connection with the test.
+    """
+    monkeypatch.setattr(notification_dispatcher, "wake", lambda: None)
+    with engine.begin() as conn:
+        for table in reversed(Base.metadata.sorted_tables):
+            conn.execute(table.delete())
+    principal_cache.clear()
+    with SessionLocal() as db:
+        seed_roles(db)
+    yield
+
+
+@pytest.fixture
+def db():
+    with SessionLocal() as session:
+        yield session
+
+
+@pytest.fixture
+def client():
+    # No `with`: the lifespan (scheduler, dispatcher) stays off in tests
+    return TestClient(app)
+
+
+@pytest.fixture
+def make_user(client):
+    """Register a user and return their bearer headers."""
+
+    def make(username: str) -> dict:
+        response = client.post(
+            "/auth/",
+            json={
+                "username": username,
+                "email": f"{username}@example.com",
+                "first_name": username,
+                "last_name": "Test",
+                "password": "password",
+            },
+        )
+        assert response.status_code == 201, response.text
+        response = client.post(
+            "/auth/token", data={"username": username, "password": "password"}
+        )
+        assert response.status_code == 200, response.text
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    return make
+
+
+@pytest.fixture
+def connection_counter():
+    counter = ConnectionCounter(engine)
+    yield counter
+    counter.remove()
+
+
+@pytest.fixture
+def make_project(client):
+    def make(headers: dict, name: str = "Project") -> int:
+        response = client.post("/projects/", json={"name": name}, headers=headers)
+        assert response.status_code == 201, response.text
+        return response.json()["id"]
+
+    return make
+
+
+@pytest.fixture
+def add_tasks(db):
+    """Add `count` tasks to a project, each with two assignees and two tags."""
+
+    def add(project_id: int, count: int, assignee_ids: list[int]) -> list[int]:
+        tags = [Tag(name=f"tag-{project_id}-{i}") for i in range(2)]
+        assignees = db.query(Users).filter(Users.id.in_(assignee_ids)).all()
+        tasks = [
+            Task(
+                name=f"Task {i}",
+                project_id=project_id,
+                assignees=assignees,
+                tags=tags,
+            )
+            for i in range(count)
+        ]
+        db.add_all(tasks)
+        db.commit()
+        return [task.id for task in tasks]
+
+    return add
@@ -0,0 +1,17 @@
+from app.services.principal_cache import principal_cache
+
+
+def test_authenticated_requests_share_one_connection(
+    client, make_user, connection_counter
+):
+    headers = make_user("alice")
+
+    for _ in range(1000):
+        # Skip the principal cache so every request runs the identity query
+        principal_cache.clear()
+        response = client.get("/projects/projects", headers=headers)
+        assert response.status_code == 200
+
+    # Auth and the handler share the request session, and it is closed
+    assert connection_counter.peak == 1
+    assert connection_counter.open == 0
@@ -0,0 +1,45 @@
+from app.models.tasks import Task
+
+
+def test_board_lists_unstaged_tasks_and_counts_them(
+    client, db, make_user, make_project
+):
+    headers = make_user("owner")
+    project_id = make_project(headers)
+    stage = client.post(
+        f"/projects/{project_id}/stages/",
+        json={"name": "Doing", "sequence": 1},
+        headers=headers,
+    ).json()
+    db.add_all(
+        [
+            Task(name=f"staged {i}", project_id=project_id, stage_id=stage["id"])
+            for i in range(2)
+        ]
+        + [
+            Task(name=f"loose {i}", project_id=project_id, stage_id=None)
+            for i in range(3)
+        ]
+    )
+    db.commit()
+
+    board = client.get(f"/projects/{project_id}/board", headers=headers).json()
+
+    doing = next(column for column in board["stages"] if column["id"] == stage["id"])
+    assert doing["task_count"] == len(doing["tasks"]) == 2
+    assert board["unstaged"]["task_count"] == 3
+    assert [task["name"] for task in board["unstaged"]["tasks"]] == [
+        "loose 0",
+        "loose 1",
+        "loose 2",
+    ]
+    listed = sum(len(column["tasks"]) for column in board["stages"])
+    counted = sum(column["task_count"] for column in board["stages"])
+    assert listed + len(board["unstaged"]["tasks"]) == 5
+    assert counted + board["unstaged"]["task_count"] == 5
+
+    limited = client.get(
+        f"/projects/{project_id}/board?per_stage_limit=2", headers=headers
+    ).json()
+    assert len(limited["unstaged"]["tasks"]) == 2
+    assert limited["unstaged"]["task_count"] == 3
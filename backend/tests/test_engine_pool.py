@@ -0,0 +1,140 @@
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+from sqlalchemy import NullPool, StaticPool, exc, text
+
+from app.core.config import settings
+from app.db.seed import seed_roles
+from app.db.session import (
+    Base,
+    SessionLocal,
+    TimedQueuePool,
+    create_db_engine,
+)
+from app.db.session import engine as default_engine
+from app.main import app
+from app.services.search_service import ensure_search_index
+
+
+@pytest.fixture
+def pool_settings(monkeypatch):
+    def configure(**values):
+        for name, value in values.items():
+            monkeypatch.setattr(settings, name, value)
+
+    return configure
+
+
+def test_in_memory_sqlite_shares_one_connection():
+    engine = create_db_engine("sqlite://")
+    assert isinstance(engine.pool, StaticPool)
+
+
+def test_file_sqlite_gets_a_sized_queue_pool(tmp_path, pool_settings):
+    pool_settings(DB_POOL_SIZE=4, DB_MAX_OVERFLOW=6, DB_POOL_TIMEOUT=7)
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'app.db'}")
+    assert isinstance(engine.pool, TimedQueuePool)
+    assert engine.pool.size() == 4
+    assert engine.pool._max_overflow == 6
+    assert engine.pool._timeout == 7
+
+
+def test_pool_can_be_disabled(tmp_path, pool_settings):
+    pool_settings(DB_POOL_DISABLED=True)
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'app.db'}")
+    assert isinstance(engine.pool, NullPool)
+
+
+def test_pool_stays_within_limits_under_load(tmp_path, pool_settings):
+    pool_settings(DB_POOL_SIZE=2, DB_MAX_OVERFLOW=3, DB_POOL_TIMEOUT=30)
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'app.db'}")
+    peak = 0
+    errors = []
+    lock = threading.Lock()
+
+    def worker():
+        nonlocal peak
+        try:
+            for _ in range(20):
+                with engine.connect() as conn:
+                    with lock:
+                        peak = max(peak, engine.pool.checkedout())
+                    conn.execute(text("SELECT 1")).scalar()
+        except Exception as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=worker) for _ in range(50)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert 1 <= peak <= 2 + 3
+    assert engine.pool.checkedout() == 0
+
+
+def test_exhausted_pool_times_out(tmp_path, pool_settings):
+    pool_settings(DB_POOL_SIZE=1, DB_MAX_OVERFLOW=0, DB_POOL_TIMEOUT=0.1)
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'app.db'}")
+    with engine.connect():
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+
+
+# -----------------------------
+# Benchmark: /projects/projects throughput with and without the pool
+# -----------------------------
+BENCHMARK_REQUESTS = 1000
+BENCHMARK_CONCURRENCY = 20
+
+
+async def _requests_per_second(headers: dict) -> float:
+    transport = httpx.ASGITransport(app=app)
+    limit = asyncio.Semaphore(BENCHMARK_CONCURRENCY)
+
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://testserver"
+    ) as http:
+
+        async def one():
+            async with limit:
+                response = await http.get("/projects/projects", headers=headers)
+            assert response.status_code == 200, response.text
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(BENCHMARK_REQUESTS)))
+        return BENCHMARK_REQUESTS / (time.perf_counter() - start)
+
+
+@pytest.mark.benchmark
+def test_benchmark_project_list_with_and_without_pool(
+    tmp_path, pool_settings, make_user, make_project, benchmark_report
+):
+    results = {}
+    try:
+        for disabled in (True, False):
+            pool_settings(DB_POOL_DISABLED=disabled)
+            engine = create_db_engine(f"sqlite:///{tmp_path / f'{disabled}.db'}")
+            Base.metadata.create_all(engine)
+            ensure_search_index(engine)
+            SessionLocal.configure(bind=engine)
+            with SessionLocal() as db:
+                seed_roles(db)
+            headers = make_user("owner")
+            for i in range(20):
+                make_project(headers, f"Project {i}")
+
+            results[disabled] = asyncio.run(_requests_per_second(headers))
+            engine.dispose()
+    finally:
+        SessionLocal.configure(bind=default_engine)
+
+    benchmark_report(
+        f"GET /projects/projects, {BENCHMARK_REQUESTS} requests x "
+        f"{BENCHMARK_CONCURRENCY} concurrent: "
+        f"NullPool {results[True]:.0f} req/s, QueuePool {results[False]:.0f} req/s"
+    )
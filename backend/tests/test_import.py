@@ -0,0 +1,26 @@
+from sqlalchemy import select
+
+from app.models.tasks import Task
+from app.models.users import Users
+from app.services.import_service import import_tasks
+
+
+def test_import_keeps_row_order_and_accepts_null_priority(db, make_user, make_project):
+    project_id = make_project(make_user("owner"))
+    owner_id = db.scalar(select(Users.id).where(Users.username == "owner"))
+    text = "\n".join(
+        [
+            '{"name": "first", "priority": null}',
+            '{"name": "second", "priority": 5}',
+            '{"name": "third"}',
+        ]
+    )
+
+    result = import_tasks(db, project_id, owner_id, text, "ndjson")
+
+    assert result["created"] == 3 and not result["errors"]
+    tasks = {task.id: task for task in db.scalars(select(Task))}
+    imported = [tasks[task_id] for task_id in result["task_ids"]]
+    assert [task.name for task in imported] == ["first", "second", "third"]
+    # Like the ORM, the insert applies the column default for a None priority
+    assert [task.priority for task in imported] == [3, 5, 3]
@@ -0,0 +1,94 @@
+import pytest
+from sqlalchemy import select, text
+
+from app.db.session import engine
+from app.models.message import Message
+from app.models.notification import Notification
+from app.models.project import ProjectMember, Stage, project_tags
+from app.models.tasks import SubTask, Task, task_assignees, task_tags
+
+# Hot lookups and the index (revision 9a7cf5aa6649) each one should search
+HOT_QUERIES = [
+    (
+        select(ProjectMember.role).where(
+            ProjectMember.project_id == 1, ProjectMember.user_id == 2
+        ),
+        "uq_project_members_project_user",
+    ),
+    (
+        select(ProjectMember.project_id).where(ProjectMember.user_id == 2),
+        "ix_project_members_user_id",
+    ),
+    (
+        select(task_assignees.c.task_id, task_assignees.c.user_id).where(
+            task_assignees.c.task_id.in_([1, 2, 3])
+        ),
+        "uq_task_assignees_task_user",
+    ),
+    (
+        select(task_assignees.c.task_id).where(task_assignees.c.user_id == 2),
+        "ix_task_assignees_user_id",
+    ),
+    (
+        select(task_tags.c.tag_id).where(task_tags.c.task_id.in_([1, 2, 3])),
+        "uq_task_tags_task_tag",
+    ),
+    (
+        select(task_tags.c.task_id).where(task_tags.c.tag_id == 4),
+        "ix_task_tags_tag_id",
+    ),
+    (
+        select(project_tags.c.project_id).where(project_tags.c.tag_id == 4),
+        "ix_project_tags_tag_id",
+    ),
+    (
+        select(Message.id)
+        .where(Message.object_type == "task", Message.object_id == 1)
+        .order_by(Message.id.desc())
+        .limit(50),
+        "ix_messages_object_thread",
+    ),
+    (
+        select(Notification.id)
+        .where(Notification.user_id == 2)
+        .order_by(Notification.id.desc())
+        .limit(20),
+        "ix_notifications_user_feed",
+    ),
+    (
+        select(Notification.id).where(
+            Notification.user_id == 2,
+            Notification.is_read == False,
+            Notification.created_at < "2026-01-01",
+        ),
+        "ix_notifications_user_read_created",
+    ),
+    (
+        select(Task.id).where(Task.project_id == 1, Task.stage_id == 2),
+        "ix_tasks_project_stage",
+    ),
+    (
+        select(Stage.id).where(Stage.project_id == 1).order_by(Stage.sequence),
+        "ix_stages_project_sequence",
+    ),
+    (
+        select(SubTask.id).where(SubTask.task_id.in_([1, 2, 3])),
+        "ix_subtasks_task_id",
+    ),
+]
+
+
+def _query_plan(statement) -> str:
+    sql = statement.compile(engine, compile_kwargs={"literal_binds": True})
+    with engine.connect() as conn:
+        rows = conn.execute(text(f"EXPLAIN QUERY PLAN {sql}")).all()
+    return "\n".join(row.detail for row in rows)
+
+
+@pytest.mark.parametrize(
+    "statement, index", HOT_QUERIES, ids=[index for _, index in HOT_QUERIES]
+)
+def test_hot_query_searches_its_index(statement, index):
+    plan = _query_plan(statement)
+    assert "SEARCH" in plan and f"INDEX {index} " in plan, plan
+    assert "SCAN" not in plan, plan
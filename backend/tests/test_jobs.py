@@ -0,0 +1,21 @@
+from app.models.background_job import BackgroundJob
+from app.services.jobs import job_runner
+
+
+def test_jobs_left_unfinished_by_a_restart_are_failed(db):
+    jobs = {
+        status: BackgroundJob(kind="duplicate_projects", status=status)
+        for status in ("pending", "running", "succeeded", "failed")
+    }
+    db.add_all(jobs.values())
+    db.commit()
+
+    assert job_runner.fail_interrupted() == 2
+
+    db.expire_all()
+    assert jobs["pending"].status == "failed"
+    assert jobs["running"].status == "failed"
+    assert jobs["running"].error.startswith("Interrupted")
+    assert jobs["running"].finished_at is not None
+    assert jobs["succeeded"].status == "succeeded"
+    assert jobs["failed"].error is None
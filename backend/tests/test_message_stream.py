@@ -0,0 +1,55 @@
+import pytest
+from starlette.websockets import WebSocketDisconnect
+
+from app.models.tasks import Task
+
+
+def _token(headers: dict) -> str:
+    return headers["Authorization"].split(" ", 1)[1]
+
+
+@pytest.fixture
+def thread(client, db, make_user, make_project):
+    owner = make_user("owner")
+    project_id = make_project(owner)
+    task = Task(name="Task", project_id=project_id)
+    db.add(task)
+    db.commit()
+    return owner, project_id, task.id
+
+
+@pytest.mark.parametrize("object_type", ["project", "task"])
+def test_non_member_cannot_follow_a_thread(client, make_user, thread, object_type):
+    _, project_id, task_id = thread
+    object_id = project_id if object_type == "project" else task_id
+    outsider = make_user("outsider")
+
+    url = f"/messages/ws/{object_type}/{object_id}?token={_token(outsider)}"
+    with pytest.raises(WebSocketDisconnect) as closed:
+        with client.websocket_connect(url):
+            pass
+    assert closed.value.code == 1008
+
+
+def test_unknown_thread_types_are_rejected(client, thread):
+    owner, project_id, _ = thread
+    url = f"/messages/ws/milestone/{project_id}?token={_token(owner)}"
+    with pytest.raises(WebSocketDisconnect) as closed:
+        with client.websocket_connect(url):
+            pass
+    assert closed.value.code == 1008
+
+
+def test_member_receives_thread_messages(client, thread):
+    owner, _, task_id = thread
+    url = f"/messages/ws/task/{task_id}?token={_token(owner)}"
+    with client.websocket_connect(url) as websocket:
+        response = client.post(
+            "/messages/",
+            json={"object_type": "task", "object_id": task_id, "content": "hi"},
+            headers=owner,
+        )
+        assert response.status_code == 201, response.text
+        event = websocket.receive_json()
+    assert event["type"] == "message.created"
+    assert event["data"]["content"] == "hi"
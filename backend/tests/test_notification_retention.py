@@ -0,0 +1,110 @@
+from sqlalchemy import delete, select, update
+
+from app.models.notification import Notification, NotificationCounter
+from app.models.users import Users
+from app.services.notification_retention import (
+    cap_per_user,
+    cap_unread_per_user,
+    compact,
+)
+from app.services.notification_service import (
+    NotificationService,
+    decrement_unread,
+    get_unread_count,
+    recompute_unread_counts,
+)
+
+
+def _user_id(db, make_user) -> int:
+    make_user("reader")
+    return db.scalar(select(Users.id).where(Users.username == "reader"))
+
+
+def _notify(db, user_id: int, count: int, entity_id=None):
+    service = NotificationService(db)
+    for i in range(count):
+        service.notify(user_id, "task", f"update {i}", "Task", entity_id)
+    db.commit()
+
+
+def test_cap_keeps_unread_notifications(db, make_user):
+    user_id = _user_id(db, make_user)
+    _notify(db, user_id, 4)  # oldest: stay unread
+    _notify(db, user_id, 4)
+    oldest_read = db.scalars(
+        select(Notification.id).order_by(Notification.id).offset(4).limit(4)
+    ).all()
+    db.query(Notification).filter(Notification.id.in_(oldest_read)).update(
+        {Notification.is_read: True}, synchronize_session=False
+    )
+    decrement_unread(db, user_id, len(oldest_read))
+    db.commit()
+    _notify(db, user_id, 2)  # newest, unread
+
+    # Newest three are ids 8-10; read rows older than that go
+    assert cap_per_user(max_rows=3, batch_size=2) == 3
+
+    remaining = db.execute(
+        select(Notification.id, Notification.is_read).order_by(Notification.id)
+    ).all()
+    assert [row.is_read for row in remaining] == [False] * 4 + [True] + [False] * 2
+    assert get_unread_count(db, user_id) == 6
+
+
+def test_compaction_rebuilds_unread_counters_with_each_batch(db, make_user):
+    user_id = _user_id(db, make_user)
+    for entity_id in (1, 2, 3):
+        _notify(db, user_id, 3, entity_id=entity_id)
+    assert get_unread_count(db, user_id) == 9
+
+    assert compact(batch_size=1) == 6
+
+    rows = db.execute(select(Notification.entity_id, Notification.count)).all()
+    assert sorted(rows) == [(1, 3), (2, 3), (3, 3)]
+    assert get_unread_count(db, user_id) == 3
+
+
+def test_unread_ceiling_drops_oldest_unread_and_their_count(db, make_user):
+    user_id = _user_id(db, make_user)
+    _notify(db, user_id, 7)
+    first_id = db.scalar(select(Notification.id).order_by(Notification.id))
+    db.execute(
+        update(Notification).where(Notification.id == first_id).values(is_read=True)
+    )
+    decrement_unread(db, user_id)
+    db.commit()
+
+    # Six unread, ceiling four: the two oldest unread go, the read row stays
+    assert cap_unread_per_user(max_unread=4, batch_size=1) == 2
+
+    remaining = db.execute(
+        select(Notification.id, Notification.is_read).order_by(Notification.id)
+    ).all()
+    assert remaining[0] == (first_id, True)
+    assert [row.id for row in remaining[1:]] == list(range(first_id + 3, first_id + 7))
+    assert get_unread_count(db, user_id) == 4
+
+
+def test_recompute_updates_counters_in_place(db, make_user):
+    user_id = _user_id(db, make_user)
+    _notify(db, user_id, 3)
+    db.execute(update(NotificationCounter).values(unread=42))
+    db.commit()
+    recompute_unread_counts(db, [user_id])
+    db.commit()
+    assert get_unread_count(db, user_id) == 3
+
+    # A missing counter row is created, and users without unread drop to 0
+    db.execute(delete(NotificationCounter))
+    db.execute(update(Notification).values(is_read=True))
+    db.commit()
+    recompute_unread_counts(db)
+    db.commit()
+    assert (
+        db.scalar(
+            select(NotificationCounter.unread).where(
+                NotificationCounter.user_id == user_id
+            )
+        )
+        == 0
+    )
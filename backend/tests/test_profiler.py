@@ -0,0 +1,121 @@
+import asyncio
+import threading
+import time
+
+import anyio
+
+from app.core.config import settings
+from app.models.roles import Role
+from app.models.users import Users
+from app.services import profiler
+from app.services.principal_cache import principal_cache
+
+
+def test_profile_header_looks_up_admins_off_the_event_loop(
+    client, db, make_user, monkeypatch
+):
+    headers = make_user("admin")
+    admin_role = db.query(Role).filter(Role.name == "admin").one()
+    db.query(Users).filter(Users.username == "admin").update(
+        {Users.role_id: admin_role.id}
+    )
+    db.commit()
+    principal_cache.clear()
+
+    lookups = []
+    load_user = profiler._load_user
+
+    def recording_load_user(token):
+        lookups.append(threading.get_ident())
+        return load_user(token)
+
+    monkeypatch.setattr(profiler, "_load_user", recording_load_user)
+    loop_threads = []
+
+    async def record_loop_thread(authorization):
+        loop_threads.append(threading.get_ident())
+        return await is_admin_token(authorization)
+
+    is_admin_token = profiler._is_admin_token
+    monkeypatch.setattr(profiler, "_is_admin_token", record_loop_thread)
+    headers = {**headers, "X-Profile": "1"}
+
+    first = client.get("/projects/projects", headers=headers)
+    second = client.get("/projects/projects", headers=headers)
+
+    assert "x-profile-id" in first.headers
+    assert "x-profile-id" in second.headers
+    # Only the cache miss queried, and it ran in a worker thread
+    assert len(lookups) == 1
+    assert lookups[0] != loop_threads[0]
+
+
+async def _get(app, path: str, headers: dict, query: str = "", hold=None):
+    """Call the app directly; with `hold`, the response body waits for it."""
+    started = asyncio.Event()
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.body" and hold is not None:
+            started.set()
+            await hold.wait()
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "server": ("testserver", 80),
+        "client": ("testclient", 50000),
+        "root_path": "",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "headers": [
+            (name.lower().encode(), value.encode()) for name, value in headers.items()
+        ],
+    }
+    return asyncio.create_task(app(scope, receive, send)), started
+
+
+def test_concurrent_profiles_keep_their_own_worker_frames(
+    make_user, make_project, monkeypatch
+):
+    from app.api.v1.project import task as task_routes
+    from app.main import app
+
+    headers = make_user("owner")
+    project_id = make_project(headers)
+    monkeypatch.setattr(settings, "PROFILE_SAMPLE_RATE", 1.0)
+
+    def slow_task_row_dicts(db, rows):
+        time.sleep(0.2)  # sampled inside get_tasks, on the shared worker
+        return task_row_dicts(db, rows)
+
+    task_row_dicts = task_routes.task_row_dicts
+    monkeypatch.setattr(task_routes, "task_row_dicts", slow_task_row_dicts)
+
+    async def scenario():
+        # One worker thread: both requests' sync code runs on the same thread
+        anyio.to_thread.current_default_thread_limiter().total_tokens = 1
+        release = asyncio.Event()
+        projects, holding = await _get(app, "/projects/projects", headers, hold=release)
+        await holding.wait()  # its worker call is done; the request is not
+        tasks, _ = await _get(app, "/tasks/", headers, f"project_id={project_id}")
+        await tasks
+        release.set()
+        await projects
+
+    asyncio.run(scenario())
+
+    by_path = {profile.path: profile for profile in profiler.profiler.list()[:2]}
+    projects_frames = {
+        label for stack in by_path["/projects/projects"].stacks for label in stack
+    }
+    tasks_frames = {label for stack in by_path["/tasks/"].stacks for label in stack}
+    assert any(label.startswith("get_tasks (") for label in tasks_frames)
+    assert not any(label.startswith("get_tasks (") for label in projects_frames)
+    assert not any(label.startswith("list_projects (") for label in tasks_frames)
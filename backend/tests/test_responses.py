@@ -0,0 +1,54 @@
+import json
+import time
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.core import responses
+from app.core.responses import FastJSONResponse
+from app.db.schemas.projects.task_schema import TaskOut
+from app.models.tasks import Task
+from app.models.users import Users
+from app.services.task_service import TASK_COLUMNS, task_row_dicts
+
+
+def _best_of(runs: int, func) -> float:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+@pytest.fixture
+def task_page(db, make_user, make_project, add_tasks) -> list[dict]:
+    """Row dicts of a 1,000-task page, as the list endpoints build them."""
+    headers = make_user("owner")
+    project_id = make_project(headers)
+    add_tasks(project_id, 1000, [user_id for (user_id,) in db.query(Users.id)])
+    rows = db.query(*TASK_COLUMNS).filter(Task.project_id == project_id).all()
+    return task_row_dicts(db, rows)
+
+
+def _default_body(items: list[dict]) -> bytes:
+    """TaskOut validation + jsonable_encoder + JSONResponse (FastAPI's default)."""
+    models = [TaskOut.model_validate(item) for item in items]
+    return JSONResponse(jsonable_encoder(models)).body
+
+
+def test_fast_json_task_page_matches_default_rendering(task_page):
+    assert responses.orjson is not None, "orjson is a runtime requirement"
+    body = FastJSONResponse(task_page).body
+    assert json.loads(body) == json.loads(_default_body(task_page))
+
+
+@pytest.mark.benchmark
+def test_benchmark_fast_json_task_page(task_page, benchmark_report):
+    default_seconds = _best_of(5, lambda: _default_body(task_page))
+    fast_seconds = _best_of(5, lambda: FastJSONResponse(task_page).body)
+    benchmark_report(
+        f"1,000-task page: default rendering {default_seconds * 1000:.1f} ms, "
+        f"row dicts + FastJSONResponse {fast_seconds * 1000:.1f} ms"
+    )
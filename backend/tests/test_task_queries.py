@@ -0,0 +1,45 @@
+import pytest
+
+from app.core.config import settings
+from app.models.users import Users
+
+
+@pytest.fixture
+def query_count(client, monkeypatch):
+    """SQL statements a GET ran, read from the DEBUG X-DB-Query-Count header."""
+    monkeypatch.setattr(settings, "DEBUG", True)
+
+    def count(url: str, headers: dict) -> int:
+        response = client.get(url, headers=headers)
+        assert response.status_code == 200, response.text
+        return int(response.headers["x-db-query-count"])
+
+    return count
+
+
+@pytest.mark.parametrize(
+    "url",
+    ["/tasks/?project_id={project_id}&limit=100", "/projects/{project_id}/tasks"],
+)
+def test_task_page_query_count_does_not_grow_with_tasks(
+    url, client, db, make_user, make_project, add_tasks, query_count
+):
+    headers = make_user("owner")
+    make_user("helper")
+    assignee_ids = [user_id for (user_id,) in db.query(Users.id)]
+
+    small = make_project(headers, "Small")
+    large = make_project(headers, "Large")
+    add_tasks(small, 1, assignee_ids)
+    add_tasks(large, 100, assignee_ids)
+
+    query_count(url.format(project_id=small), headers)  # warm the principal cache
+    one_task = query_count(url.format(project_id=small), headers)
+    hundred_tasks = query_count(url.format(project_id=large), headers)
+
+    assert hundred_tasks == one_task
+
+    response = client.get(url.format(project_id=large), headers=headers).json()
+    tasks = response["items"] if isinstance(response, dict) else response
+    assert len(tasks) == 100
+    assert all(len(task["assignee_ids"]) == 2 for task in tasks)
@@ -17,6 +17,12 @@ async function refreshAccessToken(): Promise<string> {
     })
       .then(async (res) => {
         if (!res.ok) {
+          // Refresh tokens are single use: another tab may have rotated it
+          const current = localStorage.getItem("refresh_token");
+          const accessToken = localStorage.getItem("access_token");
+          if (current && current !== refreshToken && accessToken) {
+            return accessToken;
+          }
           localStorage.removeItem("access_token");
           localStorage.removeItem("refresh_token");
           window.location.href = "/login"; // redirect to login
@@ -24,6 +30,7 @@ async function refreshAccessToken(): Promise<string> {
         }
         const data = await res.json();
         localStorage.setItem("access_token", data.access_token);
+        localStorage.setItem("refresh_token", data.refresh_token);
         return data.access_token;
       })
       .finally(() => {
@@ -0,0 +1,26 @@
+import endpoint from "./init";
+import { authFetch } from "./http";
+
+export type JobStatus = "pending" | "running" | "succeeded" | "failed";
+
+export interface Job {
+  id: number;
+  kind: string;
+  status: JobStatus;
+  result: any;
+  error: string | null;
+}
+
+export async function fetchJob(jobId: number): Promise<Job> {
+  return authFetch(`${endpoint}/jobs/${jobId}`);
+}
+
+// Poll a background job until it finishes; resolves with its result
+export async function waitForJob(jobId: number, intervalMs = 500) {
+  for (;;) {
+    const job = await fetchJob(jobId);
+    if (job.status === "succeeded") return job.result;
+    if (job.status === "failed") throw new Error(job.error ?? "Job failed");
+    await new Promise((resolve) => setTimeout(resolve, intervalMs));
+  }
+}
@@ -1,5 +1,6 @@
 import endpoint from "./init";
 import { authFetch } from "./http";
+import { waitForJob } from "./jobs";
 
 export async function fetchProjects({
   manager_only,
@@ -9,7 +10,7 @@ export async function fetchProjects({
   start_date,
   end_date,
   tags,
-  skip,
+  cursor,
   limit,
 }: {
   manager_only?: boolean;
@@ -19,7 +20,7 @@ export async function fetchProjects({
   start_date?: string;
   end_date?: string;
   tags?: string[];
-  skip?: number;
+  cursor?: string;
   limit?: number;
 } = {}) {
   const params = new URLSearchParams();
@@ -33,10 +34,14 @@ export async function fetchProjects({
   if (start_date) params.append("start_date", start_date); // must be "YYYY-MM-DD"
   if (end_date) params.append("end_date", end_date);
   if (tags) tags.forEach((tag) => params.append("tags", tag));
-  if (skip !== undefined) params.append("skip", String(skip));
+  if (cursor) params.append("cursor", cursor);
   if (limit !== undefined) params.append("limit", String(limit));
 
-  return authFetch(`${endpoint}/projects/projects?${params.toString()}`);
+  // Cursor-paginated envelope: { items, next_cursor, has_next }
+  const page = await authFetch(
+    `${endpoint}/projects/projects?${params.toString()}`
+  );
+  return page.items;
 }
 
 export async function fetchProjectById(projectId: number) {
@@ -122,8 +127,9 @@ export async function duplicateProject(projectId: number) {
   const res = await authFetch(`${endpoint}/projects/${projectId}/duplicate`, {
     method: "POST",
   });
-  // Backend returns { duplicated: newProjectId }
-  return res.duplicated;
+  // Backend copies the project in a background job: { job_id, status }
+  const result = await waitForJob(res.job_id);
+  return result.duplicated[0];
 }
 
 export async function deleteProject(projectId: number) {
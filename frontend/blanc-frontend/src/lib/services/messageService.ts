@@ -19,21 +19,35 @@ export interface MessageCreate {
   message_type?: string;
 }
 
+// Latest page by default; pass `before` (a next_cursor) to load older
+// messages or `after_id` to fetch only messages newer than one you have
 export async function fetchMessages(
   object_type: string,
-  object_id: number
+  object_id: number,
+  params: { before?: string; after_id?: number; limit?: number } = {}
 ): Promise<Message[]> {
   const token = localStorage.getItem("access_token");
-  const res = await fetch(`${endpoint}/messages/${object_type}/${object_id}`, {
-    headers: {
-      Authorization: `Bearer ${token}`,
-    },
+  const query = new URLSearchParams();
+  Object.entries(params).forEach(([key, value]) => {
+    if (value !== undefined) query.append(key, String(value));
   });
+  const res = await fetch(
+    `${endpoint}/messages/${object_type}/${object_id}?${query}`,
+    {
+      headers: {
+        Authorization: `Bearer ${token}`,
+      },
+    }
+  );
 
   if (!res.ok) throw new Error("Failed to fetch messages");
   const data = await res.json();
 
-  return data.map((msg: any) => ({
+  return data.items.map(toMessage);
+}
+
+function toMessage(msg: any): Message {
+  return {
     id: msg.id,
     author_id: msg.author?.id,
     username: msg.author?.username ?? "Unknown",
@@ -44,7 +58,35 @@ export async function fetchMessages(
       hour: "2-digit",
       minute: "2-digit",
     }),
-  }));
+  };
+}
+
+export type MessageEvent =
+  | { type: "message.created" | "message.updated"; message: Message }
+  | { type: "message.deleted"; id: number };
+
+// Live updates for one thread; returns a function that closes the socket
+export function subscribeToMessages(
+  object_type: string,
+  object_id: number,
+  onEvent: (event: MessageEvent) => void
+): () => void {
+  const token = localStorage.getItem("access_token");
+  const wsEndpoint = endpoint.replace(/^http/, "ws");
+  const socket = new WebSocket(
+    `${wsEndpoint}/messages/ws/${object_type}/${object_id}?token=${token}`
+  );
+
+  socket.onmessage = (frame) => {
+    const event = JSON.parse(frame.data);
+    if (event.type === "message.deleted") {
+      onEvent({ type: event.type, id: event.data.id });
+    } else if (event.type.startsWith("message.")) {
+      onEvent({ type: event.type, message: toMessage(event.data) });
+    }
+  };
+
+  return () => socket.close();
 }
 
 export async function sendMessage(message: MessageCreate) {
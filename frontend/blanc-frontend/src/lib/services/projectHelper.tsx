@@ -5,7 +5,8 @@ import endpoint from "../routes/init";
 import { fetchProjectTags } from "../routes/Tags";
 
 export async function fetchProjects() {
-  return authFetch(`${endpoint}/projects/projects`);
+  const page = await authFetch(`${endpoint}/projects/projects`);
+  return page.items;
 }
 
 export async function fetchProjectsWithTags() {